@@ -1,3 +1,144 @@
-from django.test import TestCase
+import json
+import random
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from sociagraph.models import Classified_Corpus
+from sociagraph.labels import set_corpus_labels
+from sociagraph import sampling
+from key_information_extractor.training import get_theme_training_tokens
+
+
+class SampleIdsTest(TestCase):
+
+	def setUp(self):
+		random.seed(0)
+
+	# Description:  Create corpora rows
+	# Parameter/s:  int
+	# Return:	    list [ int, ... ] (ids)
+	def create_corpora(self, count):
+		Classified_Corpus.objects.bulk_create([ Classified_Corpus(text='text %d' % index, theme='theme') for index in range(count) ])
+
+		return list(Classified_Corpus.objects.values_list('id', flat=True))
+
+	def test_empty_table(self):
+		self.assertEqual(sampling.sample_ids(Classified_Corpus, 10, set()), [])
+
+	def test_random_rounds_skip_the_scan(self):
+		ids = self.create_corpora(50)
+
+		# One aggregate and one round of random ids
+		with self.assertNumQueries(2):
+			sampled_ids = sampling.sample_ids(Classified_Corpus, 10, set())
+
+		self.assertEqual(len(sampled_ids), 10)
+		self.assertTrue(set(sampled_ids) <= set(ids))
+
+	def test_scan_fills_the_sample(self):
+		ids = self.create_corpora(20)
+		excluded_ids = set(ids[:5])
+		rounds = sampling.sampling_rounds
+		sampling.sampling_rounds = 0
+
+		try:
+			sampled_ids = sampling.sample_ids(Classified_Corpus, 10, excluded_ids)
+		finally:
+			sampling.sampling_rounds = rounds
+
+		self.assertEqual(len(set(sampled_ids)), 10)
+		self.assertTrue(set(sampled_ids) <= set(ids) - excluded_ids)
+
+	def test_scan_stops_at_the_available_rows(self):
+		ids = self.create_corpora(8)
+		excluded_ids = set(ids[:3])
+
+		sampled_ids = sampling.sample_ids(Classified_Corpus, 10, excluded_ids)
+
+		self.assertEqual(sorted(sampled_ids), sorted(set(ids) - excluded_ids))
+
+	def test_large_sample_is_queried_in_chunks(self):
+		ids = self.create_corpora(1200)
+
+		sampled_ids = sampling.sample_ids(Classified_Corpus, 1000, set())
+
+		self.assertEqual(len(set(sampled_ids)), 1000)
+		self.assertTrue(set(sampled_ids) <= set(ids))
+
+	def test_rows_after_the_last_id_are_not_sampled(self):
+		ids = self.create_corpora(20)
+
+		sampled_ids = sampling.sample_ids(Classified_Corpus, 20, set(), ids[9])
+
+		self.assertEqual(sorted(sampled_ids), ids[:10])
+
+
+class SampleBalancedIdsTest(TestCase):
+
+	def setUp(self):
+		random.seed(0)
+
+		# 30 texts of education, 5 of health and 15 without a theme
+		themes = [ 'education' ] * 30 + [ 'health' ] * 5 + [ '' ] * 15
+		Classified_Corpus.objects.bulk_create([ Classified_Corpus(text='text %d' % index, theme=theme) for index, theme in enumerate(themes) ])
+		set_corpus_labels(Classified_Corpus, 'themes', Classified_Corpus.objects.values_list('id', 'theme'))
+		self.ids = list(Classified_Corpus.objects.order_by('id').values_list('id', flat=True))
+
+	# Description:  Count the texts with and without a theme among corpora
+	# Parameter/s:  list [ int, ... ] | str
+	# Return:	    tuple (int, int)
+	def count_theme(self, ids, theme):
+		count = Classified_Corpus.objects.filter(id__in=ids, theme=theme).count()
+
+		return (count, len(ids) - count)
+
+	def test_each_theme_is_balanced(self):
+		sampled_ids = sampling.sample_balanced_ids(Classified_Corpus, 'themes', 10, self.ids[-1])
+		education_count, not_education_count = self.count_theme(sampled_ids, 'education')
+		health_count, not_health_count = self.count_theme(sampled_ids, 'health')
+
+		# Each theme has its texts, up to the sample size, and at least as many texts without it
+		self.assertTrue(education_count >= 10 and not_education_count >= 10)
+		self.assertTrue(health_count == 5 and not_health_count >= 5)
+		self.assertEqual(len(sampled_ids), len(set(sampled_ids)))
+
+	def test_rows_after_the_last_id_are_not_sampled(self):
+		sampled_ids = sampling.sample_balanced_ids(Classified_Corpus, 'themes', 10, self.ids[29])
+
+		self.assertTrue(max(sampled_ids) <= self.ids[29])
+		self.assertEqual(self.count_theme(sampled_ids, 'health')[0], 0)
+
+	def test_theme_training_tokens(self):
+		labeled_tokens = get_theme_training_tokens(self.ids[-1], 3)
+		themes = [ labels for tokens, labels in labeled_tokens ]
+
+		self.assertTrue(themes.count(set(['education'])) >= 3)
+		self.assertTrue(themes.count(set(['health'])) >= 3)
+		self.assertTrue(len(themes) <= 12)
+
+	def test_all_theme_training_tokens(self):
+		self.assertEqual(len(get_theme_training_tokens(self.ids[39])), 40)
+
+
+class AnalyzeTest(TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.settings_override = override_settings(MODEL_STORE_DIR=self.directory)
+		self.settings_override.enable()
+
+	def tearDown(self):
+		self.settings_override.disable()
+		shutil.rmtree(self.directory, ignore_errors=True)
+
+	def test_invalid_request(self):
+		response = self.client.post('/key_information_extractor/api/analyze/', json.dumps({ 'documents': [] }), content_type='application/json')
+
+		self.assertEqual(response.status_code, 400)
+
+	def test_no_trained_classifier(self):
+		response = self.client.post('/key_information_extractor/api/analyze/', json.dumps({ 'documents': ['I am at school.'], 'themes': ['education'] }), content_type='application/json')
+
+		self.assertEqual(response.status_code, 503)
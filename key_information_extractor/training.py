@@ -0,0 +1,247 @@
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.db.models import Max
+
+from sociagraph.models import Classified_Corpus
+from sociagraph.registry import model_registry, get_corpus_version
+from sociagraph.jobs import register_trainer
+from sociagraph.evaluation import register_evaluator, get_evaluation_job_name, get_evaluation_report
+from sociagraph.sampling import sample_balanced_ids, id_chunk_size
+from sociagraph.profiling import profiled
+from sociagraph.utils import *
+from sociagraph.model_store import load_model
+from sociagraph.features import SparseFeatureVectorizer
+from sociagraph.online import get_feature_count, create_multi_label_classifier, get_online_state, get_updatable_model
+
+# One classifier covers every theme of the corpus: a binary linear SVM per
+# theme whose weights form the columns of one weight matrix, so the sentences
+# of a document are classified against any themes in one product.
+
+THEMES_MODEL = 'themes'
+
+# Minimum number of texts of a theme to train its classifier
+MINIMUM_THEME_CORPORA = 3
+
+# Description:  Get the tokens and themes of corpora
+# Parameter/s:  list [ QuerySet, ... ]
+# Return:	    list [ ([ token, ... ], set([ theme, ... ])), ... ]
+def get_theme_labeled_tokens(querysets):
+	labeled_tokens = OrderedDict()
+
+	for queryset in querysets:
+		# One row per theme of each text
+		for corpus_id, text, tokens, theme in queryset.order_by('id').values_list('id', 'text', 'tokens', 'themes__name').iterator():
+			if corpus_id not in labeled_tokens:
+				labeled_tokens[corpus_id] = (get_corpus_tokens(text, tokens), set())
+
+			if theme is not None:
+				labeled_tokens[corpus_id][1].add(unicode_to_string(theme))
+
+	return list(labeled_tokens.values())
+
+# Description:  Get the tokens and themes of all corpora up to an id or of a random sample with as many texts with and without each theme
+# Parameter/s:  int | int (texts drawn with each theme, None for all corpora)
+# Return:	    list [ ([ token, ... ], set([ theme, ... ])), ... ]
+# Dependencies: get_theme_labeled_tokens() | sample_balanced_ids()
+@profiled('db_sampling')
+def get_theme_training_tokens(last_id, sample_size = None):
+	if sample_size is None:
+		return get_theme_labeled_tokens([ Classified_Corpus.objects.filter(id__lte=last_id) ])
+
+	ids = sample_balanced_ids(Classified_Corpus, 'themes', sample_size, last_id)
+
+	# Keep the number of query parameters bounded
+	return get_theme_labeled_tokens([ Classified_Corpus.objects.filter(id__in=ids[index:index + id_chunk_size]) for index in range(0, len(ids), id_chunk_size) ])
+
+# Description:  Get the themes with enough texts to train their classifiers
+# Parameter/s:  list [ ([ token, ... ], set([ theme, ... ])), ... ]
+# Return:	    tuple (list [ theme, ... ], Counter { theme: count })
+def get_trainable_themes(labeled_tokens):
+	corpora_counts = Counter(theme for tokens, themes in labeled_tokens for theme in themes)
+
+	return (sorted(theme for theme, count in corpora_counts.items() if count >= MINIMUM_THEME_CORPORA), corpora_counts)
+
+# Description:  Train the classifier of the themes of labeled tokens
+# Parameter/s:  list [ ([ token, ... ], set([ theme, ... ])), ... ]
+# Return:	    SparseMultiLabelClassifier | None without enough data
+# Dependencies: get_trainable_themes()
+def fit_themes_classifier(labeled_tokens):
+	themes = get_trainable_themes(labeled_tokens)[0]
+
+	if len(themes) == 0:
+		return None
+
+	# Get the vocabulary of the corpora
+	feature_set_words = get_feature_set_words(labeled_tokens)
+
+	# Vectorize the words in feature set words and their synonyms to each theme
+	vectorizer = SparseFeatureVectorizer([ lemmatize(theme) for theme in themes ], get_feature_count()).fit(feature_set_words)
+
+	return create_multi_label_classifier(vectorizer, themes).train_tokens(labeled_tokens)
+
+# Description:  Get the metrics of the classifier of each theme on labeled tokens
+# Parameter/s:  SparseMultiLabelClassifier | None | list [ ([ token, ... ], set([ theme, ... ])), ... ]
+# Return:	    dict { theme: { accuracy, precision, recall, f-measure } }
+def score_themes_classifier(classifier, test_set):
+	statistics = {}
+
+	if classifier is None:
+		return statistics
+
+	test_set_predictions = classifier.predict_tokens([ tokens for tokens, labels in test_set ])
+
+	for theme in classifier.labels:
+		not_theme = 'not_' + theme
+		test_set_correct_classifications = [ theme if theme in labels else not_theme for tokens, labels in test_set ]
+		test_set_reclassification = [ theme if value else not_theme for value in test_set_predictions[theme] ]
+		statistics[theme] = get_classification_scores(test_set_correct_classifications, test_set_reclassification, [theme, not_theme])
+
+	return statistics
+
+# Description:  Train the classifier of all themes on the whole corpus
+# Parameter/s:  function (int) -> None
+# Return:	    dict { classifier, corpora_counts, last_id, online }, classifier is None without enough data
+def train_themes_model(report_progress = lambda progress: None):
+	last_id = Classified_Corpus.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+	labeled_tokens = get_theme_training_tokens(last_id, getattr(settings, 'THEME_SAMPLE_SIZE', None))
+
+	report_progress(20)
+
+	classifier = fit_themes_classifier(labeled_tokens)
+
+	return {
+		'classifier': classifier,
+		'corpora_counts': dict(get_trainable_themes(labeled_tokens)[1]),
+		'last_id': last_id,
+		'online': get_online_state(last_id) if classifier is not None else None,
+	}
+
+# Description:  Get the theme-classified corpora to evaluate
+# Parameter/s:  None
+# Return:	    tuple (version, list [ ([ token, ... ], set([ theme, ... ])), ... ], None) one item per text
+def get_themes_evaluation_data():
+	version = get_themes_corpus_version()
+
+	return (version, get_theme_training_tokens(version[1] or 0, getattr(settings, 'THEME_SAMPLE_SIZE', None)), None)
+
+register_evaluator(THEMES_MODEL, get_themes_evaluation_data, fit_themes_classifier, score_themes_classifier)
+
+# Description:  Update the saved classifier of all themes with the corpora added since it was saved
+# Parameter/s:  tuple
+# Return:	    dict { classifier, corpora_counts, last_id, online } | None to train from scratch
+def update_themes_model(version):
+	stored_model = load_model(THEMES_MODEL, mmap=False)
+
+	if stored_model is None or stored_model['model'].get('online') is None or version[1] is None:
+		return None
+
+	last_id = stored_model['model']['online']['last_id']
+	new_corpora = Classified_Corpus.objects.filter(id__gt=last_id, id__lte=version[1])
+	themes_model = get_updatable_model(stored_model, version, new_corpora.count())
+
+	if themes_model is None:
+		return None
+
+	classifier = themes_model['classifier']
+	labeled_tokens = get_theme_labeled_tokens([ new_corpora ])
+	corpora_counts = Counter(themes_model['corpora_counts'])
+
+	for tokens, themes in labeled_tokens:
+		corpora_counts.update(themes)
+
+	# Train from scratch for a theme new to the classifier
+	for theme, count in corpora_counts.items():
+		if count >= MINIMUM_THEME_CORPORA and theme not in classifier.label_columns:
+			return None
+
+	if len(labeled_tokens) > 0:
+		classifier.partial_train_tokens(labeled_tokens)
+
+	return {
+		'classifier': classifier,
+		'corpora_counts': dict(corpora_counts),
+		'last_id': version[1],
+		'online': { 'last_id': version[1], 'updates': themes_model['online']['updates'] + len(labeled_tokens) },
+	}
+
+# Description:  Get the version of the theme-classified corpus
+# Parameter/s:  None
+# Return:	    tuple (int, int)
+def get_themes_corpus_version():
+	return get_corpus_version(Classified_Corpus)
+
+# Description:  Train the classifier of all themes for the training worker
+# Parameter/s:  str | function (int) -> None
+# Return:	    tuple (version, dict { classifier, corpora_counts, last_id, online }, list [ job model name, ... ])
+def train_themes(model_name, report_progress):
+	version = get_themes_corpus_version()
+	themes_model = update_themes_model(version)
+
+	# An updated model is evaluated again as well, so that its metrics follow its version
+	if themes_model is not None:
+		return (version, themes_model, [ get_evaluation_job_name(THEMES_MODEL) ])
+
+	themes_model = train_themes_model(report_progress)
+
+	# Metrics are computed by the evaluation job, once the model is saved
+	return (version, themes_model, [ get_evaluation_job_name(THEMES_MODEL) ])
+
+register_trainer(THEMES_MODEL, train_themes)
+
+# Description:  Get the last trained classifier of all themes with its corpus version, queueing training if outdated
+# Parameter/s:  None
+# Return:	    dict { version, model { classifier, corpora_counts, last_id, online }, version_name } | None if never trained
+def get_themes_model_entry():
+	return model_registry.get_latest_entry(THEMES_MODEL, get_themes_corpus_version())
+
+# Description:  Get the last trained classifier of all themes, queueing training if outdated
+# Parameter/s:  None
+# Return:	    dict { classifier, corpora_counts, last_id, online } | None if never trained
+# Dependencies: get_themes_model_entry()
+def get_themes_model():
+	entry = get_themes_model_entry()
+
+	if entry is None:
+		return None
+
+	return entry['model']
+
+# Description:  Classify sentences against themes with the last classifier of all themes
+# Parameter/s:  list [ sentence, ... ] | list [ theme, ... ] | dict { classifier, corpora_counts, last_id, online } (None to get the last one)
+# Return:	    dict { theme: { status, classifications, statistics, corpora_count } }, status is 'classified', 'training' or 'missing'
+# Dependencies: get_themes_model()
+def classify_theme_sentences(sentences, themes, themes_model = None):
+	if themes_model is None:
+		themes_model = get_themes_model()
+
+	theme_results = {}
+
+	if themes_model is None:
+		for theme in themes:
+			theme_results[theme] = { 'status': 'training', 'classifications': None, 'statistics': None, 'corpora_count': None }
+
+		return theme_results
+
+	classifier = themes_model['classifier']
+	classifications = classifier.classify_many(sentences, themes) if classifier is not None else {}
+	evaluation = get_evaluation_report(THEMES_MODEL) if len(classifications) > 0 else None
+
+	for theme in themes:
+		if theme in classifications:
+			theme_results[theme] = {
+				'status': 'classified',
+				'classifications': classifications[theme],
+				'statistics': evaluation['report'].get(theme, {}) if evaluation is not None else {},
+				'corpora_count': themes_model['corpora_counts'][theme],
+			}
+		else:
+			# A theme of the texts added since the training is in the queued training
+			if theme not in themes_model['corpora_counts'] and Classified_Corpus.objects.filter(themes__name=theme, id__gt=themes_model.get('last_id') or 0).exists():
+				status = 'training'
+			else:
+				status = 'missing'
+
+			theme_results[theme] = { 'status': status, 'classifications': None, 'statistics': None, 'corpora_count': None }
+
+	return theme_results
\ No newline at end of file
@@ -7,4 +7,6 @@ urlpatterns = patterns('',
     url(r'^corpus/$', views.corpus, name='corpus'),
     url(r'^results/$', views.results, name='results'),
     url(r'^add_corpus/$', views.add_corpus, name='add_corpus'),
+    url(r'^upload_corpus/$', views.upload_corpus, name='upload_corpus'),
+    url(r'^api/analyze/$', views.analyze, name='analyze'),
 )
\ No newline at end of file
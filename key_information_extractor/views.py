@@ -1,11 +1,23 @@
 from django.shortcuts import render
-from django.http import HttpResponse
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from django.contrib.admin.views.decorators import staff_member_required
 
 from sociagraph.models import Classified_Corpus
-from django.db.models import Q
 
 from sociagraph.utils import *
+from sociagraph.forms import UploadFileForm
+from sociagraph.corpus_import import CorpusImportError, get_corpus_file_format, import_corpus_file
+from sociagraph.labels import set_corpus_labels
+from sociagraph.pagination import get_keyset_page, get_cached_count, add_to_cached_count
+from sociagraph.document import AnalyzedDocument
+from sociagraph.api import get_json_list, json_error
+from sociagraph.jobs import enqueue_training_job
+from sociagraph.profiling import profile_stage
+from sociagraph.evaluation import get_evaluation_report
+from sociagraph.results_cache import get_results_cache_key, get_cached_results, cache_results
+from key_information_extractor.training import THEMES_MODEL, get_themes_model, get_themes_model_entry, classify_theme_sentences
 
 
 def index(request):
@@ -22,29 +34,19 @@ def corpus(request):
 	template_name = 'key_information_extractor/corpus.html'
 
 	# Get the corpora from the database
-	classified_corpus = Classified_Corpus.objects.all()
+	classified_corpus = Classified_Corpus.objects.prefetch_related('themes').order_by('id')
 
-	# Count all corpora in the database
-	total_corpora_count = classified_corpus.count()
+	# Get the cached count of the corpora in the database
+	total_corpora_count = get_cached_count(Classified_Corpus)
 
-	# Setup pagination
-	paginator = Paginator(classified_corpus, 10)
-
-	# Get the requested page
-	page = request.GET.get('page')
-
-	try:
-		corpora = paginator.page(page)
-	except PageNotAnInteger:
-		corpora = paginator.page(1)
-	except EmptyPage:
-		corpora = paginator.page(paginator.num_pages)
+	# Get the requested page by id
+	corpora = get_keyset_page(request, classified_corpus, 10)
 
 	new_classified_corpus = []
 
-	# Convert themes from string to list
+	# Get the names of the themes
 	for corpus in corpora:
-		new_classified_corpus.append((corpus.text, corpus.theme.split(',')))
+		new_classified_corpus.append((corpus.text, [ theme.name for theme in corpus.themes.all() ]))
 
 	return render(request, template_name, {
 		'application_name': application_name,
@@ -54,27 +56,19 @@ def corpus(request):
 		})
 
 
-def results(request):
-	application_name = "key-information-extractor"
-	template_name = 'key_information_extractor/results.html'
-
-	# Get the input
-	themes = request.POST.get('theme')
-	original_text = request.POST.get('text')
-	
-	# Clean the themes
-	themes = remove_non_letters(themes)
-	themes = remove_extra_whitespaces(themes)
-	theme_list = tokenize(themes)
-
+# Description:  Analyze a text and classify its sentences against themes
+# Parameter/s:  AnalyzedDocument | list [ theme, ... ] | dict { classifier, corpora_counts, last_id, online } | None if never trained
+# Return:	    tuple (dict (outputs of the results page), bool (every theme classified))
+def get_theme_results(document, theme_list, themes_model):
 	# ==== Output variables ====
-	tokens = tokenize(original_text)
-	original_text_length = count_words(original_text)
-	vocabulary_size = get_vocabulary_count(original_text)
-	bag_of_words = sort_dictionary_by_key(get_bag_of_words(original_text))
+	with profile_stage('text_analysis'):
+		tokens = document.tokens
+		original_text_length = document.word_count
+		vocabulary_size = document.vocabulary_size
+		bag_of_words = document.sorted_bag_of_words
 
-	pos_tags = get_pos_tags(original_text)
-	pos_tags = get_pos_tag_values(pos_tags)
+	with profile_stage('pos_tagging'):
+		pos_tags = document.pos_tags
 
 	theme_classification_results = {}
 	theme_classification_statistics = {}
@@ -82,82 +76,50 @@ def results(request):
 	corpora_statistics = {}
 	# ==========================
 
-	for theme in theme_list:
-		theme_definitions[theme] = get_word_definitions(theme)
-
-		labeled_text = {}
-
-		not_theme = 'not_' + theme
-
-		# Get text with matching theme from database
-		labeled_corpora = Classified_Corpus.objects.filter(theme__contains=theme).values('text').order_by('?')
-		
-		# Count the corpora in the database
-		labeled_corpora_count = labeled_corpora.count()
-
-		if labeled_corpora_count >= 3:
-			# Get text not matching the theme from database
-			opposite_labeled_corpora = Classified_Corpus.objects.filter(~Q(theme__contains=theme)).values('text').order_by('?')[:labeled_corpora.count()]
-
-			# Assign each result to given theme
-			labeled_text[theme] = assign_theme(labeled_corpora, theme)
+	sentences = document.sentences
 
-			# Assign each result to given theme
-			labeled_text[not_theme] = assign_theme(opposite_labeled_corpora, not_theme)
+	# Classify the sentences against all themes at once
+	with profile_stage('theme_classification'):
+		theme_results = classify_theme_sentences(sentences, theme_list, themes_model)
 
-			# Combine opposing themes
-			combined_labeled_text = labeled_text[theme] + labeled_text[not_theme]
-			
-			# Shuffle the combined text with labels
-			shuffle_set(combined_labeled_text)
-			
-			# Get the vocabulary of the combined labels
-			feature_set_words = get_feature_set_words(combined_labeled_text)
-
-			# Check if the words in a paragraph is in feature set words
-			feature_sets = get_theme_corpus_feature_sets(combined_labeled_text, feature_set_words, theme)
-
-			set_size = len(feature_sets)/2
-			test_set = feature_sets[:set_size]
-			train_set = feature_sets[set_size:]
-
-			svm_classifier = create_svm_classifier()
-			svm_classifier = train_classifier(svm_classifier, train_set)
+	for theme in theme_list:
+		theme_result = theme_results[theme]
 
-			test_set_features = []
-			test_set_correct_classifications = []
-			classification_scores = {}
+		with profile_stage('wordnet_definitions'):
+			theme_definitions[theme] = get_word_definitions(theme)
 
-			# Get the test features and labels for metrics
-			for features, labels in test_set:
-				test_set_features.append(features)
-				test_set_correct_classifications.append(labels)
+		if theme_result['status'] == 'classified':
+			classification_scores = theme_result['statistics']
 
-			test_set_reclassification = svm_classifier.classify_many(test_set_features)
-			classification_scores = get_classification_scores(test_set_correct_classifications, test_set_reclassification, [theme, not_theme])
+			# Count the corpora in the database
+			labeled_corpora_count = theme_result['corpora_count']
 
 			classified_items = {}
 			keywords = []
 
-			for sentence in paragraph_to_sentences(original_text):
-				classification_test = get_features(sentence, feature_set_words, theme)
-
-				# Get each theme classification per sentence
-				classified_items[sentence] = svm_classifier.classify(classification_test)
+			# Get each theme classification per sentence
+			for sentence, classification in zip(sentences, theme_result['classifications']):
+				classified_items[sentence] = classification
 
 				# word_count = len(tokenize(sentence))
 
 				# for counter in range(1, 3):
 				# 	for ngram in get_ngrams(sentence, counter):
 				# 		if is_possible_keyword(ngram):
-				# 			classification_test = get_features(" ".join(ngram), feature_set_words, theme)
-				# 			classified_items[" ".join(ngram)] = svm_classifier.classify(classification_test)
+				# 			classified_items[" ".join(ngram)] = svm_classifier.classify(" ".join(ngram))
 
 			theme_classification_results[theme] = classified_items
 			theme_classification_statistics[theme] = classification_scores
-			corpora_statistics[theme] = sort_dictionary_by_key({ 'Corpora Total': labeled_corpora_count, 'Test Set Count': labeled_corpora_count/2, 'Train Set Count': labeled_corpora_count/2 })
+			corpora_statistics[theme] = sort_dictionary_by_key({ 'Corpora Total': labeled_corpora_count, 'Train Set Count': labeled_corpora_count })
 			notification_type = 'success'
 			notification_message = 'Successfully extracted key information'
+		elif theme_result['status'] == 'training':
+			# Output while the classifier of the theme is being trained
+			theme_classification_results[theme] = None
+			theme_classification_statistics[theme] = None
+			corpora_statistics[theme] = None
+			notification_type = 'error'
+			notification_message = 'Failed to extract all key information. Some themes are being trained, please try again later.'
 		else:
 			# Output if there is not data
 			theme_classification_results[theme] = None
@@ -166,12 +128,12 @@ def results(request):
 			notification_type = 'error'
 			notification_message = 'Failed to extract all key information. Some themes are not in the database.'
 
-	return render(request, template_name, {
-		'application_name': application_name,
+	all_classified = all(theme_result['status'] == 'classified' for theme_result in theme_results.values())
+
+	return ({
 		'notification_type': notification_type,
 		'notification_message': notification_message,
 		'theme_definitions': theme_definitions,
-		'original_text': original_text,
 		'vocabulary_size': vocabulary_size,
 		'original_text_length': original_text_length,
 		'tokens': tokens,
@@ -180,7 +142,93 @@ def results(request):
 		'theme_classification_results': theme_classification_results,
 		'theme_classification_statistics': theme_classification_statistics,
 		'corpora_statistics': corpora_statistics,
-		})
+		}, all_classified)
+
+
+def results(request):
+	application_name = "key-information-extractor"
+	template_name = 'key_information_extractor/results.html'
+
+	# Get the input
+	themes = request.POST.get('theme')
+	original_text = request.POST.get('text')
+	
+	# Clean the themes
+	themes = remove_non_letters(themes)
+	themes = remove_extra_whitespaces(themes).lower()
+	theme_list = tokenize(themes)
+
+	# Analyze the text once for all outputs
+	document = AnalyzedDocument(original_text)
+
+	# Get the last classifier trained on the corpus
+	with profile_stage('model_loading'):
+		themes_model_entry = get_themes_model_entry()
+
+	if themes_model_entry is not None:
+		# Reuse the outputs of the same text, themes, classifier and metrics
+		evaluation = get_evaluation_report(THEMES_MODEL)
+		results_key = get_results_cache_key(THEMES_MODEL, document.normalized_text, theme_list, themes_model_entry, evaluation)
+
+		with profile_stage('results_cache'):
+			theme_results = get_cached_results(results_key)
+
+		if theme_results is None:
+			theme_results, all_classified = get_theme_results(document, theme_list, themes_model_entry['model'])
+
+			# Themes being trained or missing are checked again on the next request
+			if all_classified:
+				cache_results(results_key, theme_results)
+	else:
+		theme_results, all_classified = get_theme_results(document, theme_list, None)
+
+	with profile_stage('template_rendering'):
+		response = render(request, template_name, dict(theme_results, **{
+			'application_name': application_name,
+			'original_text': original_text,
+			}))
+
+	return response
+
+
+@csrf_exempt
+@require_POST
+def analyze(request):
+	documents = get_json_list(request, 'documents')
+	themes = get_json_list(request, 'themes')
+
+	if documents is None or themes is None:
+		return json_error('Expected a JSON object with a list of documents and a list of themes.')
+
+	# Clean the themes
+	theme_list = [ remove_spaces(remove_non_letters(theme)).lower() for theme in themes ]
+
+	# Get the last classifier trained on the corpus
+	with profile_stage('model_loading'):
+		themes_model = get_themes_model()
+
+	if themes_model is None:
+		return JsonResponse({ 'error': 'The theme classifier is being trained. Please try again later.' }, status=503)
+
+	sentence_lists = [ paragraph_to_sentences(document) for document in documents ]
+	results = [ { 'sentences': sentences, 'themes': {} } for sentences in sentence_lists ]
+
+	# Classify the sentences of all documents against all themes in one batch
+	batch_sentences = [ sentence for sentences in sentence_lists for sentence in sentences ]
+	theme_results = classify_theme_sentences(batch_sentences, theme_list, themes_model)
+
+	for theme in theme_list:
+		theme_result = theme_results[theme]
+
+		if theme_result['classifications'] is None:
+			classification_lists = [ None for sentences in sentence_lists ]
+		else:
+			classification_lists = regroup_list(theme_result['classifications'], sentence_lists)
+
+		for result, classifications in zip(results, classification_lists):
+			result['themes'][theme] = classifications
+
+	return JsonResponse({ 'results': results })
 
 
 def add_corpus(request):
@@ -195,7 +243,13 @@ def add_corpus(request):
 		theme = remove_spaces(request.POST.get('theme', False)).lower()
 
 		if text != "" or theme != "":
-			Classified_Corpus(text=text, theme=theme).save()
+			corpus = Classified_Corpus(text=text, theme=theme, tokens=join_tokens(get_text_tokens(text)))
+			corpus.save()
+			set_corpus_labels(Classified_Corpus, 'themes', [(corpus.id, corpus.theme)])
+			add_to_cached_count(Classified_Corpus, 1)
+
+			# Retrain the classifier in the training worker
+			enqueue_training_job(THEMES_MODEL)
 
 			return_values['notification_type'] = 'success'
 			return_values['notification_message'] = 'Successfully added a theme-classified data.'
@@ -203,4 +257,36 @@ def add_corpus(request):
 			return_values['notification_type'] = 'error'
 			return_values['notification_message'] = 'Failed to add theme-classified data.'
 
-	return render(request, template_name, return_values)
\ No newline at end of file
+	return render(request, template_name, return_values)
+
+
+@staff_member_required
+def upload_corpus(request):
+	return_values = {}
+	return_values['notification_type'] = 'error'
+	return_values['notification_message'] = 'Failed to add theme-classified data.'
+
+	if request.method == 'POST':
+		form = UploadFileForm(request.POST, request.FILES)
+
+		if form.is_valid():
+			corpus_file = request.FILES['corpus_file']
+			file_format = get_corpus_file_format(corpus_file.name)
+
+			if file_format is not None:
+				try:
+					count, labels, skipped = import_corpus_file(corpus_file, file_format, Classified_Corpus, 'theme', 'themes')
+
+					return_values['notification_type'] = 'success'
+					return_values['notification_message'] = 'Successfully added %d theme-classified data, skipped %d rows without a text or theme.' % (count, skipped)
+				except CorpusImportError as error:
+					return_values['notification_message'] = 'Failed to add theme-classified data. %s The %d rows before it were added and %d rows without a text or theme were skipped, import only the rest of the file.' % (error, error.count, error.skipped)
+				finally:
+					# Retrain the classifier in the training worker, with the rows added before an error too
+					enqueue_training_job(THEMES_MODEL)
+	else:
+		form = UploadFileForm()
+
+	return_values['form'] = form
+
+	return render(request, 'admin/upload_message.html', return_values)
\ No newline at end of file
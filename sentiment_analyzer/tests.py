@@ -1,3 +1,89 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from io import BytesIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from sociagraph.models import Sentiment_Corpus
+from sociagraph.corpus_import import CorpusImportError, get_corpus_file_format, import_corpus_file
+from sociagraph.pagination import get_cached_count
+
+
+class CorpusImportTest(TestCase):
+
+	def setUp(self):
+		cache.clear()
+
+	# Description:  Import the content of a corpus file into the sentiment corpus
+	# Parameter/s:  bytes | str ('csv' | 'jsonl') | int
+	# Return:	    tuple (int, set([ str, ... ]), int)
+	def import_content(self, content, file_format, batch_size = 1000):
+		return import_corpus_file(BytesIO(content), file_format, Sentiment_Corpus, 'emotion', 'emotions', batch_size)
+
+	# Description:  Get the texts and linked labels of the sentiment corpus
+	# Parameter/s:  None
+	# Return:	    list [ (unicode, list [ unicode, ... ]), ... ]
+	def get_corpora(self):
+		return [ (corpus.text, sorted(label.name for label in corpus.emotions.all())) for corpus in Sentiment_Corpus.objects.order_by('id') ]
+
+	def test_file_format(self):
+		self.assertEqual(get_corpus_file_format('corpus.CSV'), 'csv')
+		self.assertEqual(get_corpus_file_format('corpus.jsonl'), 'jsonl')
+		self.assertIsNone(get_corpus_file_format('corpus.txt'))
+
+	def test_csv(self):
+		count, labels, skipped = self.import_content(b'text,label\nI am glad,Happy\nI cry,sad\n,sad\nno label,\n', 'csv', 1)
+
+		self.assertEqual((count, labels, skipped), (2, set(['happy', 'sad']), 2))
+		self.assertEqual(self.get_corpora(), [(u'I am glad', [u'happy']), (u'I cry', [u'sad'])])
+
+	def test_jsonl(self):
+		count, labels, skipped = self.import_content(b'{"text": "I am glad", "emotion": "happy"}\n\n{"text": "I cry", "label": "sad"}\n', 'jsonl')
+
+		self.assertEqual((count, labels, skipped), (2, set(['happy', 'sad']), 0))
+		self.assertEqual(self.get_corpora(), [(u'I am glad', [u'happy']), (u'I cry', [u'sad'])])
+
+	def test_rows_before_an_invalid_line_are_kept(self):
+		with self.assertRaises(CorpusImportError) as context:
+			self.import_content(b'{"text": "I am glad", "label": "happy"}\n{"text": "", "label": "sad"}\n[1]\n{"text": "I cry", "label": "sad"}\n', 'jsonl', 1)
+
+		self.assertEqual((context.exception.count, context.exception.skipped), (1, 1))
+		self.assertEqual(self.get_corpora(), [(u'I am glad', [u'happy'])])
+
+	def test_only_the_imported_rows_are_linked(self):
+		Sentiment_Corpus.objects.create(text='I am afraid', emotion='fearful')
+
+		self.import_content(b'I am glad,happy\n', 'csv')
+
+		self.assertEqual(self.get_corpora(), [(u'I am afraid', []), (u'I am glad', [u'happy'])])
+
+	def test_cached_count(self):
+		self.assertEqual(get_cached_count(Sentiment_Corpus), 0)
+
+		self.import_content(b'I am glad,happy\nI cry,sad\n', 'csv', 1)
+
+		self.assertEqual(get_cached_count(Sentiment_Corpus), 2)
+
+
+class AnalyzeTest(TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.settings_override = override_settings(MODEL_STORE_DIR=self.directory)
+		self.settings_override.enable()
+
+	def tearDown(self):
+		self.settings_override.disable()
+		shutil.rmtree(self.directory, ignore_errors=True)
+
+	def test_invalid_request(self):
+		response = self.client.post('/sentiment_analyzer/api/analyze/', json.dumps({ 'texts': [] }), content_type='application/json')
+
+		self.assertEqual(response.status_code, 400)
+
+	def test_no_trained_classifier(self):
+		response = self.client.post('/sentiment_analyzer/api/analyze/', json.dumps({ 'documents': ['I am glad.'] }), content_type='application/json')
+
+		self.assertEqual(response.status_code, 503)
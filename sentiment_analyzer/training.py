@@ -0,0 +1,148 @@
+from django.db.models import Max
+
+from sociagraph.models import Sentiment_Corpus
+from sociagraph.registry import model_registry, get_corpus_version
+from sociagraph.jobs import register_trainer
+from sociagraph.evaluation import register_evaluator, get_evaluation_job_name
+from sociagraph.utils import *
+from sociagraph.model_store import load_model
+from sociagraph.features import SparseFeatureVectorizer
+from sociagraph.online import get_feature_count, create_classifier, get_online_state, get_updatable_model, update_online_model
+
+SENTIMENTS = ['happy', 'sad', 'angry', 'fearful', 'neutral']
+
+# Description:  Get the tokens and emotion of each emotion of the sentiment corpora
+# Parameter/s:  QuerySet (text, tokens, emotion)
+# Return:	    list [ ([ token, ... ], emotion), ... ]
+def get_emotion_labeled_tokens(labeled_corpora):
+	emotion_labeled_corpora = []
+
+	# Use the tokens stored with the corpora
+	for text, tokens, emotion in labeled_corpora.iterator():
+		emotion_labeled_corpora.append((remove_stopword_tokens(get_corpus_tokens(text, tokens)), unicode_to_string(emotion)))
+
+	return emotion_labeled_corpora
+
+# Description:  Get the tokens and emotions of the sentiment corpora up to an id
+# Parameter/s:  int
+# Return:	    list [ ([ token, ... ], emotion), ... ]
+# Dependencies: get_emotion_labeled_tokens()
+def get_sentiment_training_tokens(last_id):
+	# One row per emotion of each text
+	return get_emotion_labeled_tokens(Sentiment_Corpus.objects.filter(id__lte=last_id, emotions__isnull=False).order_by('id').values_list('text', 'tokens', 'emotions__name'))
+
+# Description:  Train a sentiment classifier on labeled tokens
+# Parameter/s:  list [ ([ token, ... ], emotion), ... ] | list [ str, ... ]
+# Return:	    SparseClassifier
+def fit_sentiment_classifier(emotion_labeled_corpora, sentiments = SENTIMENTS):
+	# Get the vocabulary
+	feature_set_words = get_feature_set_words(emotion_labeled_corpora)
+
+	# Vectorize the words in feature set words and their synonyms to the sentiments
+	vectorizer = SparseFeatureVectorizer(sentiments, get_feature_count()).fit(feature_set_words)
+
+	return create_classifier(vectorizer).train_tokens(emotion_labeled_corpora)
+
+# Description:  Get the metrics of a sentiment classifier on labeled tokens
+# Parameter/s:  SparseClassifier | list [ ([ token, ... ], emotion), ... ] | list [ str, ... ]
+# Return:	    dict { accuracy, precision, recall, f-measure }
+def score_sentiment_classifier(svm_classifier, test_set, sentiments = SENTIMENTS):
+	test_set_tokens = []
+	test_set_correct_classifications = []
+
+	# Get the test tokens and labels for metrics
+	for tokens, labels in test_set:
+		test_set_tokens.append(tokens)
+		test_set_correct_classifications.append(labels)
+
+	test_set_reclassification = svm_classifier.classify_many_tokens(test_set_tokens)
+
+	return get_classification_scores(test_set_correct_classifications, test_set_reclassification, sentiments)
+
+# Description:  Train the sentiment classifier on the whole sentiment corpus
+# Parameter/s:  list [ str, ... ] | function (int) -> None
+# Return:	    dict { classifier, corpora_count, online }
+def train_sentiment_model(sentiments, report_progress = lambda progress: None):
+	last_id = Sentiment_Corpus.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+	emotion_labeled_corpora = get_sentiment_training_tokens(last_id)
+
+	report_progress(20)
+
+	svm_classifier = fit_sentiment_classifier(emotion_labeled_corpora, sentiments)
+
+	return {
+		'classifier': svm_classifier,
+		'corpora_count': len(emotion_labeled_corpora),
+		'online': get_online_state(last_id),
+	}
+
+# Description:  Get the sentiment corpora to evaluate
+# Parameter/s:  None
+# Return:	    tuple (version, list [ ([ token, ... ], emotion), ... ], list [ corpus id, ... ]) one row per emotion of each text
+# Dependencies: get_sentiment_training_tokens()
+def get_sentiment_evaluation_data():
+	version = get_corpus_version(Sentiment_Corpus)
+	last_id = version[1] or 0
+
+	# The rows of a text are kept in one fold by its id
+	corpus_ids = list(Sentiment_Corpus.objects.filter(id__lte=last_id, emotions__isnull=False).order_by('id').values_list('id', flat=True))
+
+	return (version, get_sentiment_training_tokens(last_id), corpus_ids)
+
+register_evaluator('sentiment', get_sentiment_evaluation_data, fit_sentiment_classifier, score_sentiment_classifier)
+
+# Description:  Update the saved sentiment classifier with the corpora added since it was saved
+# Parameter/s:  tuple
+# Return:	    dict { classifier, corpora_count, online } | None to train from scratch
+def update_sentiment_model(version):
+	stored_model = load_model('sentiment', mmap=False)
+
+	if stored_model is None or stored_model['model'].get('online') is None or version[1] is None:
+		return None
+
+	last_id = stored_model['model']['online']['last_id']
+	new_corpora = Sentiment_Corpus.objects.filter(id__gt=last_id, id__lte=version[1])
+	sentiment_model = get_updatable_model(stored_model, version, new_corpora.count())
+
+	if sentiment_model is None:
+		return None
+
+	return update_online_model(sentiment_model, get_emotion_labeled_tokens(new_corpora.filter(emotions__isnull=False).values_list('text', 'tokens', 'emotions__name')), version[1])
+
+# Description:  Train the sentiment classifier for the training worker
+# Parameter/s:  str | function (int) -> None
+# Return:	    tuple (version, dict { classifier, corpora_count, online }, list [ job model name, ... ])
+def train_sentiment(model_name, report_progress):
+	version = get_corpus_version(Sentiment_Corpus)
+	sentiment_model = update_sentiment_model(version)
+
+	# An updated model is evaluated again as well, so that its metrics follow its version
+	if sentiment_model is not None:
+		return (version, sentiment_model, [ get_evaluation_job_name('sentiment') ])
+
+	sentiment_model = train_sentiment_model(SENTIMENTS, report_progress)
+
+	# Metrics are computed by the evaluation job, once the model is saved
+	return (version, sentiment_model, [ get_evaluation_job_name('sentiment') ])
+
+register_trainer('sentiment', train_sentiment)
+
+# Description:  Get the last trained sentiment classifier with its corpus version, queueing training if outdated
+# Parameter/s:  None
+# Return:	    dict { version, model { classifier, corpora_count, online }, version_name } | None if never trained
+def get_sentiment_model_entry():
+	version = get_corpus_version(Sentiment_Corpus)
+
+	return model_registry.get_latest_entry('sentiment', version)
+
+# Description:  Get the last trained sentiment classifier, queueing training if outdated
+# Parameter/s:  None
+# Return:	    dict { classifier, corpora_count, online } | None if never trained
+# Dependencies: get_sentiment_model_entry()
+def get_sentiment_model():
+	entry = get_sentiment_model_entry()
+
+	if entry is None:
+		return None
+
+	return entry['model']
@@ -1,9 +1,23 @@
+from collections import Counter
+
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from django.contrib.admin.views.decorators import staff_member_required
 from sociagraph.models import Sentiment_Corpus
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from sociagraph.utils import *
 from sociagraph.forms import UploadFileForm
+from sociagraph.corpus_import import CorpusImportError, get_corpus_file_format, import_corpus_file
+from sociagraph.labels import set_corpus_labels
+from sociagraph.pagination import get_keyset_page, get_cached_count, add_to_cached_count
+from sociagraph.document import AnalyzedDocument
+from sociagraph.api import get_json_list, json_error
+from sociagraph.jobs import enqueue_training_job
+from sociagraph.evaluation import get_evaluation_report
+from sociagraph.profiling import profile_stage
+from sociagraph.results_cache import get_results_cache_key, get_cached_results, cache_results
+from sentiment_analyzer.training import get_sentiment_model, get_sentiment_model_entry
 
 def index(request):
 	application_name = "sentiment-analyzer"
@@ -19,28 +33,18 @@ def corpus(request):
 	template_name = 'sentiment_analyzer/corpus.html'
 
 	# Get the corpora from the database
-	sentiment_corpus = Sentiment_Corpus.objects.all()
-
-	# Count the total corpora in the database
-	total_corpora_count = sentiment_corpus.count()
-	
-	# Setup pagination
-	paginator = Paginator(sentiment_corpus, 10)
+	sentiment_corpus = Sentiment_Corpus.objects.prefetch_related('emotions').order_by('id')
 
-	# Get requested page
-	page = request.GET.get('page')
+	# Get the cached count of the corpora in the database
+	total_corpora_count = get_cached_count(Sentiment_Corpus)
 
-	try:
-		corpora = paginator.page(page)
-	except PageNotAnInteger:
-		corpora = paginator.page(1)
-	except EmptyPage:
-		corpora = paginator.page(paginator.num_pages)
+	# Get the requested page by id
+	corpora = get_keyset_page(request, sentiment_corpus, 10)
 
 	new_classified_corpus = []
 
 	for corpus in corpora:
-		new_classified_corpus.append((corpus.text, corpus.emotion.split(',')))
+		new_classified_corpus.append((corpus.text, [ emotion.name for emotion in corpus.emotions.all() ]))
 
 	return render(request, template_name, {
 		'application_name': application_name,
@@ -49,94 +53,66 @@ def corpus(request):
 		'items': corpora,
 		})
 
-def results(request):
-	application_name = "sentiment-analyzer"
-	template_name = 'sentiment_analyzer/results.html'
-
-	original_text = request.POST.get('text')
-
-	sentiments = ['happy', 'sad', 'angry', 'fearful', 'neutral']
-	
+# Description:  Analyze a text and classify the sentiment of its sentences
+# Parameter/s:  AnalyzedDocument | dict { classifier, corpora_count, online } | None if never trained | dict { report, ... } | None if never evaluated
+# Return:	    dict (outputs of the results page)
+def get_sentiment_results(document, sentiment_model, evaluation):
 	# Clean the text for processing
-	filtered_text = remove_extra_whitespaces(original_text)
+	filtered_text = document.normalized_text
 
-	# Process the tokens
-	tokens = tokenize(original_text)
+	with profile_stage('text_analysis'):
+		# Process the tokens
+		tokens = document.tokens
 
-	# Get vocabulary size
-	vocabulary_size = get_vocabulary_count(original_text)
-	original_text_length = count_words(original_text)
-	# Process the Bag of Words
-	bag_of_words = sort_dictionary_by_key(get_bag_of_words(original_text))
+		# Get vocabulary size
+		vocabulary_size = document.vocabulary_size
+		original_text_length = document.word_count
+		# Process the Bag of Words
+		bag_of_words = document.sorted_bag_of_words
 
 	# Process POS Tagging
-	pos_tags = get_pos_tags(original_text)
-	pos_tags = get_pos_tag_values(pos_tags)
-
-	# Get all text from database
-	# labeled_corpora = Sentiment_Corpus.objects.all()
-	labeled_corpora = Sentiment_Corpus.objects.all()
-
-	# Count corpora in the database
-	labeled_corpora_count = labeled_corpora.count()
+	with profile_stage('pos_tagging'):
+		pos_tags = document.pos_tags
 
 	# ==== Output variables ====
 	corpora_statistics = {}
-	emotion_labeled_corpora = []
 	overall_sentiment = ''
+	sentiment_classification_statistics = {}
 	# ==========================
 
-	for corpus in labeled_corpora:
-		emotion_labeled_corpora.append((unicode_to_string(remove_stopwords(corpus.text)), unicode_to_string(corpus.emotion)))
-
-	shuffle_set(emotion_labeled_corpora)
-
-	# Get the vocabulary
-	feature_set_words = get_feature_set_words(emotion_labeled_corpora)
-
-	# Check if the words in a paragraph is in feature set words
-	feature_sets = get_sentiment_feature_sets(emotion_labeled_corpora, feature_set_words, sentiments)
-
-	set_size = len(feature_sets)/2
-	test_set = feature_sets[:set_size]
-	train_set = feature_sets[set_size:]
-
-	svm_classifier = create_svm_classifier()
-	svm_classifier = train_classifier(svm_classifier, train_set)
+	classified_sentences = {}
+	sentiment_frequency = { 'happy': 0, 'sad': 0, 'angry': 0, 'fearful': 0, 'neutral': 0 }
 
-	test_set_features = []
-	test_set_correct_classifications = []
+	if sentiment_model is not None:
+		svm_classifier = sentiment_model['classifier']
 
-	# Get the test features and labels for metrics
-	for features, labels in test_set:
-		test_set_features.append(features)
-		test_set_correct_classifications.append(labels)
+		# Metrics of the last cross-validation of the classifier
+		sentiment_classification_statistics = evaluation['report'] if evaluation is not None else {}
 
-	test_set_reclassification = svm_classifier.classify_many(test_set_features)
-	sentiment_classification_statistics = get_classification_scores(test_set_correct_classifications, test_set_reclassification, sentiments)	
+		# Count corpora in the database
+		labeled_corpora_count = sentiment_model['corpora_count']
 
-	classified_sentences = {}
-	sentiment_frequency = { 'happy': 0, 'sad': 0, 'angry': 0, 'fearful': 0, 'neutral': 0 }
-
-	for sentence in paragraph_to_sentences(original_text):
-		classification_test = get_sentiment_features(sentence, feature_set_words, sentiments)
+		sentences = document.sentences
 
 		# Get each theme classification per sentence
-		classification = svm_classifier.classify(classification_test)
-		classified_sentences[sentence] = classification
-		sentiment_frequency.update({ classification: sentiment_frequency[classification]+1 })
-	overall_sentiment = get_most_frequent_sentiment(sentiment_frequency)
-	corpora_statistics = sort_dictionary_by_key({ 'Corpora Total': labeled_corpora_count, 'Test Set Count': labeled_corpora_count/2, 'Train Set Count': labeled_corpora_count /2})
-	sentiment_frequency = sort_dictionary_by_value(sentiment_frequency)
+		for sentence, classification in zip(sentences, svm_classifier.classify_many(sentences)):
+			classified_sentences[sentence] = classification
+			sentiment_frequency.update({ classification: sentiment_frequency[classification]+1 })
+		overall_sentiment = get_most_frequent_sentiment(sentiment_frequency)
+		corpora_statistics = sort_dictionary_by_key({ 'Corpora Total': labeled_corpora_count, 'Train Set Count': labeled_corpora_count })
+
+		notification_type = 'success'
+		notification_message = 'Successfully analyzed text sentiment.'
+	else:
+		# Output while the first model is being trained
+		notification_type = 'error'
+		notification_message = 'The sentiment classifier is being trained. Please try again later.'
 
-	notification_type = 'success'
-	notification_message = 'Successfully analyzed text sentiment.'
+	sentiment_frequency = sort_dictionary_by_value(sentiment_frequency)
 
-	return render(request, template_name, {
-		'application_name': application_name,
+	return {
 		'notification_type': notification_type,
 		'notification_message': notification_message,
-		'original_text': original_text,
 		'filtered_text': filtered_text,
 		'vocabulary_size': vocabulary_size,
 		'original_text_length': original_text_length,
@@ -148,7 +124,73 @@ def results(request):
 		'classified_sentences': classified_sentences,
 		'overall_sentiment': overall_sentiment,
 		'sentiment_classification_statistics': sentiment_classification_statistics,
-		})
+		}
+
+def results(request):
+	application_name = "sentiment-analyzer"
+	template_name = 'sentiment_analyzer/results.html'
+
+	original_text = request.POST.get('text')
+
+	# Analyze the text once for all outputs
+	document = AnalyzedDocument(original_text)
+
+	# Get the last classifier trained on the corpus
+	with profile_stage('model_loading'):
+		sentiment_model_entry = get_sentiment_model_entry()
+
+	if sentiment_model_entry is not None:
+		# Reuse the outputs of the same text, classifier and metrics
+		evaluation = get_evaluation_report('sentiment')
+		results_key = get_results_cache_key('sentiment', document.normalized_text, [], sentiment_model_entry, evaluation)
+
+		with profile_stage('results_cache'):
+			sentiment_results = get_cached_results(results_key)
+
+		if sentiment_results is None:
+			sentiment_results = get_sentiment_results(document, sentiment_model_entry['model'], evaluation)
+			cache_results(results_key, sentiment_results)
+	else:
+		sentiment_results = get_sentiment_results(document, None, None)
+
+	with profile_stage('template_rendering'):
+		response = render(request, template_name, dict(sentiment_results, **{
+			'application_name': application_name,
+			'original_text': original_text,
+			}))
+
+	return response
+
+@csrf_exempt
+@require_POST
+def analyze(request):
+	documents = get_json_list(request, 'documents')
+
+	if documents is None:
+		return json_error('Expected a JSON object with a list of documents.')
+
+	# Get the last classifier trained on the corpus
+	with profile_stage('model_loading'):
+		sentiment_model = get_sentiment_model()
+
+	if sentiment_model is None:
+		return JsonResponse({ 'error': 'The sentiment classifier is being trained. Please try again later.' }, status=503)
+
+	svm_classifier = sentiment_model['classifier']
+
+	# Classify the sentences of all documents in one batch
+	sentence_lists = [ paragraph_to_sentences(document) for document in documents ]
+	classification_lists = classify_sentence_lists(svm_classifier, sentence_lists)
+
+	results = []
+
+	for sentences, classifications in zip(sentence_lists, classification_lists):
+		results.append({
+			'sentiment': get_most_frequent_sentiment(Counter(classifications)),
+			'sentences': [ [sentence, classification] for sentence, classification in zip(sentences, classifications) ],
+			})
+
+	return JsonResponse({ 'results': results })
 
 def add_corpus(request):
 	application_name = "sentiment-analyzer"
@@ -162,7 +204,13 @@ def add_corpus(request):
 		emotion = remove_spaces(request.POST.get('sentiment', False)).lower()
 
 		if text != "" or emotion != "":
-			Sentiment_Corpus(text=text, emotion=emotion).save()
+			corpus = Sentiment_Corpus(text=text, emotion=emotion, tokens=join_tokens(get_text_tokens(text)))
+			corpus.save()
+			set_corpus_labels(Sentiment_Corpus, 'emotions', [(corpus.id, corpus.emotion)])
+			add_to_cached_count(Sentiment_Corpus, 1)
+
+			# Retrain the classifier in the training worker
+			enqueue_training_job('sentiment')
 
 			return_values['notification_type'] = 'success'
 			return_values['notification_message'] = 'Successfully added a sentiment-labeled data.'
@@ -172,16 +220,33 @@ def add_corpus(request):
 
 	return render(request, template_name, return_values)
 
+@staff_member_required
 def upload_corpus(request):
 	return_values = {}
-	filename = request.POST.get('corpus_file')
+	return_values['notification_type'] = 'error'
+	return_values['notification_message'] = 'Failed to add sentiment-labeled data.'
+
 	if request.method == 'POST':
 		form = UploadFileForm(request.POST, request.FILES)
+
 		if form.is_valid():
-			form = request.FILES['corpus_file']
+			corpus_file = request.FILES['corpus_file']
+			file_format = get_corpus_file_format(corpus_file.name)
+
+			if file_format is not None:
+				try:
+					count, labels, skipped = import_corpus_file(corpus_file, file_format, Sentiment_Corpus, 'emotion', 'emotions')
+
+					return_values['notification_type'] = 'success'
+					return_values['notification_message'] = 'Successfully added %d sentiment-labeled data, skipped %d rows without a text or sentiment.' % (count, skipped)
+				except CorpusImportError as error:
+					return_values['notification_message'] = 'Failed to add sentiment-labeled data. %s The %d rows before it were added and %d rows without a text or sentiment were skipped, import only the rest of the file.' % (error, error.count, error.skipped)
+				finally:
+					# Retrain the classifier in the training worker, with the rows added before an error too
+					enqueue_training_job('sentiment')
 	else:
 		form = UploadFileForm()
-	return_values['notification_type'] = 'error'
-	return_values['notification_message'] = 'Failed to add sentiment-labeled data.'
 
-	return render(request, 'admin/upload_message.html', {'form': filename})
\ No newline at end of file
+	return_values['form'] = form
+
+	return render(request, 'admin/upload_message.html', return_values)
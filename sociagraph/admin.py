@@ -1,6 +1,87 @@
 from django.contrib import admin
+from django.contrib.admin.actions import delete_selected
 from sociagraph.models import Classified_Corpus
 from sociagraph.models import Sentiment_Corpus
+from sociagraph.models import Training_Job
+from sociagraph.models import Evaluation_Report
+from sociagraph.labels import set_corpus_labels
+from sociagraph.utils import get_text_tokens, join_tokens
+from sociagraph.pagination import add_to_cached_count
+from sociagraph.registry import mark_corpus_edited
+from sociagraph.jobs import enqueue_training_job
 
-admin.site.register(Classified_Corpus)
-admin.site.register(Sentiment_Corpus)
\ No newline at end of file
+# The label links and tokens are kept in sync with the label strings and text.
+# Changes made in the admin are counted like the other corpus changes: the
+# cached row counts follow the added and deleted rows, changed and deleted rows
+# change the corpus version, and the model of the corpus is queued for training.
+
+# Description:  Delete the selected corpora, counting them once the deletion is confirmed
+# Parameter/s:  Corpus_Admin | HttpRequest | QuerySet
+# Return:	    HttpResponse | None once deleted
+# Dependencies: delete_selected()
+def delete_selected_corpora(modeladmin, request, queryset):
+	count = queryset.count()
+	response = delete_selected(modeladmin, request, queryset)
+
+	# The confirmation page is returned until the deletion is confirmed
+	if response is None:
+		modeladmin.corpora_changed(-count)
+
+	return response
+
+delete_selected_corpora.short_description = delete_selected.short_description
+
+
+class Corpus_Admin(admin.ModelAdmin):
+	label_field = None
+	labels_field = None
+	model_name = None
+	actions = [delete_selected_corpora]
+
+	# Description:  Count added, changed or deleted corpora and queue the training of their model
+	# Parameter/s:  int (number of added rows, negative when deleted, 0 when changed)
+	# Return:	    None
+	def corpora_changed(self, added_count):
+		if added_count != 0:
+			add_to_cached_count(self.model, added_count)
+
+		# The latest id of the corpus only changes with added rows
+		if added_count <= 0:
+			mark_corpus_edited(self.model)
+
+		enqueue_training_job(self.model_name)
+
+	def get_actions(self, request):
+		actions = super(Corpus_Admin, self).get_actions(request)
+
+		# Replaced by delete_selected_corpora
+		actions.pop('delete_selected', None)
+
+		return actions
+
+	def save_model(self, request, obj, form, change):
+		obj.tokens = join_tokens(get_text_tokens(obj.text))
+		obj.save()
+		set_corpus_labels(self.model, self.labels_field, [(obj.id, getattr(obj, self.label_field))])
+		self.corpora_changed(0 if change else 1)
+
+	def delete_model(self, request, obj):
+		obj.delete()
+		self.corpora_changed(-1)
+
+class Classified_Corpus_Admin(Corpus_Admin):
+	exclude = ('themes',)
+	label_field = 'theme'
+	labels_field = 'themes'
+	model_name = 'themes'
+
+class Sentiment_Corpus_Admin(Corpus_Admin):
+	exclude = ('emotions',)
+	label_field = 'emotion'
+	labels_field = 'emotions'
+	model_name = 'sentiment'
+
+admin.site.register(Classified_Corpus, Classified_Corpus_Admin)
+admin.site.register(Sentiment_Corpus, Sentiment_Corpus_Admin)
+admin.site.register(Training_Job)
+admin.site.register(Evaluation_Report)
\ No newline at end of file
@@ -0,0 +1,31 @@
+import json
+
+from django.http import JsonResponse
+
+# Helpers of the JSON endpoints of the applications
+
+# Description:  Get a list of strings from the JSON body of a request
+# Parameter/s:  HttpRequest | str
+# Return:	    list [ str, ... ] | None if missing or invalid
+def get_json_list(request, key):
+	try:
+		data = json.loads(request.body)
+	except ValueError:
+		return None
+
+	if not isinstance(data, dict) or not isinstance(data.get(key), list):
+		return None
+
+	values = data[key]
+
+	for value in values:
+		if not isinstance(value, basestring):
+			return None
+
+	return values
+
+# Description:  Create the response of an invalid request
+# Parameter/s:  str
+# Return:	    JsonResponse
+def json_error(message):
+	return JsonResponse({ 'error': message }, status=400)
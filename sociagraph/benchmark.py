@@ -0,0 +1,259 @@
+import os
+import sys
+import time
+import json
+import random
+import string
+import datetime
+import subprocess
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+try:
+	import tracemalloc
+except ImportError:
+	tracemalloc = None
+
+from django.conf import settings
+from django.test import Client
+
+from sociagraph.models import Classified_Corpus, Sentiment_Corpus, Label
+from sociagraph.corpus_import import import_labeled_rows
+from sociagraph.registry import get_corpus_version, mark_corpus_edited, model_registry
+from sociagraph.model_store import save_model
+from sociagraph.features import SparseFeatureVectorizer, create_sparse_svm_classifier
+from sociagraph.utils import tokenize, get_bag_of_words, get_text_tokens, get_features, get_sentiment_feature_sets, get_feature_set_words, train_classifier
+from sentiment_analyzer.training import SENTIMENTS, train_sentiment_model
+from key_information_extractor.training import THEMES_MODEL, train_themes_model, get_themes_corpus_version
+
+# Measures the time and peak memory of the text utilities, the training of the
+# classifiers and the results views over synthetic labeled corpora, so that
+# runs on different commits can be compared.
+
+THEMES = ['education', 'health', 'politics', 'sports', 'technology']
+
+# Modules whose import time is measured, and the libraries they should only
+# import on first use
+IMPORTED_MODULES = ['sociagraph.urls', 'sociagraph.management.commands.run_training_worker']
+LAZY_LIBRARIES = ['nltk', 'sklearn', 'scipy', 'numpy']
+
+# Imports a module in a new interpreter after setting up Django and prints the
+# import time, the peak resident memory and the lazy libraries it loaded
+IMPORT_SCRIPT = '''
+import sys
+import json
+import time
+import resource
+import importlib
+
+import django
+
+start_time = time.time()
+django.setup()
+setup_seconds = time.time() - start_time
+
+start_time = time.time()
+importlib.import_module(sys.argv[1])
+seconds = time.time() - start_time
+
+# The peak of ru_maxrss can include the memory of the forking process
+try:
+	with open('/proc/self/status') as status_file:
+		peak_memory = int([ line.split()[1] for line in status_file if line.startswith('VmHWM:') ][0])
+		memory_source = 'VmHWM'
+except (IOError, IndexError):
+	peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	memory_source = 'ru_maxrss'
+
+print(json.dumps({
+	'setup_seconds': setup_seconds,
+	'seconds': seconds,
+	'peak_memory_kb': peak_memory,
+	'memory_source': memory_source,
+	'loaded_libraries': [ library for library in sys.argv[2:] if library in sys.modules ],
+}))
+'''
+
+# Description:  Create random lowercase words
+# Parameter/s:  Random | int
+# Return:	    list [ str, ... ]
+def create_vocabulary(random_generator, size):
+	return [ ''.join(random_generator.choice(string.ascii_lowercase) for index in range(random_generator.randint(3, 9))) for word in range(size) ]
+
+# Description:  Create a text of sentences mixing the words of a label with common words
+# Parameter/s:  Random | list [ str, ... ] | list [ str, ... ] | int
+# Return:	    str
+def generate_text(random_generator, label_words, common_words, word_count):
+	words = []
+
+	for index in range(word_count):
+		words.append(random_generator.choice(label_words if random_generator.random() < 0.3 else common_words))
+
+	sentences = [ ' '.join(words[index:index + 12]) for index in range(0, len(words), 12) ]
+
+	return '. '.join(sentences) + '.'
+
+# Description:  Generate labeled texts with a vocabulary per label
+# Parameter/s:  Random | list [ str, ... ] | int | int
+# Return:	    generator [ (str, str), ... ]
+def generate_labeled_rows(random_generator, labels, row_count, word_count):
+	common_words = create_vocabulary(random_generator, 500)
+	label_words = dict((label, [label] + create_vocabulary(random_generator, 50)) for label in labels)
+
+	for index in range(row_count):
+		label = labels[index % len(labels)]
+
+		yield (generate_text(random_generator, label_words[label], common_words, word_count), label)
+
+# Description:  Get the peak resident memory of the process
+# Parameter/s:  None
+# Return:	    int (kilobytes) | None if unsupported
+def get_peak_resident_memory():
+	if resource is None:
+		return None
+
+	peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+	# Reported in bytes on OS X and in kilobytes elsewhere
+	if sys.platform == 'darwin':
+		return peak_memory / 1024
+
+	return peak_memory
+
+# Description:  Run a function and measure its time and peak memory
+# Parameter/s:  function | arguments
+# Return:	    tuple (result, dict { seconds, peak_memory_kb, memory_source })
+def measure(function, *args):
+	if tracemalloc is not None:
+		tracemalloc.start()
+	else:
+		start_memory = get_peak_resident_memory()
+
+	start_time = time.time()
+	result = function(*args)
+	seconds = time.time() - start_time
+
+	if tracemalloc is not None:
+		peak_memory = tracemalloc.get_traced_memory()[1] / 1024
+		memory_source = 'tracemalloc'
+		tracemalloc.stop()
+	elif start_memory is not None:
+		# Growth of the peak resident memory of the process during the stage
+		peak_memory = get_peak_resident_memory() - start_memory
+		memory_source = 'ru_maxrss'
+	else:
+		peak_memory = None
+		memory_source = None
+
+	return (result, { 'seconds': seconds, 'peak_memory_kb': peak_memory, 'memory_source': memory_source })
+
+# Description:  Measure the import of a module in a new interpreter
+# Parameter/s:  str
+# Return:	    dict { module, stage, setup_seconds, seconds, peak_memory_kb, memory_source, loaded_libraries }
+def measure_import(module_name):
+	environment = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+	output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT, module_name] + LAZY_LIBRARIES, cwd=os.path.abspath(settings.BASE_DIR), env=environment)
+
+	statistics = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+	statistics.update({ 'module': module_name, 'stage': 'import' })
+
+	return statistics
+
+# Description:  Remove the corpora and labels
+# Parameter/s:  None
+# Return:	    None
+def clear_corpora():
+	Classified_Corpus.objects.all().delete()
+	Sentiment_Corpus.objects.all().delete()
+	Label.objects.all().delete()
+	mark_corpus_edited(Classified_Corpus)
+	mark_corpus_edited(Sentiment_Corpus)
+	model_registry.clear()
+
+# Description:  Train a classifier on generated texts of a document size
+# Parameter/s:  list [ (str, str), ... ]
+# Return:	    SparseClassifier
+def train_document_classifier(labeled_text):
+	labeled_tokens = [ (get_text_tokens(text), label) for text, label in labeled_text ]
+	vectorizer = SparseFeatureVectorizer(SENTIMENTS).fit(get_feature_set_words(labeled_tokens))
+
+	return train_classifier(create_sparse_svm_classifier(vectorizer), labeled_text)
+
+# Description:  Run the benchmarks of the corpus and document sizes
+# Parameter/s:  list [ int, ... ] | list [ int, ... ] | int | function (dict) -> None
+# Return:	    list [ { rows, document_words, stage, seconds, peak_memory_kb, memory_source }, ... ]
+# Dependencies: measure_import() | measure()
+def run_benchmarks(row_counts, document_sizes, seed = 0, report = lambda result: None):
+	results = []
+	client = Client()
+
+	# Startup cost of the processes, which should not load the lazy libraries
+	for module_name in IMPORTED_MODULES:
+		statistics = measure_import(module_name)
+		statistics.update({ 'rows': None, 'document_words': None })
+		results.append(statistics)
+		report(statistics)
+
+	def record(rows, document_words, stage, function, *args):
+		result, statistics = measure(function, *args)
+		statistics.update({ 'rows': rows, 'document_words': document_words, 'stage': stage })
+		results.append(statistics)
+		report(statistics)
+
+		return result
+
+	for rows in row_counts:
+		random_generator = random.Random(seed)
+		random.seed(seed)
+		clear_corpora()
+
+		record(rows, None, 'import_sentiment_corpus', import_labeled_rows, generate_labeled_rows(random_generator, SENTIMENTS, rows, 20), Sentiment_Corpus, 'emotion', 'emotions')
+		record(rows, None, 'import_theme_corpus', import_labeled_rows, generate_labeled_rows(random_generator, THEMES, rows, 20), Classified_Corpus, 'theme', 'themes')
+
+		sentiment_model = record(rows, None, 'train_sentiment_model', train_sentiment_model, SENTIMENTS)
+		themes_model = record(rows, None, 'train_themes_model', train_themes_model)
+
+		# Serve the trained models to the results views
+		save_model('sentiment', get_corpus_version(Sentiment_Corpus), sentiment_model)
+		save_model(THEMES_MODEL, get_themes_corpus_version(), themes_model)
+
+		for document_words in document_sizes:
+			labeled_text = list(generate_labeled_rows(random_generator, SENTIMENTS, 50, document_words))
+			document = labeled_text[0][0]
+			tokens = get_text_tokens(document)
+
+			record(rows, document_words, 'tokenize', tokenize, document)
+			record(rows, document_words, 'get_bag_of_words', get_bag_of_words, document)
+			record(rows, document_words, 'get_features', get_features, tokens, set(tokens), THEMES[0])
+			record(rows, document_words, 'get_sentiment_feature_sets', get_sentiment_feature_sets, [ (tokens, labeled_text[0][1]) ], set(tokens), SENTIMENTS)
+			record(rows, document_words, 'train_classifier', train_document_classifier, labeled_text)
+			record(rows, document_words, 'sentiment_results_view', client.post, '/sentiment_analyzer/results/', { 'text': document })
+			record(rows, document_words, 'theme_results_view', client.post, '/key_information_extractor/results/', { 'text': document, 'theme': ' '.join(THEMES[:2]) })
+
+	return results
+
+# Description:  Get the commit of the working tree
+# Parameter/s:  None
+# Return:	    str | None if not in a git repository
+def get_commit():
+	try:
+		return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, stderr=subprocess.STDOUT).strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+# Description:  Save benchmark results as JSON
+# Parameter/s:  str | list [ dict, ... ] | dict
+# Return:	    None
+# Dependencies: get_commit()
+def save_results(path, results, parameters):
+	with open(path, 'w') as results_file:
+		json.dump({
+			'commit': get_commit(),
+			'created': datetime.datetime.utcnow().isoformat(),
+			'python': sys.version.split()[0],
+			'parameters': parameters,
+			'results': results,
+		}, results_file, indent=2, sort_keys=True)
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Settings of the benchmarks, run with
+# python manage.py run_benchmarks --settings=sociagraph.benchmark_settings
+
+from sociagraph.settings import *
+
+# Queries are not recorded without debugging
+DEBUG = False
+
+TEMPLATE_DEBUG = False
+
+ALLOWED_HOSTS = ['testserver']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'benchmark.sqlite3'),
+    }
+}
+
+MODEL_STORE_DIR = os.path.join(BASE_DIR, 'benchmark_model_store')
\ No newline at end of file
@@ -0,0 +1,166 @@
+import csv
+import json
+import os
+
+from django.db import transaction
+from django.db.models import Max
+
+from sociagraph.utils import remove_extra_whitespaces, remove_spaces, get_text_tokens, join_tokens
+from sociagraph.labels import set_corpus_labels
+from sociagraph.pagination import add_to_cached_count
+
+# Imports labeled text into a corpus table. Rows are read one at a time from a
+# CSV file (text, label) or a JSON lines file ({"text": ..., "<label>": ...})
+# and inserted in batches, so memory stays bounded for any file size. Rows
+# without a text or label are skipped and counted. An invalid line stops the
+# import; the rows before it stay inserted and the error tells how many, so
+# that the rest of the file can be imported alone.
+
+# Description:  Get the format of a corpus file from its name
+# Parameter/s:  str
+# Return:	    str ('csv' | 'jsonl') | None if unknown
+def get_corpus_file_format(filename):
+	extension = os.path.splitext(filename)[1].lower()
+
+	if extension == '.csv':
+		return 'csv'
+
+	if extension in ('.jsonl', '.json'):
+		return 'jsonl'
+
+	return None
+
+
+
+class CorpusImportError(ValueError):
+
+	# Description:  Create the error of a corpus file that could not be read to its end
+	# Parameter/s:  str | int (rows inserted before the error) | set([ str, ... ]) (labels of the inserted rows) | int (rows skipped before the error)
+	def __init__(self, message, count, labels, skipped):
+		super(CorpusImportError, self).__init__(message)
+		self.count = count
+		self.labels = labels
+		self.skipped = skipped
+
+# Description:  Generate the (text, label) rows of a corpus file
+# Parameter/s:  file | str ('csv' | 'jsonl') | str
+# Return:	    generator [ (unicode, unicode | None), ... ], raises ValueError at the first invalid line
+def iterate_labeled_rows(corpus_file, file_format, label_field):
+	if file_format == 'csv':
+		reader = csv.reader(corpus_file)
+
+		while True:
+			try:
+				row = next(reader)
+			except StopIteration:
+				return
+			except csv.Error as error:
+				raise ValueError('Line %d is not valid CSV: %s' % (reader.line_num, error))
+
+			# Skip blank lines and the header
+			if len(row) < 2 or (row[0].strip().lower() == 'text' and row[1].strip().lower() in ('label', label_field)):
+				continue
+
+			try:
+				yield (row[0].decode('utf-8'), row[1].decode('utf-8'))
+			except UnicodeDecodeError:
+				raise ValueError('Line %d is not UTF-8 text.' % reader.line_num)
+	else:
+		for line_number, line in enumerate(corpus_file, 1):
+			line = line.strip()
+
+			if line == '':
+				continue
+
+			try:
+				item = json.loads(line)
+			except ValueError:
+				raise ValueError('Line %d is not valid JSON.' % line_number)
+
+			if not isinstance(item, dict):
+				raise ValueError('Line %d is not a JSON object.' % line_number)
+
+			text = item.get('text')
+			label = item.get(label_field, item.get('label'))
+
+			if not isinstance(text, basestring) or not isinstance(label, (basestring, type(None))):
+				raise ValueError('Line %d has no text, or a text or label that is not a string.' % line_number)
+
+			yield (text, label)
+
+# Description:  Get the ids and labels of the rows of a batch inserted after an id
+# Parameter/s:  Model | str | list [ Model, ... ] | int | int
+# Return:	    list [ (id, label), ... ]
+def get_inserted_batch_rows(model, label_field, batch, last_id, chunk_size = 500):
+	batch_rows = set((row.text, getattr(row, label_field)) for row in batch)
+	texts = sorted(set(text for text, label in batch_rows))
+	inserted_rows = []
+
+	# Rows added by other processes in the meantime have other texts, or the same text and label
+	for start in range(0, len(texts), chunk_size):
+		for corpus_id, text, label in model.objects.filter(id__gt=last_id, text__in=texts[start:start + chunk_size]).values_list('id', 'text', label_field):
+			if (text, label) in batch_rows:
+				inserted_rows.append((corpus_id, label))
+
+	return inserted_rows
+
+# Description:  Insert a batch of rows and link their labels in one transaction
+# Parameter/s:  Model | str | str | list [ Model, ... ]
+# Return:	    None
+# Dependencies: get_inserted_batch_rows() | set_corpus_labels() | add_to_cached_count()
+def insert_labeled_batch(model, label_field, labels_field, batch):
+	with transaction.atomic():
+		last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+		model.objects.bulk_create(batch)
+
+		# bulk_create does not return the ids, so the rows after the last id are matched on their text and label
+		set_corpus_labels(model, labels_field, get_inserted_batch_rows(model, label_field, batch, last_id))
+
+	add_to_cached_count(model, len(batch))
+
+# Description:  Insert labeled rows in batches, one transaction per batch
+# Parameter/s:  iterable [ (str, str), ... ] | Model | str | str | int
+# Return:	    tuple (int, set([ str, ... ]), int) count and labels of the inserted rows and count of the rows skipped without a text or label
+# Dependencies: insert_labeled_batch()
+def import_labeled_rows(rows, model, label_field, labels_field, batch_size = 1000):
+	count = 0
+	skipped = 0
+	labels = set()
+	batch = []
+
+	try:
+		for text, label in rows:
+			text = remove_extra_whitespaces(text)
+			label = remove_spaces(label or '').lower()
+
+			if text == '' or label == '':
+				skipped += 1
+				continue
+
+			batch.append(model(**{ 'text': text, 'tokens': join_tokens(get_text_tokens(text)), label_field: label }))
+			labels.add(label)
+
+			if len(batch) >= batch_size:
+				insert_labeled_batch(model, label_field, labels_field, batch)
+				count += len(batch)
+				batch = []
+	except ValueError as error:
+		# The rows before the invalid line are kept, so the error tells how many were inserted
+		if len(batch) > 0:
+			insert_labeled_batch(model, label_field, labels_field, batch)
+			count += len(batch)
+
+		raise CorpusImportError(str(error), count, labels, skipped)
+
+	if len(batch) > 0:
+		insert_labeled_batch(model, label_field, labels_field, batch)
+		count += len(batch)
+
+	return (count, labels, skipped)
+
+# Description:  Import a corpus file
+# Parameter/s:  file | str | Model | str | str | int
+# Return:	    tuple (int, set([ str, ... ]), int) count and labels of the inserted rows and count of the skipped rows, raises CorpusImportError at an invalid line
+# Dependencies: iterate_labeled_rows() | import_labeled_rows()
+def import_corpus_file(corpus_file, file_format, model, label_field, labels_field, batch_size = 1000):
+	return import_labeled_rows(iterate_labeled_rows(corpus_file, file_format, label_field), model, label_field, labels_field, batch_size)
\ No newline at end of file
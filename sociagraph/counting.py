@@ -0,0 +1,104 @@
+import re as regex
+import heapq
+import operator
+from collections import Counter, deque
+
+# Counts unigrams and n-grams of a token stream in one pass. Texts can be given
+# whole or as an iterable of chunks, so a large text never has to be held in
+# memory at once.
+
+word_pattern = regex.compile('[A-Za-z]+')
+
+# Description:  Generate the words of a text or of chunks of a text
+# Parameter/s:  str | iterable [ str, ... ]
+# Return:	    generator [ str, ... ]
+def iterate_words(chunks, pattern = word_pattern):
+	if isinstance(chunks, basestring):
+		chunks = [chunks]
+
+	remainder = ''
+
+	for chunk in chunks:
+		chunk = remainder + chunk
+		remainder = ''
+
+		for match in pattern.finditer(chunk):
+			# A word touching the end of the chunk may continue in the next one
+			if match.end() == len(chunk):
+				remainder = match.group()
+				break
+
+			yield match.group()
+
+	if remainder:
+		yield remainder
+
+# Description:  Generate the n-grams of a token stream
+# Parameter/s:  iterable [ str, ... ] | int
+# Return:	    generator [ (str, ...), ... ]
+def iterate_ngrams(tokens, n):
+	window = deque(maxlen=n)
+
+	for token in tokens:
+		window.append(token)
+
+		if len(window) == n:
+			yield tuple(window)
+
+
+class NgramCounter(object):
+
+	# Description:  Create a counter of 1-grams up to max_n-grams
+	# Parameter/s:  int
+	def __init__(self, max_n = 1):
+		self.max_n = max_n
+		self.counts = dict((n, Counter()) for n in range(1, max_n + 1))
+		self.window = deque(maxlen=max_n)
+
+	# Description:  Count the n-grams of more tokens, continuing the previous ones
+	# Parameter/s:  iterable [ str, ... ]
+	# Return:	    NgramCounter
+	def update(self, tokens):
+		window = self.window
+
+		for token in tokens:
+			window.append(token)
+			self.counts[1][token] += 1
+
+			for n in range(2, len(window) + 1):
+				self.counts[n][tuple(window)[-n:]] += 1
+
+		return self
+
+	# Description:  Get the frequency table of n-grams
+	# Parameter/s:  int
+	# Return:	    Counter { str | (str, ...): int }
+	def get_counts(self, n = 1):
+		return self.counts[n]
+
+	# Description:  Get the k most frequent n-grams
+	# Parameter/s:  int | int
+	# Return:	    list [ (str | (str, ...), int), ... ]
+	def most_common(self, k, n = 1):
+		return heapq.nlargest(k, self.counts[n].items(), key=operator.itemgetter(1))
+
+# Description:  Count the n-grams of a text or of chunks of a text
+# Parameter/s:  str | iterable [ str, ... ] | int
+# Return:	    NgramCounter
+# Dependencies: iterate_words()
+def count_ngrams(chunks, max_n = 1):
+	return NgramCounter(max_n).update(iterate_words(chunks))
+
+# Description:  Count samples per condition of (condition, sample) pairs
+# Parameter/s:  iterable [ (condition, sample), ... ]
+# Return:	    dict { condition: Counter { sample: int } }
+def count_conditional_frequencies(pairs):
+	frequencies = {}
+
+	for condition, sample in pairs:
+		if condition not in frequencies:
+			frequencies[condition] = Counter()
+
+		frequencies[condition][sample] += 1
+
+	return frequencies
@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from sociagraph.models import English_Dictionary
+from sociagraph.model_store import get_model_store_path, get_model_store_directory, write_file_atomically
+
+# The English_Dictionary table maps each word of the corpora to the ids of its
+# WordNet synsets (its synonym groups). It is built by the
+# build_english_dictionary command and read through an in-memory snapshot.
+# The command writes a stamp file in the model store when it is done, and
+# every process reloads its snapshot when the stamp changes, checking it at
+# most every DICTIONARY_CHECK_INTERVAL seconds. Without the stamp the
+# dictionary is taken as not built and the snapshot is empty.
+
+DICTIONARY_STAMP_FILE = 'english_dictionary.stamp'
+
+snapshot = None
+snapshot_stamp = None
+snapshot_checked = 0
+snapshot_lock = threading.Lock()
+
+# Description:  Load the word to synset ids index from the database
+# Parameter/s:  None
+# Return:	    dict { str: frozenset([ str, ... ]) }
+def load_dictionary():
+	dictionary = {}
+
+	try:
+		for word, associated_word in English_Dictionary.objects.values_list('word', 'associated_word').iterator():
+			synset_ids = dictionary.setdefault(word, set())
+
+			# Words without synsets are stored with an empty associated word
+			if associated_word:
+				synset_ids.add(associated_word)
+	except DatabaseError:
+		# The table is not migrated yet
+		return {}
+
+	return dict((word, frozenset(synset_ids)) for word, synset_ids in dictionary.items())
+
+# Description:  Get the stamp file written when the dictionary is built
+# Parameter/s:  None
+# Return:	    str
+def get_dictionary_stamp_path():
+	return os.path.join(get_model_store_path(), DICTIONARY_STAMP_FILE)
+
+# Description:  Get the stamp of the last build of the dictionary
+# Parameter/s:  None
+# Return:	    str | None if never built
+def get_dictionary_stamp():
+	try:
+		with open(get_dictionary_stamp_path()) as stamp_file:
+			return stamp_file.read()
+	except IOError:
+		return None
+
+# Description:  Mark the dictionary as rebuilt so that every process reloads its snapshot
+# Parameter/s:  None
+# Return:	    None
+def mark_dictionary_built():
+	write_file_atomically(os.path.join(get_model_store_directory(), DICTIONARY_STAMP_FILE), '%r-%d' % (time.time(), os.getpid()))
+
+# Description:  Get the in-memory snapshot of the dictionary, reloaded when the dictionary is rebuilt
+# Parameter/s:  None
+# Return:	    dict { str: frozenset([ str, ... ]) }
+# Dependencies: get_dictionary_stamp() | reload_dictionary_snapshot()
+def get_dictionary_snapshot():
+	global snapshot_checked
+
+	now = time.time()
+
+	if snapshot is not None and now - snapshot_checked < getattr(settings, 'DICTIONARY_CHECK_INTERVAL', 30):
+		return snapshot
+
+	stamp = get_dictionary_stamp()
+	snapshot_checked = now
+
+	if snapshot is None or stamp != snapshot_stamp:
+		reload_dictionary_snapshot(stamp)
+
+	return snapshot
+
+# Description:  Reload the snapshot after the dictionary is rebuilt
+# Parameter/s:  str (stamp of the loaded dictionary, None to read it)
+# Return:	    None
+def reload_dictionary_snapshot(stamp = None):
+	global snapshot, snapshot_stamp
+
+	if stamp is None:
+		stamp = get_dictionary_stamp()
+
+	with snapshot_lock:
+		# Another thread may have loaded it already
+		if snapshot is not None and snapshot_stamp == stamp:
+			return
+
+		# A dictionary that was never built is not read
+		snapshot = load_dictionary() if stamp is not None else {}
+		snapshot_stamp = stamp
+
+# Description:  Get the synset ids of a word from the dictionary
+# Parameter/s:  str
+# Return:	    frozenset([ str, ... ]) | None if the word is not in the dictionary
+def get_dictionary_synset_ids(word):
+	return get_dictionary_snapshot().get(word)
\ No newline at end of file
@@ -0,0 +1,79 @@
+import re as regex
+
+from django.utils.functional import cached_property
+
+from sociagraph.lazy import LazyModule
+from sociagraph.counting import NgramCounter
+from sociagraph.utils import remove_extra_whitespaces, unicode_to_string, paragraph_to_sentences, get_pos_tag_values, sort_dictionary_by_key
+
+nltk = LazyModule('nltk')
+
+# Analyzes a submitted text once. The text is normalized a single time, its
+# tokens and its words (letters only, as the bag of words and part of speech
+# tags always read them) are each computed once, and every statistic shown by
+# the results pages is derived lazily from them.
+
+token_filter_pattern = regex.compile('[^A-Za-z0-9\.\- ]+')
+non_letter_pattern = regex.compile('[^A-Za-z ]+')
+
+
+class AnalyzedDocument(object):
+
+	# Description:  Create the analysis of a text
+	# Parameter/s:  str
+	def __init__(self, text):
+		self.text = text
+
+	# Description:  Get the text without extra whitespaces
+	# Return:	    str
+	@cached_property
+	def normalized_text(self):
+		return remove_extra_whitespaces(self.text)
+
+	# Description:  Get the tokens of the text
+	# Return:	    list [ str, ... ]
+	@cached_property
+	def tokens(self):
+		return nltk.word_tokenize(unicode_to_string(token_filter_pattern.sub('', self.normalized_text)))
+
+	# Description:  Get the words of the text, with the characters other than letters replaced by a space
+	# Return:	    list [ str, ... ]
+	@cached_property
+	def words(self):
+		return nltk.word_tokenize(unicode_to_string(non_letter_pattern.sub(' ', self.normalized_text)))
+
+	# Description:  Get the total number of words
+	# Return:	    int
+	@cached_property
+	def word_count(self):
+		return len(self.normalized_text.split(' '))
+
+	# Description:  Get the total number of vocabulary or unique words
+	# Return:	    int
+	@cached_property
+	def vocabulary_size(self):
+		return len(set(self.tokens))
+
+	# Description:  Get the frequency of each word
+	# Return:	    dict { str: int }
+	@cached_property
+	def bag_of_words(self):
+		return dict(NgramCounter().update(self.words).get_counts())
+
+	# Description:  Get the frequency of each word sorted by word
+	# Return:	    list [ (str, int), ... ]
+	@cached_property
+	def sorted_bag_of_words(self):
+		return sort_dictionary_by_key(self.bag_of_words)
+
+	# Description:  Get the part of speech of each word with its tag value
+	# Return:	    list [ (str, str, str), ... ]
+	@cached_property
+	def pos_tags(self):
+		return get_pos_tag_values(nltk.pos_tag(self.words))
+
+	# Description:  Get the sentences of the text
+	# Return:	    list [ str, ... ]
+	@cached_property
+	def sentences(self):
+		return paragraph_to_sentences(self.normalized_text)
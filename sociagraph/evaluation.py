@@ -0,0 +1,126 @@
+import json
+import random
+
+from django.conf import settings
+
+from sociagraph.models import Evaluation_Report
+from sociagraph.jobs import register_trainer
+from sociagraph.model_store import save_model_metrics
+
+# Evaluates the classifiers by k-fold cross-validation in the training worker
+# instead of holding out test data at training time. The folds are drawn with
+# a fixed seed over the texts, so that the rows of a text with several labels
+# are never split between training and testing, and the averaged metrics are
+# stored per corpus version for the results pages. The evaluation of a model
+# is queued by the training job once the model is saved.
+
+evaluators = {}
+
+# Description:  Register the evaluation of a model
+# Parameter/s:  str | function () -> (version, list [ item, ... ], list [ text id, ... ] | None if one item per text) | function (list [ item, ... ]) -> classifier | function (classifier, list [ item, ... ]) -> dict
+# Return:	    None
+def register_evaluator(model_name, get_evaluation_data, train, score):
+	evaluators[model_name] = (get_evaluation_data, train, score)
+
+# Description:  Split item indices into seeded folds
+# Parameter/s:  int | int | int
+# Return:	    list [ list [ int, ... ], ... ]
+def get_fold_indices(count, folds, seed):
+	indices = list(range(count))
+	random.Random(seed).shuffle(indices)
+
+	return [ indices[fold::folds] for fold in range(folds) ]
+
+# Description:  Average the metrics of many reports, nested by label
+# Parameter/s:  list [ dict, ... ]
+# Return:	    dict
+def average_reports(reports):
+	average = {}
+
+	# A label may be missing from the folds without enough of its data
+	for key in set(key for report in reports for key in report):
+		values = [ report[key] for report in reports if key in report ]
+
+		if isinstance(values[0], dict):
+			average[key] = average_reports(values)
+		else:
+			average[key] = sum(values) / float(len(values))
+
+	return average
+
+# Description:  Train and score a classifier on each fold, with the items of a group in the same fold
+# Parameter/s:  list [ item, ... ] | function | function | int | int | function (int) -> None | list [ group, ... ] (group of each item, None for one item per group)
+# Return:	    dict | None if there are fewer groups than folds
+# Dependencies: get_fold_indices() | average_reports()
+def cross_validate(items, train, score, folds, seed, report_progress = lambda progress: None, groups = None):
+	if groups is None:
+		groups = list(range(len(items)))
+
+	group_keys = sorted(set(groups))
+
+	if len(group_keys) < folds:
+		return None
+
+	reports = []
+
+	for fold, test_indices in enumerate(get_fold_indices(len(group_keys), folds, seed)):
+		test_groups = set(group_keys[index] for index in test_indices)
+		train_set = [ item for item, group in zip(items, groups) if group not in test_groups ]
+		test_set = [ item for item, group in zip(items, groups) if group in test_groups ]
+
+		reports.append(score(train(train_set), test_set))
+		report_progress(100 * (fold + 1) / folds)
+
+	return average_reports(reports)
+
+# Description:  Cross-validate a model and store its report
+# Parameter/s:  str | int | int | function (int) -> None
+# Return:	    Evaluation_Report | None without enough data
+# Dependencies: cross_validate()
+def evaluate_model(model_name, folds, seed, report_progress = lambda progress: None):
+	get_evaluation_data, train, score = evaluators[model_name]
+	version, items, groups = get_evaluation_data()
+	report = cross_validate(items, train, score, folds, seed, report_progress, groups)
+
+	if report is None:
+		return None
+
+	# Keep the metrics with the saved model of the same corpus version
+	save_model_metrics(model_name, version, report)
+
+	return Evaluation_Report.objects.create(model_name=model_name, version=json.dumps(list(version)), folds=folds, seed=seed, corpora_count=len(items), report=json.dumps(report))
+
+# Description:  Get the last stored report of a model
+# Parameter/s:  str
+# Return:	    dict { version, folds, seed, corpora_count, report, created } | None if never evaluated
+def get_evaluation_report(model_name):
+	evaluation = Evaluation_Report.objects.filter(model_name=model_name).order_by('-id').first()
+
+	if evaluation is None:
+		return None
+
+	return {
+		'version': tuple(json.loads(evaluation.version)),
+		'folds': evaluation.folds,
+		'seed': evaluation.seed,
+		'corpora_count': evaluation.corpora_count,
+		'report': json.loads(evaluation.report),
+		'created': evaluation.created,
+	}
+
+# Description:  Get the name of the evaluation job of a model
+# Parameter/s:  str
+# Return:	    str
+def get_evaluation_job_name(model_name):
+	return 'evaluation:' + model_name
+
+# Description:  Evaluate a model for the training worker
+# Parameter/s:  str ('evaluation:<model name>') | function (int) -> None
+# Return:	    None, the report is stored instead of a model
+# Dependencies: evaluate_model()
+def run_evaluation(model_name, report_progress):
+	evaluate_model(model_name[len('evaluation:'):], getattr(settings, 'EVALUATION_FOLDS', 5), getattr(settings, 'EVALUATION_SEED', 0), report_progress)
+
+	return None
+
+register_trainer('evaluation:', run_evaluation)
\ No newline at end of file
@@ -0,0 +1,536 @@
+import zlib
+import copy
+from array import array
+
+from sociagraph.lazy import LazyModule
+from sociagraph.utils import get_text_tokens, is_synonymous
+from sociagraph.profiling import profiled
+
+numpy = LazyModule('numpy')
+csr_matrix = LazyModule('scipy.sparse', 'csr_matrix')
+LinearSVC = LazyModule('sklearn.svm', 'LinearSVC')
+SGDClassifier = LazyModule('sklearn.linear_model', 'SGDClassifier')
+Parallel = LazyModule('sklearn.externals.joblib', 'Parallel')
+delayed = LazyModule('sklearn.externals.joblib', 'delayed')
+
+# Turns texts straight into a sparse matrix for the classifiers. Each column is
+# either a word of the vocabulary (or a hashed word bucket) or the synonym flag
+# of a label, so no feature dictionary is built per document.
+#
+# A saved vectorizer keeps its words in sorted arrays instead of dictionaries:
+# the words, their columns and their synonym flags. The model store
+# memory-maps them, so the web processes read the same pages and the words of
+# a batch are found by one binary search.
+
+# Description:  Encode a word for the word arrays
+# Parameter/s:  str | unicode
+# Return:	    bytes
+def encode_word(word):
+	if isinstance(word, bytes):
+		return word
+
+	return word.encode('utf-8')
+
+# Description:  Decode a word of the word arrays
+# Parameter/s:  bytes
+# Return:	    str
+def decode_word(word):
+	if str is bytes:
+		return word
+
+	return word.decode('utf-8')
+
+
+class SparseFeatureVectorizer(object):
+
+	# Description:  Create a vectorizer
+	# Parameter/s:  list [ str, ... ] | int (hashed columns, None to use a vocabulary)
+	def __init__(self, synonym_labels, n_features = None):
+		self.synonym_labels = list(synonym_labels)
+		self.n_features = n_features
+		self.vocabulary = {}
+		self.synonym_flags = {}
+		self.words = None
+		self.word_columns = None
+		self.word_synonym_flags = None
+
+	# Description:  Get the number of word columns
+	# Parameter/s:  None
+	# Return:	    int
+	def get_word_column_count(self):
+		if self.n_features is not None:
+			return self.n_features
+
+		if self.word_columns is not None:
+			return len(self.word_columns)
+
+		return len(self.vocabulary)
+
+	# Description:  Get the total number of columns
+	# Parameter/s:  None
+	# Return:	    int
+	def get_column_count(self):
+		return self.get_word_column_count() + len(self.synonym_labels)
+
+	# Description:  Get the synonym flags of a word against the labels
+	# Parameter/s:  str
+	# Return:	    tuple (bool, ...)
+	# Dependencies: is_synonymous()
+	def get_synonym_flags(self, word):
+		flags = self.synonym_flags.get(word)
+
+		# Only the fitted words are kept, so that the words of the classified texts do not grow a shared model
+		if flags is None:
+			flags = tuple(is_synonymous(word, label) for label in self.synonym_labels)
+
+		return flags
+
+	# Description:  Get the word column of a word
+	# Parameter/s:  str
+	# Return:	    int | None if the word is not in the vocabulary
+	def get_word_column(self, word):
+		# The UTF-8 bytes are hashed, so that a word has one column for unicode and bytes input and on any Python version
+		if self.n_features is not None:
+			return (zlib.crc32(encode_word(word)) & 0xffffffff) % self.n_features
+
+		return self.vocabulary.get(word)
+
+	# Description:  Find words in the word arrays
+	# Parameter/s:  iterable [ word, ... ]
+	# Return:	    dict { word: int (row) }
+	def find_array_words(self, words):
+		if self.words is None or len(self.words) == 0:
+			return {}
+
+		# A word longer than the array items is not in the array
+		encoded_words = [ (word, encode_word(word)) for word in words ]
+		encoded_words = [ (word, encoded_word) for word, encoded_word in encoded_words if len(encoded_word) <= self.words.dtype.itemsize ]
+
+		if len(encoded_words) == 0:
+			return {}
+
+		rows = numpy.searchsorted(self.words, numpy.array([ encoded_word for word, encoded_word in encoded_words ], dtype=self.words.dtype))
+		found_words = {}
+
+		for (word, encoded_word), row in zip(encoded_words, rows):
+			if row < len(self.words) and self.words[row] == encoded_word:
+				found_words[word] = int(row)
+
+		return found_words
+
+	# Description:  Get the word column and synonym flags of words
+	# Parameter/s:  iterable [ word, ... ]
+	# Return:	    dict { word: (int | None, [ bool, ... ]) }
+	def get_word_features(self, words):
+		array_rows = self.find_array_words(words)
+		word_features = {}
+
+		for word in words:
+			row = array_rows.get(word)
+
+			if row is None:
+				word_features[word] = (self.get_word_column(word), self.get_synonym_flags(word))
+			elif self.n_features is not None:
+				word_features[word] = (self.get_word_column(word), self.word_synonym_flags[row])
+			else:
+				word_features[word] = (int(self.word_columns[row]), self.word_synonym_flags[row])
+
+		return word_features
+
+	# Description:  Build the vocabulary and precompute its synonym flags
+	# Parameter/s:  set([ word, ... ])
+	# Return:	    SparseFeatureVectorizer
+	def fit(self, feature_set_words):
+		if self.n_features is None:
+			self.vocabulary = dict((word, column) for column, word in enumerate(sorted(feature_set_words)))
+
+		for word in feature_set_words:
+			self.synonym_flags[word] = self.get_synonym_flags(word)
+
+		return self
+
+	# Description:  Get the vocabulary and synonym flags of the word arrays and dictionaries together
+	# Parameter/s:  None
+	# Return:	    tuple (dict { word: column }, dict { word: (bool, ...) })
+	def get_word_dictionaries(self):
+		vocabulary = {}
+		synonym_flags = {}
+
+		if self.words is not None:
+			for row, word in enumerate(self.words):
+				word = decode_word(word)
+				synonym_flags[word] = tuple(bool(flag) for flag in self.word_synonym_flags[row])
+
+				if self.word_columns is not None:
+					vocabulary[word] = int(self.word_columns[row])
+
+		vocabulary.update(self.vocabulary)
+		synonym_flags.update(self.synonym_flags)
+
+		return (vocabulary, synonym_flags)
+
+	# Description:  Get the word arrays of the vocabulary and synonym flags
+	# Parameter/s:  None
+	# Return:	    dict { words, synonym_flags, word_columns (with a vocabulary) }
+	def get_word_arrays(self):
+		vocabulary, synonym_flags = self.get_word_dictionaries()
+
+		# With a vocabulary only its words are kept, flags of other words are recomputed on use
+		words = sorted(vocabulary if self.n_features is None else synonym_flags, key=encode_word)
+		arrays = {
+			'words': numpy.array([ encode_word(word) for word in words ], dtype=bytes),
+			'synonym_flags': numpy.array([ synonym_flags[word] for word in words ], dtype=bool).reshape((len(words), len(self.synonym_labels))),
+		}
+
+		if self.n_features is None:
+			arrays['word_columns'] = numpy.array([ vocabulary[word] for word in words ], dtype=numpy.int32)
+
+		return arrays
+
+	# Description:  Set the vocabulary and synonym flags from word arrays
+	# Parameter/s:  dict { words, synonym_flags, word_columns (with a vocabulary) }
+	# Return:	    None
+	def set_word_arrays(self, arrays):
+		self.words = arrays['words']
+		self.word_synonym_flags = arrays['synonym_flags']
+		self.word_columns = arrays.get('word_columns')
+		self.vocabulary = {}
+		self.synonym_flags = {}
+
+	# Description:  Copy the vectorizer without its words, which are stored apart
+	# Parameter/s:  None
+	# Return:	    SparseFeatureVectorizer
+	def copy_without_words(self):
+		vectorizer = copy.copy(self)
+		vectorizer.vocabulary = {}
+		vectorizer.synonym_flags = {}
+		vectorizer.words = None
+		vectorizer.word_columns = None
+		vectorizer.word_synonym_flags = None
+
+		return vectorizer
+
+	# Description:  Transform texts to a sparse matrix
+	# Parameter/s:  list [ str, ... ]
+	# Return:	    csr_matrix
+	# Dependencies: get_text_tokens()
+	def transform(self, texts):
+		return self.transform_tokens([ get_text_tokens(text) for text in texts ])
+
+	# Description:  Transform the tokens of texts to a sparse matrix
+	# Parameter/s:  list [ [ token, ... ], ... ]
+	# Return:	    csr_matrix
+	@profiled('feature_building')
+	def transform_tokens(self, token_lists):
+		word_column_count = self.get_word_column_count()
+		indices = array('i')
+		indptr = array('i', [0])
+
+		# Look up each word of the batch once
+		word_features = self.get_word_features(set(word for tokens in token_lists for word in tokens))
+
+		for tokens in token_lists:
+			columns = set()
+
+			for word in tokens:
+				column, flags = word_features[word]
+
+				if column is not None:
+					columns.add(column)
+
+				for label_index, flag in enumerate(flags):
+					if flag:
+						columns.add(word_column_count + label_index)
+
+			indices.extend(sorted(columns))
+			indptr.append(len(indices))
+
+		indices = numpy.frombuffer(indices, dtype=numpy.int32)
+		indptr = numpy.frombuffer(indptr, dtype=numpy.int32)
+		data = numpy.ones(len(indices), dtype=numpy.float64)
+
+		return csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, self.get_column_count()))
+
+
+class SparseClassifier(object):
+
+	# Description:  Create a classifier over a fitted vectorizer
+	# Parameter/s:  SparseFeatureVectorizer | estimator
+	def __init__(self, vectorizer, estimator):
+		self.vectorizer = vectorizer
+		self.estimator = estimator
+
+	# Description:  Train the classifier
+	# Parameter/s:  list [ (text, label), ... ]
+	# Return:	    SparseClassifier
+	@profiled('svm_fitting')
+	def train(self, labeled_text):
+		features = self.vectorizer.transform([ item[0] for item in labeled_text ])
+		self.estimator.fit(features, [ item[1] for item in labeled_text ])
+
+		return self
+
+	# Description:  Train the classifier on the tokens of texts
+	# Parameter/s:  list [ ([ token, ... ], label), ... ]
+	# Return:	    SparseClassifier
+	@profiled('svm_fitting')
+	def train_tokens(self, labeled_tokens):
+		features = self.vectorizer.transform_tokens([ item[0] for item in labeled_tokens ])
+		self.estimator.fit(features, [ item[1] for item in labeled_tokens ])
+
+		return self
+
+	# Description:  Update the classifier with the tokens of new texts
+	# Parameter/s:  list [ ([ token, ... ], label), ... ]
+	# Return:	    SparseClassifier
+	@profiled('svm_fitting')
+	def partial_train_tokens(self, labeled_tokens):
+		features = self.vectorizer.transform_tokens([ item[0] for item in labeled_tokens ])
+		self.estimator.partial_fit(features, [ item[1] for item in labeled_tokens ])
+
+		return self
+
+	# Description:  Get the labels of the classifier
+	# Parameter/s:  None
+	# Return:	    list [ label, ... ]
+	def get_labels(self):
+		return self.estimator.classes_.tolist()
+
+	# Description:  Get the weight arrays of the estimator
+	# Parameter/s:  None
+	# Return:	    dict { name: numpy.ndarray }
+	def get_weight_arrays(self):
+		return { 'coefficients': self.estimator.coef_, 'intercepts': self.estimator.intercept_ }
+
+	# Description:  Set the weight arrays of the estimator
+	# Parameter/s:  dict { name: numpy.ndarray }
+	# Return:	    None
+	def set_weight_arrays(self, arrays):
+		self.estimator.coef_ = arrays['coefficients']
+		self.estimator.intercept_ = arrays['intercepts']
+
+	# Description:  Copy the classifier without its weights and vocabulary, which are stored apart
+	# Parameter/s:  None
+	# Return:	    SparseClassifier
+	def copy_without_weights(self):
+		classifier = SparseClassifier(self.vectorizer.copy_without_words(), copy.copy(self.estimator))
+		classifier.set_weight_arrays({ 'coefficients': None, 'intercepts': None })
+
+		return classifier
+
+	# Description:  Classify the tokens of many texts
+	# Parameter/s:  list [ [ token, ... ], ... ]
+	# Return:	    list [ label, ... ]
+	@profiled('classification')
+	def classify_many_tokens(self, token_lists):
+		if len(token_lists) == 0:
+			return []
+
+		return list(self.estimator.predict(self.vectorizer.transform_tokens(token_lists)))
+
+	# Description:  Classify many texts
+	# Parameter/s:  list [ str, ... ]
+	# Return:	    list [ label, ... ]
+	@profiled('classification')
+	def classify_many(self, texts):
+		if len(texts) == 0:
+			return []
+
+		return list(self.estimator.predict(self.vectorizer.transform(texts)))
+
+	# Description:  Classify a text
+	# Parameter/s:  str
+	# Return:	    label
+	def classify(self, text):
+		return self.classify_many([text])[0]
+
+
+class SparseMultiLabelClassifier(object):
+
+	# Description:  Create a one-vs-rest classifier of many labels over a fitted vectorizer
+	# Parameter/s:  SparseFeatureVectorizer | list [ label, ... ] | function () -> estimator | bool (keep the estimators for updates) | int (labels trained at a time)
+	def __init__(self, vectorizer, labels, create_estimator, incremental = False, n_jobs = 1):
+		self.vectorizer = vectorizer
+		self.labels = list(labels)
+		self.label_columns = dict((label, column) for column, label in enumerate(self.labels))
+		self.create_estimator = create_estimator
+		self.incremental = incremental
+		self.n_jobs = n_jobs
+		self.estimators = [ None for label in self.labels ]
+		self.coefficients = numpy.zeros((vectorizer.get_column_count(), len(self.labels)))
+		self.intercepts = numpy.zeros(len(self.labels))
+
+	# Description:  Get the rows of the labels with a label
+	# Parameter/s:  list [ set([ label, ... ]), ... ] | label
+	# Return:	    numpy.ndarray [ bool, ... ]
+	def get_label_values(self, label_sets, label):
+		return numpy.array([ label in label_set for label_set in label_sets ])
+
+	# Description:  Get the estimator of a label column, restoring its weights from the weight arrays of a loaded classifier
+	# Parameter/s:  int
+	# Return:	    estimator | None if the column has no estimator
+	def get_column_estimator(self, column):
+		estimator = self.estimators[column]
+
+		if estimator is not None and estimator.coef_ is None:
+			estimator.coef_ = numpy.array(self.coefficients[:, column]).reshape((1, -1))
+			estimator.intercept_ = numpy.array(self.intercepts[column:column + 1])
+
+		return estimator
+
+	# Description:  Copy the weights of the estimator of a label column
+	# Parameter/s:  int | estimator
+	# Return:	    None
+	def set_column_weights(self, column, estimator):
+		self.coefficients[:, column] = estimator.coef_.ravel()
+		self.intercepts[column] = estimator.intercept_[0]
+
+	# Description:  Train a binary estimator per label on the tokens of texts
+	# Parameter/s:  list [ ([ token, ... ], set([ label, ... ])), ... ]
+	# Return:	    SparseMultiLabelClassifier
+	@profiled('svm_fitting')
+	def train_tokens(self, labeled_tokens):
+		features = self.vectorizer.transform_tokens([ item[0] for item in labeled_tokens ])
+		label_sets = [ item[1] for item in labeled_tokens ]
+		fitted_columns = []
+
+		for column, label in enumerate(self.labels):
+			values = self.get_label_values(label_sets, label)
+			self.estimators[column] = None
+
+			# A label on all or none of the texts is constant
+			if values.all() or not values.any():
+				self.coefficients[:, column] = 0
+				self.intercepts[column] = 1 if values.all() else -1
+				continue
+
+			fitted_columns.append((column, self.create_estimator(), values))
+
+		# The labels are fitted independently, in threads sharing the features since the solvers release the interpreter lock
+		estimators = Parallel(n_jobs=self.n_jobs, backend='threading')(delayed(estimator.fit)(features, values) for column, estimator, values in fitted_columns)
+
+		for (column, _, values), estimator in zip(fitted_columns, estimators):
+			self.set_column_weights(column, estimator)
+
+			if self.incremental:
+				self.estimators[column] = estimator
+
+		return self
+
+	# Description:  Update the estimators with the tokens of new texts
+	# Parameter/s:  list [ ([ token, ... ], set([ label, ... ])), ... ]
+	# Return:	    SparseMultiLabelClassifier
+	@profiled('svm_fitting')
+	def partial_train_tokens(self, labeled_tokens):
+		features = self.vectorizer.transform_tokens([ item[0] for item in labeled_tokens ])
+		label_sets = [ item[1] for item in labeled_tokens ]
+
+		for column, label in enumerate(self.labels):
+			estimator = self.get_column_estimator(column)
+
+			if estimator is None:
+				estimator = self.create_estimator()
+				estimator.partial_fit(features, self.get_label_values(label_sets, label), classes=numpy.array([False, True]))
+				self.estimators[column] = estimator
+			else:
+				estimator.partial_fit(features, self.get_label_values(label_sets, label))
+
+			self.set_column_weights(column, estimator)
+
+		return self
+
+	# Description:  Get the labels of the classifier
+	# Parameter/s:  None
+	# Return:	    list [ label, ... ]
+	def get_labels(self):
+		return list(self.labels)
+
+	# Description:  Get the weight arrays of the labels
+	# Parameter/s:  None
+	# Return:	    dict { name: numpy.ndarray }
+	def get_weight_arrays(self):
+		return { 'coefficients': self.coefficients, 'intercepts': self.intercepts }
+
+	# Description:  Set the weight arrays of the labels
+	# Parameter/s:  dict { name: numpy.ndarray }
+	# Return:	    None
+	def set_weight_arrays(self, arrays):
+		self.coefficients = arrays['coefficients']
+		self.intercepts = arrays['intercepts']
+
+	# Description:  Copy the classifier without its weights and vocabulary, which are stored apart
+	# Parameter/s:  None
+	# Return:	    SparseMultiLabelClassifier
+	def copy_without_weights(self):
+		classifier = copy.copy(self)
+		classifier.vectorizer = self.vectorizer.copy_without_words()
+		classifier.set_weight_arrays({ 'coefficients': None, 'intercepts': None })
+		classifier.estimators = []
+
+		# The weights of the online estimators are the columns of the weight arrays, restored when they are updated
+		for estimator in self.estimators:
+			if estimator is not None:
+				estimator = copy.copy(estimator)
+				estimator.coef_ = None
+				estimator.intercept_ = None
+
+			classifier.estimators.append(estimator)
+
+		return classifier
+
+	# Description:  Get the labels of the classifier among labels
+	# Parameter/s:  list [ label, ... ] | None for all labels
+	# Return:	    list [ label, ... ]
+	def get_known_labels(self, labels = None):
+		if labels is None:
+			return list(self.labels)
+
+		return [ label for label in labels if label in self.label_columns ]
+
+	# Description:  Check the labels of the tokens of many texts in one product of their features and weights
+	# Parameter/s:  list [ [ token, ... ], ... ] | list [ label, ... ] | None for all labels
+	# Return:	    dict { label: [ bool, ... ] }
+	@profiled('classification')
+	def predict_tokens(self, token_lists, labels = None):
+		labels = self.get_known_labels(labels)
+
+		if len(token_lists) == 0 or len(labels) == 0:
+			return dict((label, []) for label in labels)
+
+		columns = [ self.label_columns[label] for label in labels ]
+		scores = self.vectorizer.transform_tokens(token_lists).dot(self.coefficients[:, columns]) + self.intercepts[columns]
+
+		return dict((label, list(scores[:, index] > 0)) for index, label in enumerate(labels))
+
+	# Description:  Classify many texts against labels
+	# Parameter/s:  list [ str, ... ] | list [ label, ... ] | None for all labels
+	# Return:	    dict { label: [ label | 'not_' + label, ... ] }
+	# Dependencies: get_text_tokens()
+	def classify_many(self, texts, labels = None):
+		predictions = self.predict_tokens([ get_text_tokens(text) for text in texts ], labels)
+
+		return dict((label, [ label if value else 'not_' + label for value in values ]) for label, values in predictions.items())
+
+# Description:  Create a linear SVM estimator weighting the classes by their frequency
+# Parameter/s:  None
+# Return:	    LinearSVC
+def create_balanced_svm_estimator():
+	return LinearSVC(class_weight='balanced')
+
+# Description:  Create a linear SVM estimator trained by stochastic gradient descent
+# Parameter/s:  None
+# Return:	    SGDClassifier
+def create_sgd_estimator():
+	return SGDClassifier(loss='hinge')
+
+# Description:  Create a sparse SVM classifier
+# Parameter/s:  SparseFeatureVectorizer
+# Return:	    SparseClassifier(LinearSVC())
+def create_sparse_svm_classifier(vectorizer):
+	return SparseClassifier(vectorizer, LinearSVC())
+
+# Description:  Create a sparse linear SVM classifier trained by stochastic gradient descent
+# Parameter/s:  SparseFeatureVectorizer
+# Return:	    SparseClassifier(SGDClassifier())
+def create_sparse_sgd_classifier(vectorizer):
+	return SparseClassifier(vectorizer, SGDClassifier(loss='hinge'))
\ No newline at end of file
@@ -1,4 +1,4 @@
 from django import forms
 
 class UploadFileForm(forms.Form):
-    file = forms.FileField()
\ No newline at end of file
+    corpus_file = forms.FileField()
\ No newline at end of file
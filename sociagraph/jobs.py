@@ -0,0 +1,196 @@
+import os
+import json
+import uuid
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from sociagraph.models import Training_Job
+from sociagraph.model_store import save_model
+
+# Training runs in the run_training_worker command instead of a web request.
+# Applications register a trainer for the names of their models in their
+# training module, and web requests only queue jobs. The worker running a job
+# updates it every TRAINING_JOB_HEARTBEAT seconds; a job not updated for
+# TRAINING_JOB_TIMEOUT seconds is taken to be left by a stopped worker and is
+# queued again. Each claim of a job is named, and a worker only saves the
+# model and the status of a job while its claim on it is still the current one.
+
+trainers = []
+
+# Description:  Register the trainer of the models whose names start with a prefix
+# Parameter/s:  str | function (model_name, report_progress) -> (version, model, [ job model name to queue after saving, ... ]) | None if nothing to save
+# Return:	    None
+def register_trainer(prefix, train):
+	trainers.append((prefix, train))
+
+# Description:  Get the trainer of a model
+# Parameter/s:  str
+# Return:	    function | None
+def get_trainer(model_name):
+	# Imports the training module of each application
+	autodiscover_modules('training')
+
+	for prefix, train in trainers:
+		if model_name.startswith(prefix):
+			return train
+
+	return None
+
+# Description:  Get the stored form of a corpus version
+# Parameter/s:  tuple | None
+# Return:	    str
+def get_job_version(version):
+	if version is None:
+		return ''
+
+	return json.dumps(list(version))
+
+# Description:  Queue the training of a model unless it is already queued, running or failed on the same corpus version
+# Parameter/s:  str | tuple (corpus version to train, None to queue whatever the last jobs did)
+# Return:	    Training_Job
+# Dependencies: get_job_version()
+def enqueue_training_job(model_name, version = None):
+	job_version = get_job_version(version)
+	job = Training_Job.objects.filter(model_name=model_name).order_by('-id').first()
+
+	if job is not None:
+		if job.status == 'queued':
+			return job
+
+		# A failed training is retried when its corpus changes, not on every request
+		if version is not None and job.status in ('running', 'failed') and job.version == job_version:
+			return job
+
+	job = Training_Job.objects.create(model_name=model_name, version=job_version)
+
+	# Keep the oldest of the jobs queued at the same time by other processes
+	first_job = Training_Job.objects.filter(model_name=model_name, status='queued').order_by('id').first()
+
+	if first_job is not None and first_job.id != job.id:
+		job.delete()
+		job = first_job
+
+	return job
+
+# Description:  Queue the jobs left running by a stopped worker again
+# Parameter/s:  None
+# Return:	    int (number of jobs queued again)
+def reclaim_training_jobs():
+	stale_time = timezone.now() - timedelta(seconds=getattr(settings, 'TRAINING_JOB_TIMEOUT', 3600))
+
+	return Training_Job.objects.filter(status='running', updated__lt=stale_time).update(status='queued', progress=0, claimed_by='', updated=timezone.now())
+
+# Description:  Take the oldest queued job for this worker
+# Parameter/s:  None
+# Return:	    Training_Job | None if the queue is empty
+# Dependencies: reclaim_training_jobs()
+def claim_training_job():
+	reclaim_training_jobs()
+
+	claim = '%d-%s' % (os.getpid(), uuid.uuid4().hex)
+
+	for job_id in Training_Job.objects.filter(status='queued').order_by('id').values_list('id', flat=True)[:10]:
+		# Another worker may have taken the job in the meantime
+		if Training_Job.objects.filter(id=job_id, status='queued').update(status='running', progress=0, claimed_by=claim, updated=timezone.now()) == 1:
+			return Training_Job.objects.get(id=job_id)
+
+	return None
+
+# Description:  Get the running jobs still held by the claim of a job
+# Parameter/s:  Training_Job
+# Return:	    QuerySet
+def get_claimed_training_job(job):
+	return Training_Job.objects.filter(id=job.id, status='running', claimed_by=job.claimed_by)
+
+# Description:  Save the progress of a job
+# Parameter/s:  Training_Job | int
+# Return:	    None
+# Dependencies: get_claimed_training_job()
+def set_training_job_progress(job, progress):
+	job.progress = progress
+
+	# The update time tells the other workers that the job is still running
+	get_claimed_training_job(job).update(progress=progress, updated=timezone.now())
+
+# Description:  Update a job every TRAINING_JOB_HEARTBEAT seconds until stopped
+# Parameter/s:  Training_Job | threading.Event
+# Return:	    None
+# Dependencies: get_claimed_training_job()
+def send_training_job_heartbeats(job, stopped):
+	interval = getattr(settings, 'TRAINING_JOB_HEARTBEAT', 60)
+
+	try:
+		while not stopped.wait(interval):
+			get_claimed_training_job(job).update(updated=timezone.now())
+	finally:
+		# The thread opened its own database connection
+		connection.close()
+
+# Description:  Train and save the model of a job
+# Parameter/s:  Training_Job
+# Return:	    Training_Job
+# Dependencies: get_claimed_training_job(), send_training_job_heartbeats()
+def run_training_job(job):
+	train = get_trainer(job.model_name)
+
+	# Fits report no progress while they run, so the job is kept alive by a thread
+	heartbeat_stopped = threading.Event()
+	heartbeat = threading.Thread(target=send_training_job_heartbeats, args=(job, heartbeat_stopped))
+	heartbeat.daemon = True
+	heartbeat.start()
+
+	try:
+		if train is None:
+			raise ValueError('No trainer for model %s.' % job.model_name)
+
+		result = train(job.model_name, lambda progress: set_training_job_progress(job, progress))
+
+		# Jobs such as evaluations store their own results
+		if result is not None and get_claimed_training_job(job).exists():
+			version, model, next_model_names = result
+			save_model(job.model_name, version, model)
+
+			# Jobs that read the saved model, such as its evaluation, are queued once it is saved
+			for next_model_name in next_model_names:
+				enqueue_training_job(next_model_name)
+
+		job.status = 'completed'
+		job.progress = 100
+	except Exception as error:
+		job.status = 'failed'
+		job.message = str(error)
+	finally:
+		heartbeat_stopped.set()
+		heartbeat.join()
+
+	# A job queued again and claimed by another worker is left to that worker
+	if get_claimed_training_job(job).update(status=job.status, progress=job.progress, message=job.message, updated=timezone.now()) == 0:
+		job.status = 'reclaimed'
+		job.message = 'The job was queued again before it finished.'
+
+	return job
+
+# Description:  Train and save the model of a job in a pool process
+# Parameter/s:  int
+# Return:	    Training_Job
+def run_training_job_by_id(job_id):
+	return run_training_job(Training_Job.objects.get(id=job_id))
+
+# Description:  Get the status of a job
+# Parameter/s:  Training_Job
+# Return:	    dict
+def get_training_job_status(job):
+	return {
+		'id': job.id,
+		'model_name': job.model_name,
+		'status': job.status,
+		'progress': job.progress,
+		'message': job.message,
+		'created': job.created.isoformat(),
+		'updated': job.updated.isoformat(),
+	}
@@ -0,0 +1,58 @@
+from django.db import IntegrityError, transaction
+
+from sociagraph.models import Label
+
+# Corpus labels are entered as comma-separated strings and stored as Label rows
+# linked to the corpora, so that label lookups use the indexed link tables.
+
+# Description:  Get the label names of a comma-separated label string
+# Parameter/s:  str
+# Return:	    list [ str, ... ]
+def get_label_names(label_string):
+	names = []
+
+	for name in label_string.replace(' ', '').lower().split(','):
+		if name != '' and name not in names:
+			names.append(name)
+
+	return names
+
+# Description:  Get the ids of labels, creating the missing labels
+# Parameter/s:  iterable [ str, ... ]
+# Return:	    dict { name: id }
+def get_label_ids(names):
+	names = set(names)
+	label_ids = dict(Label.objects.filter(name__in=names).values_list('name', 'id'))
+
+	for name in names:
+		if name not in label_ids:
+			try:
+				with transaction.atomic():
+					label_ids[name] = Label.objects.create(name=name).id
+			except IntegrityError:
+				# Created by another request in the meantime
+				label_ids[name] = Label.objects.get(name=name).id
+
+	return label_ids
+
+# Description:  Get the link table of corpora and labels with its column names
+# Parameter/s:  Model | str ('themes' | 'emotions')
+# Return:	    tuple (Model, str, str) link table, corpus id column and label id column
+def get_label_relation(model, labels_field):
+	relation = getattr(model, labels_field).field
+
+	return (relation.rel.through, relation.m2m_field_name() + '_id', relation.m2m_reverse_field_name() + '_id')
+
+# Description:  Replace the labels of corpora with the labels of their label strings
+# Parameter/s:  Model | str ('themes' | 'emotions') | iterable [ (id, label string), ... ]
+# Return:	    None
+# Dependencies: get_label_relation()
+def set_corpus_labels(model, labels_field, corpora):
+	through, corpus_field, label_field = get_label_relation(model, labels_field)
+
+	corpus_names = [ (corpus_id, get_label_names(label_string)) for corpus_id, label_string in corpora ]
+	label_ids = get_label_ids(name for corpus_id, names in corpus_names for name in names)
+
+	with transaction.atomic():
+		through.objects.filter(**{ corpus_field + '__in': [ corpus_id for corpus_id, names in corpus_names ] }).delete()
+		through.objects.bulk_create([ through(**{ corpus_field: corpus_id, label_field: label_ids[name] }) for corpus_id, names in corpus_names for name in names ])
@@ -0,0 +1,46 @@
+import importlib
+
+# Defers the import of the heavy libraries (NLTK, scikit-learn, SciPy and
+# NumPy) to their first use. A process only loads the libraries of the code it
+# runs, so the corpus pages and management commands such as migrate start
+# without them. The attributes of a lazy module are prefixed with lazy_ so
+# that they do not hide the attributes of the module, such as numpy.load.
+
+
+class LazyModule(object):
+
+	# Description:  Create a module, or an attribute of a module, imported on first use
+	# Parameter/s:  str | str (attribute of the module, None for the module itself)
+	def __init__(self, module_name, attribute_name = None):
+		self.lazy_module_name = module_name
+		self.lazy_attribute_name = attribute_name
+		self.lazy_target = None
+
+	# Description:  Import the module on first use
+	# Parameter/s:  None
+	# Return:	    module | object
+	def lazy_load(self):
+		if self.lazy_target is None:
+			target = importlib.import_module(self.lazy_module_name)
+
+			if self.lazy_attribute_name is not None:
+				target = getattr(target, self.lazy_attribute_name)
+
+			self.lazy_target = target
+
+		return self.lazy_target
+
+	# Description:  Get an attribute of the imported module
+	# Parameter/s:  str
+	# Return:	    object
+	def __getattr__(self, name):
+		if name in ('lazy_module_name', 'lazy_attribute_name', 'lazy_target'):
+			raise AttributeError(name)
+
+		return getattr(self.lazy_load(), name)
+
+	# Description:  Call the imported function or class
+	# Parameter/s:  arguments
+	# Return:	    object
+	def __call__(self, *args, **kwargs):
+		return self.lazy_load()(*args, **kwargs)
\ No newline at end of file
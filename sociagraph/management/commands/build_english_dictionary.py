@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from sociagraph.models import English_Dictionary, Classified_Corpus, Sentiment_Corpus, Label
+from sociagraph.dictionary import mark_dictionary_built, reload_dictionary_snapshot
+from sociagraph.wordnet_cache import lookup_synsets
+from sociagraph.utils import tokenize, lemmatize, unicode_to_string
+
+# Builds the English_Dictionary index of word to WordNet synset ids for every
+# word of the theme-classified and sentiment corpora and their labels.
+
+
+class Command(BaseCommand):
+	help = 'Builds the word to synonym group index from WordNet for the corpora vocabulary.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows per insert.')
+
+	# Description:  Get the words of the corpora and their labels
+	# Parameter/s:  None
+	# Return:	    set([ str, ... ])
+	def get_vocabulary(self):
+		vocabulary = set()
+
+		for model in (Classified_Corpus, Sentiment_Corpus):
+			for text in model.objects.values_list('text', flat=True).iterator():
+				for word in tokenize(text.lower()):
+					vocabulary.add(word)
+					vocabulary.add(lemmatize(word))
+
+		for label in Label.objects.values_list('name', flat=True).iterator():
+			vocabulary.add(unicode_to_string(label))
+			vocabulary.add(lemmatize(unicode_to_string(label)))
+
+		max_length = English_Dictionary._meta.get_field('word').max_length
+
+		return set(word for word in vocabulary if 0 < len(word) <= max_length)
+
+	def handle(self, *args, **options):
+		batch_size = options['batch_size']
+		vocabulary = self.get_vocabulary()
+		entries = []
+
+		with transaction.atomic():
+			English_Dictionary.objects.all().delete()
+
+			for word in sorted(vocabulary):
+				synset_ids = lookup_synsets(word)[1]
+
+				# Words without synsets are kept so that they skip WordNet too
+				for synset_id in (synset_ids or ['']):
+					entries.append(English_Dictionary(word=word, associated_word=synset_id))
+
+				if len(entries) >= batch_size:
+					English_Dictionary.objects.bulk_create(entries)
+					entries = []
+
+			English_Dictionary.objects.bulk_create(entries)
+
+		# The other processes reload their snapshots when they see the new stamp
+		mark_dictionary_built()
+		reload_dictionary_snapshot()
+
+		self.stdout.write('Indexed %d words.' % len(vocabulary))
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from sociagraph.evaluation import evaluators, evaluate_model
+
+# Cross-validates the classifiers and stores their reports, like the evaluation
+# jobs queued after each training.
+
+
+class Command(BaseCommand):
+	help = 'Evaluates the classifiers by k-fold cross-validation and stores their reports.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('model_names', nargs='*', help='Models to evaluate, all by default.')
+		parser.add_argument('--folds', type=int, default=getattr(settings, 'EVALUATION_FOLDS', 5), help='Number of folds.')
+		parser.add_argument('--seed', type=int, default=getattr(settings, 'EVALUATION_SEED', 0), help='Seed of the folds.')
+
+	def handle(self, *args, **options):
+		# Imports the evaluators of each application
+		autodiscover_modules('training')
+
+		model_names = options['model_names'] or sorted(evaluators.keys())
+
+		for model_name in model_names:
+			if model_name not in evaluators:
+				raise CommandError('No evaluator for model %s.' % model_name)
+
+		if options['folds'] < 2:
+			raise CommandError('At least 2 folds are needed.')
+
+		for model_name in model_names:
+			evaluation = evaluate_model(model_name, options['folds'], options['seed'])
+
+			if evaluation is None:
+				self.stdout.write('%s: not enough data.' % model_name)
+			else:
+				self.stdout.write('%s: %s' % (model_name, evaluation.report))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sociagraph.models import Classified_Corpus, Sentiment_Corpus
+from sociagraph.corpus_import import CorpusImportError, get_corpus_file_format, import_corpus_file
+from sociagraph.jobs import enqueue_training_job
+
+# Imports a CSV or JSON lines file of labeled text into a corpus and queues the
+# training of the model of the corpus.
+
+corpora = {
+	'sentiment': (Sentiment_Corpus, 'emotion', 'emotions', 'sentiment'),
+	'theme': (Classified_Corpus, 'theme', 'themes', 'themes'),
+}
+
+
+class Command(BaseCommand):
+	help = 'Imports a CSV (text,label) or JSON lines ({"text": ..., "label": ...}) file into a corpus.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('path', help='File to import.')
+		parser.add_argument('--corpus', choices=sorted(corpora.keys()), required=True, help='Corpus to import into.')
+		parser.add_argument('--format', choices=['csv', 'jsonl'], default=None, help='Format of the file, guessed from its extension by default.')
+		parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows per insert.')
+
+	def handle(self, *args, **options):
+		model, label_field, labels_field, model_name = corpora[options['corpus']]
+		file_format = options['format'] or get_corpus_file_format(options['path'])
+
+		if file_format is None:
+			raise CommandError('Unknown format of %s, use --format.' % options['path'])
+
+		try:
+			with open(options['path'], 'rb') as corpus_file:
+				count, labels, skipped = import_corpus_file(corpus_file, file_format, model, label_field, labels_field, options['batch_size'])
+		except CorpusImportError as error:
+			raise CommandError('%s The %d rows before it were imported, %d rows without a text or label were skipped.' % (error, error.count, error.skipped))
+		finally:
+			# Train with the rows imported before an error too
+			enqueue_training_job(model_name)
+
+		self.stdout.write('Imported %d rows, skipped %d rows without a text or label.' % (count, skipped))
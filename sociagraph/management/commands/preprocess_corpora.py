@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from sociagraph.models import Classified_Corpus, Sentiment_Corpus
+from sociagraph.utils import get_text_tokens, join_tokens
+
+# Stores the tokens of the corpus rows inserted before the tokens column, or of
+# every row with --all after the preprocessing changes.
+
+
+class Command(BaseCommand):
+	help = 'Computes the stored tokens of the theme-classified and sentiment corpora.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows per transaction.')
+		parser.add_argument('--all', action='store_true', default=False, help='Recompute the tokens of every row.')
+
+	# Description:  Store the tokens of the rows of a corpus, one transaction per batch
+	# Parameter/s:  Model | int | bool
+	# Return:	    int
+	def preprocess_corpus(self, model, batch_size, recompute):
+		queryset = model.objects.all() if recompute else model.objects.filter(tokens__isnull=True)
+		last_id = 0
+		count = 0
+
+		while True:
+			batch = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', 'text')[:batch_size])
+
+			if len(batch) == 0:
+				return count
+
+			with transaction.atomic():
+				for corpus_id, text in batch:
+					model.objects.filter(id=corpus_id).update(tokens=join_tokens(get_text_tokens(text)))
+
+			last_id = batch[-1][0]
+			count += len(batch)
+
+	def handle(self, *args, **options):
+		for model in (Classified_Corpus, Sentiment_Corpus):
+			count = self.preprocess_corpus(model, options['batch_size'], options['all'])
+
+			self.stdout.write('Preprocessed %d rows of %s.' % (count, model.__name__))
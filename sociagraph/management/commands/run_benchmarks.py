@@ -0,0 +1,45 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from sociagraph.benchmark import run_benchmarks, save_results
+
+# Runs the benchmarks against a SQLite database; the corpora of the database
+# are replaced by synthetic corpora.
+
+
+class Command(BaseCommand):
+	help = 'Measures the time and peak memory of the text analysis stages over synthetic corpora.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='Numbers of corpus rows.')
+		parser.add_argument('--document-words', type=int, nargs='+', default=[100, 1000], help='Numbers of words of the analyzed documents.')
+		parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic corpora.')
+		parser.add_argument('--output', default='benchmark_results.json', help='JSON file of the results.')
+
+	def handle(self, *args, **options):
+		if connection.vendor != 'sqlite':
+			raise CommandError('The benchmarks replace the corpora; run them with --settings=sociagraph.benchmark_settings.')
+
+		call_command('migrate', verbosity=0, interactive=False)
+
+		def report(result):
+			if result['stage'] == 'import':
+				self.stdout.write('import %(module)-45s %(seconds)10.4f s %(peak_memory_kb)10s KB' % result)
+
+				if result['loaded_libraries']:
+					self.stderr.write('Importing %s loaded %s, which should be imported on first use.' % (result['module'], ', '.join(result['loaded_libraries'])))
+
+				return
+
+			self.stdout.write('%(rows)8d rows %(document_words)6s words %(stage)-28s %(seconds)10.4f s %(peak_memory_kb)10s KB' % result)
+
+		results = run_benchmarks(options['rows'], options['document_words'], options['seed'], report)
+
+		save_results(options['output'], results, {
+			'rows': options['rows'],
+			'document_words': options['document_words'],
+			'seed': options['seed'],
+		})
+
+		self.stdout.write('Saved the results to %s.' % options['output'])
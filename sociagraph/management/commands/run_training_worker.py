@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sociagraph.jobs import claim_training_job, run_training_job, run_training_job_by_id
+from sociagraph.pool import create_process_pool
+
+# Trains the models of the queued training jobs, several at a time when given
+# more than one process.
+
+
+class Command(BaseCommand):
+	help = 'Runs the queued model training jobs.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--interval', type=float, default=5, help='Seconds to wait when the queue is empty.')
+		parser.add_argument('--once', action='store_true', default=False, help='Exit when the queue is empty.')
+		parser.add_argument('--processes', type=int, default=1, help='Number of jobs trained in parallel.')
+
+	def handle(self, *args, **options):
+		processes = options['processes']
+		process_pool = create_process_pool(processes) if processes > 1 else None
+
+		while True:
+			jobs = []
+
+			for index in range(processes):
+				job = claim_training_job()
+
+				if job is None:
+					break
+
+				jobs.append(job)
+
+			if len(jobs) == 0:
+				if options['once']:
+					break
+
+				time.sleep(options['interval'])
+				continue
+
+			if process_pool is None:
+				jobs = [ run_training_job(job) for job in jobs ]
+			else:
+				jobs = process_pool.map(run_training_job_by_id, [ job.id for job in jobs ])
+
+			for job in jobs:
+				self.stdout.write('%s %s %s' % (job.model_name, job.status, job.message))
+
+		if process_pool is not None:
+			process_pool.close()
+			process_pool.join()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0003_sentiment_corpus'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='english_dictionary',
+            name='associated_word',
+            field=models.CharField(max_length=100, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='english_dictionary',
+            name='word',
+            field=models.CharField(max_length=100, db_index=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0004_english_dictionary_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Training_Job',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('model_name', models.CharField(max_length=100, db_index=True)),
+                ('status', models.CharField(default=b'queued', max_length=20, db_index=True)),
+                ('progress', models.IntegerField(default=0)),
+                ('message', models.TextField(blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
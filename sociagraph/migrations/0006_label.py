@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0005_training_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Label',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('name', models.CharField(unique=True, max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='classified_corpus',
+            name='themes',
+            field=models.ManyToManyField(related_name='classified_corpora', to='sociagraph.Label'),
+        ),
+        migrations.AddField(
+            model_name='sentiment_corpus',
+            name='emotions',
+            field=models.ManyToManyField(related_name='sentiment_corpora', to='sociagraph.Label'),
+        ),
+    ]
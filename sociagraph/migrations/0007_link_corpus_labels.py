@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def get_label_names(label_string):
+    names = []
+
+    for name in label_string.replace(' ', '').lower().split(','):
+        if name != '' and name not in names:
+            names.append(name)
+
+    return names
+
+
+def link_labels(Label, model, label_field, labels_field, batch_size=1000):
+    relation = model._meta.get_field(labels_field)
+    through = relation.rel.through
+    corpus_field = relation.m2m_field_name() + '_id'
+    label_field_id = relation.m2m_reverse_field_name() + '_id'
+    label_ids = dict(Label.objects.values_list('name', 'id'))
+    last_id = 0
+
+    while True:
+        corpora = list(model.objects.filter(id__gt=last_id).order_by('id').values_list('id', label_field)[:batch_size])
+
+        if len(corpora) == 0:
+            break
+
+        links = []
+
+        for corpus_id, label_string in corpora:
+            for name in get_label_names(label_string):
+                if name not in label_ids:
+                    label_ids[name] = Label.objects.create(name=name).id
+
+                links.append(through(**{corpus_field: corpus_id, label_field_id: label_ids[name]}))
+
+        through.objects.bulk_create(links)
+        last_id = corpora[-1][0]
+
+
+def link_corpus_labels(apps, schema_editor):
+    Label = apps.get_model('sociagraph', 'Label')
+
+    link_labels(Label, apps.get_model('sociagraph', 'Classified_Corpus'), 'theme', 'themes')
+    link_labels(Label, apps.get_model('sociagraph', 'Sentiment_Corpus'), 'emotion', 'emotions')
+
+
+def unlink_corpus_labels(apps, schema_editor):
+    apps.get_model('sociagraph', 'Label').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0006_label'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_corpus_labels, unlink_corpus_labels),
+    ]
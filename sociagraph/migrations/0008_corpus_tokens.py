@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0007_link_corpus_labels'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classified_corpus',
+            name='tokens',
+            field=models.TextField(default='', blank=True),
+        ),
+        migrations.AddField(
+            model_name='sentiment_corpus',
+            name='tokens',
+            field=models.TextField(default='', blank=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0008_corpus_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Evaluation_Report',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('model_name', models.CharField(max_length=100, db_index=True)),
+                ('version', models.CharField(max_length=100)),
+                ('folds', models.IntegerField()),
+                ('seed', models.IntegerField()),
+                ('corpora_count', models.IntegerField()),
+                ('report', models.TextField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def mark_unprocessed_rows(apps, schema_editor):
+    for model_name in ('Classified_Corpus', 'Sentiment_Corpus'):
+        apps.get_model('sociagraph', model_name).objects.filter(tokens='').update(tokens=None)
+
+
+def unmark_unprocessed_rows(apps, schema_editor):
+    for model_name in ('Classified_Corpus', 'Sentiment_Corpus'):
+        apps.get_model('sociagraph', model_name).objects.filter(tokens__isnull=True).update(tokens='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0010_training_job_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='classified_corpus',
+            name='tokens',
+            field=models.TextField(default=None, null=True, blank=True),
+        ),
+        migrations.AlterField(
+            model_name='sentiment_corpus',
+            name='tokens',
+            field=models.TextField(default=None, null=True, blank=True),
+        ),
+        migrations.RunPython(mark_unprocessed_rows, unmark_unprocessed_rows),
+    ]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0011_corpus_tokens_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Corpus_Stamp',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('name', models.CharField(unique=True, max_length=100)),
+                ('edits', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sociagraph', '0012_corpus_stamp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='training_job',
+            name='claimed_by',
+            field=models.CharField(max_length=100, blank=True),
+        ),
+    ]
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import shutil
+import re as regex
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+from django.conf import settings
+
+from sociagraph.lazy import LazyModule
+
+numpy = LazyModule('numpy')
+
+# Saves trained models to versioned directories so that a model trained by the
+# training worker is available to every web process:
+#
+#   <model store>/<model name>/<version>/
+#       metadata.json       corpus version, labels, statistics and metrics
+#       *.npy               weight and word arrays, memory-mapped on load
+#       model.pickle        the rest of the model
+#   <model store>/<model name>/LATEST
+#
+# The web worker processes map the same array files read-only, so the weights
+# and words of a model are held once in the page cache however many workers
+# serve it. A version is written to a temporary directory and renamed, and
+# LATEST is replaced atomically, so readers never see a partly written model;
+# a worker switches to a new version when the version named by LATEST changes.
+# The oldest versions are removed once more than MODEL_STORE_KEEP_VERSIONS
+# exist, so a reader finding its version removed reads LATEST again.
+
+LATEST_FILE = 'LATEST'
+
+# Description:  Get the path of the directory of the saved models, without creating it
+# Parameter/s:  None
+# Return:	    str
+def get_model_store_path():
+	return getattr(settings, 'MODEL_STORE_DIR', os.path.join(settings.BASE_DIR, 'model_store'))
+
+# Description:  Get the directory of the saved models, creating it if missing
+# Parameter/s:  None
+# Return:	    str
+# Dependencies: get_model_store_path()
+def get_model_store_directory():
+	directory = get_model_store_path()
+
+	if not os.path.isdir(directory):
+		os.makedirs(directory)
+
+	return directory
+
+# Description:  Get the directory of the versions of a saved model
+# Parameter/s:  str
+# Return:	    str
+def get_model_directory(name):
+	return os.path.join(get_model_store_directory(), regex.sub('[^A-Za-z0-9_-]', '_', name))
+
+# Description:  Get the file naming the latest version of a saved model
+# Parameter/s:  str
+# Return:	    str
+def get_latest_path(name):
+	return os.path.join(get_model_directory(name), LATEST_FILE)
+
+# Description:  Get the name of the latest version of a saved model
+# Parameter/s:  str
+# Return:	    str | None if not saved
+def get_latest_version_name(name):
+	try:
+		with open(get_latest_path(name)) as latest_file:
+			return latest_file.read().strip()
+	except IOError:
+		return None
+
+# Description:  Get the latest version directory of a saved model
+# Parameter/s:  str
+# Return:	    str | None if not saved
+# Dependencies: get_latest_version_name()
+def get_latest_version_directory(name):
+	version_name = get_latest_version_name(name)
+
+	if version_name is None:
+		return None
+
+	return os.path.join(get_model_directory(name), version_name)
+
+# Description:  Get the saved versions of a model, oldest first
+# Parameter/s:  str
+# Return:	    list [ str, ... ]
+def get_model_versions(name):
+	directory = get_model_directory(name)
+
+	if not os.path.isdir(directory):
+		return []
+
+	return sorted(entry for entry in os.listdir(directory) if regex.match('^[0-9]+-[0-9]+$', entry))
+
+# Description:  Write a file atomically
+# Parameter/s:  str | str
+# Return:	    None
+def write_file_atomically(path, content):
+	temporary_path = '%s.%d.tmp' % (path, os.getpid())
+
+	with open(temporary_path, 'w') as temporary_file:
+		temporary_file.write(content)
+
+	os.rename(temporary_path, path)
+
+# Description:  Save arrays as .npy files
+# Parameter/s:  str | dict { name: numpy.ndarray }
+# Return:	    None
+def save_arrays(directory, arrays):
+	for array_name, values in arrays.items():
+		numpy.save(os.path.join(directory, array_name + '.npy'), numpy.ascontiguousarray(values))
+
+# Description:  Load arrays saved as .npy files
+# Parameter/s:  str | list [ str, ... ] | bool (memory-map the arrays read-only)
+# Return:	    dict { name: numpy.ndarray }
+def load_arrays(directory, array_names, mmap):
+	arrays = {}
+
+	for array_name in array_names:
+		path = os.path.join(directory, array_name + '.npy')
+
+		try:
+			arrays[array_name] = numpy.load(path, mmap_mode='r' if mmap else None)
+		except ValueError:
+			# An empty array cannot be memory-mapped
+			arrays[array_name] = numpy.load(path)
+
+	return arrays
+
+# Description:  Save a trained model with the version of its corpus
+# Parameter/s:  str | tuple | dict { classifier, ... }
+# Return:	    str (version directory)
+# Dependencies: collect_model_versions()
+def save_model(name, version, model):
+	model_directory = get_model_directory(name)
+	version_time = int(time.time() * 1000)
+
+	# Versions saved by the process within the same millisecond are named apart
+	while True:
+		version_name = '%d-%d' % (version_time, os.getpid())
+		version_directory = os.path.join(model_directory, version_name)
+		temporary_directory = os.path.join(model_directory, '.%s.tmp' % version_name)
+
+		if not os.path.exists(version_directory) and not os.path.exists(temporary_directory):
+			break
+
+		version_time += 1
+
+	os.makedirs(temporary_directory)
+
+	classifier = model.get('classifier')
+	stored_model = dict(model)
+	weight_arrays = {}
+	word_arrays = {}
+	labels = []
+
+	# The weights and words are stored apart from the pickled model
+	if classifier is not None:
+		weight_arrays = classifier.get_weight_arrays()
+		word_arrays = classifier.vectorizer.get_word_arrays()
+		labels = classifier.get_labels()
+		stored_model['classifier'] = classifier.copy_without_weights()
+
+	save_arrays(temporary_directory, weight_arrays)
+	save_arrays(temporary_directory, word_arrays)
+
+	with open(os.path.join(temporary_directory, 'model.pickle'), 'wb') as model_file:
+		pickle.dump(stored_model, model_file, pickle.HIGHEST_PROTOCOL)
+
+	with open(os.path.join(temporary_directory, 'metadata.json'), 'w') as metadata_file:
+		json.dump({
+			'name': name,
+			'version': list(version),
+			'created': time.time(),
+			'labels': labels,
+			'arrays': sorted(weight_arrays.keys()),
+			'word_arrays': sorted(word_arrays.keys()),
+			'vocabulary_size': len(word_arrays['words']) if classifier is not None else 0,
+			'statistics': dict((key, value) for key, value in model.items() if key != 'classifier'),
+			'metrics': None,
+		}, metadata_file)
+
+	os.rename(temporary_directory, version_directory)
+	write_file_atomically(get_latest_path(name), version_name)
+	collect_model_versions(name)
+
+	return version_directory
+
+# Description:  Remove the oldest saved versions of a model
+# Parameter/s:  str | int (versions to keep, None to use MODEL_STORE_KEEP_VERSIONS)
+# Return:	    list [ str, ... ] (removed versions)
+def collect_model_versions(name, keep = None):
+	if keep is None:
+		keep = getattr(settings, 'MODEL_STORE_KEEP_VERSIONS', 3)
+
+	versions = get_model_versions(name)
+	latest_directory = get_latest_version_directory(name)
+	removed_versions = []
+
+	# Readers that read LATEST before a save still find the version they loaded
+	for version_name in versions[:-max(keep, 2)]:
+		version_directory = os.path.join(get_model_directory(name), version_name)
+
+		if version_directory != latest_directory:
+			shutil.rmtree(version_directory, ignore_errors=True)
+			removed_versions.append(version_name)
+
+	return removed_versions
+
+# Description:  Load the latest saved version of a model
+# Parameter/s:  str | bool (memory-map the arrays read-only, False to load a copy that can be updated)
+# Return:	    dict { version, model, version_name } | None if not saved
+# Dependencies: load_model_version()
+def load_model(name, mmap = True):
+	version_name = get_latest_version_name(name)
+
+	if version_name is None:
+		return None
+
+	stored_model = load_model_version(name, version_name, mmap)
+
+	# The version may be removed by saves after LATEST was read, read the one it names now
+	if stored_model is None and not os.path.isdir(os.path.join(get_model_directory(name), version_name)):
+		version_name = get_latest_version_name(name)
+
+		if version_name is None:
+			return None
+
+		stored_model = load_model_version(name, version_name, mmap)
+
+	return stored_model
+
+# Description:  Load a saved version of a model
+# Parameter/s:  str | str | bool (memory-map the arrays read-only)
+# Return:	    dict { version, model, version_name } | None if missing or saved in an older format
+# Dependencies: load_arrays()
+def load_model_version(name, version_name, mmap):
+	version_directory = os.path.join(get_model_directory(name), version_name)
+
+	try:
+		with open(os.path.join(version_directory, 'metadata.json')) as metadata_file:
+			metadata = json.load(metadata_file)
+
+		# Saved before the words were stored as arrays, trained again
+		if 'word_arrays' not in metadata:
+			return None
+
+		with open(os.path.join(version_directory, 'model.pickle'), 'rb') as model_file:
+			model = pickle.load(model_file)
+
+		classifier = model.get('classifier')
+
+		if classifier is not None:
+			classifier.vectorizer.set_word_arrays(load_arrays(version_directory, metadata['word_arrays'], mmap))
+			classifier.set_weight_arrays(load_arrays(version_directory, metadata['arrays'], mmap))
+	except IOError:
+		return None
+
+	return { 'version': tuple(metadata['version']), 'model': model, 'version_name': version_name }
+
+# Description:  Save the metrics of the latest saved version of a model if it was trained on a corpus version
+# Parameter/s:  str | tuple | dict
+# Return:	    bool (saved)
+def save_model_metrics(name, version, metrics):
+	version_directory = get_latest_version_directory(name)
+
+	if version_directory is None:
+		return False
+
+	metadata_path = os.path.join(version_directory, 'metadata.json')
+
+	try:
+		with open(metadata_path) as metadata_file:
+			metadata = json.load(metadata_file)
+	except IOError:
+		return False
+
+	if tuple(metadata['version']) != tuple(version):
+		return False
+
+	metadata['metrics'] = metrics
+	write_file_atomically(metadata_path, json.dumps(metadata))
+
+	return True
\ No newline at end of file
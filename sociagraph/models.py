@@ -1,17 +1,47 @@
 from django.db import models
 	
 class English_Dictionary(models.Model):
-	word = models.TextField()
-	associated_word = models.TextField()
+	word = models.CharField(max_length = 100, db_index = True)
+	associated_word = models.CharField(max_length = 100, db_index = True)
 
 class Part_of_Speech(models.Model):
 	short_hand = models.CharField(max_length = 10)
 	long_hand = models.CharField(max_length = 300)
 
+class Label(models.Model):
+	name = models.CharField(max_length = 100, unique = True)
+
 class Classified_Corpus(models.Model):
 	text = models.TextField()
 	theme = models.TextField()
+	tokens = models.TextField(blank = True, null = True, default = None)
+	themes = models.ManyToManyField(Label, related_name = 'classified_corpora')
 
 class Sentiment_Corpus(models.Model):
 	text = models.TextField()
-	emotion = models.TextField()
\ No newline at end of file
+	emotion = models.TextField()
+	tokens = models.TextField(blank = True, null = True, default = None)
+	emotions = models.ManyToManyField(Label, related_name = 'sentiment_corpora')
+
+class Corpus_Stamp(models.Model):
+	name = models.CharField(max_length = 100, unique = True)
+	edits = models.IntegerField(default = 0)
+
+class Training_Job(models.Model):
+	model_name = models.CharField(max_length = 100, db_index = True)
+	status = models.CharField(max_length = 20, default = 'queued', db_index = True)
+	version = models.CharField(max_length = 100, blank = True)
+	claimed_by = models.CharField(max_length = 100, blank = True)
+	progress = models.IntegerField(default = 0)
+	message = models.TextField(blank = True)
+	created = models.DateTimeField(auto_now_add = True)
+	updated = models.DateTimeField(auto_now = True)
+
+class Evaluation_Report(models.Model):
+	model_name = models.CharField(max_length = 100, db_index = True)
+	version = models.CharField(max_length = 100)
+	folds = models.IntegerField()
+	seed = models.IntegerField()
+	corpora_count = models.IntegerField()
+	report = models.TextField()
+	created = models.DateTimeField(auto_now_add = True)
\ No newline at end of file
@@ -0,0 +1,95 @@
+from django.conf import settings
+
+from sociagraph.features import SparseMultiLabelClassifier, create_sparse_svm_classifier, create_sparse_sgd_classifier, create_balanced_svm_estimator, create_sgd_estimator
+
+# With CLASSIFIER_MODE = 'online' the classifiers hash the words into a fixed
+# number of columns and are trained by stochastic gradient descent, so the
+# training worker updates a saved model with the rows added since it was
+# trained instead of training it again. A model is trained from scratch after
+# ONLINE_REFIT_INTERVAL updated rows, or when rows were changed or removed.
+
+# Description:  Check if the classifiers are updated online
+# Parameter/s:  None
+# Return:	    bool
+def is_online_mode():
+	return getattr(settings, 'CLASSIFIER_MODE', 'batch') == 'online'
+
+# Description:  Get the number of hashed word columns of the classifiers
+# Parameter/s:  None
+# Return:	    int | None for a vocabulary in batch mode
+def get_feature_count():
+	if is_online_mode():
+		return getattr(settings, 'ONLINE_FEATURE_COUNT', 2 ** 18)
+
+	return None
+
+# Description:  Create the classifier of the current mode
+# Parameter/s:  SparseFeatureVectorizer
+# Return:	    SparseClassifier
+def create_classifier(vectorizer):
+	if is_online_mode():
+		return create_sparse_sgd_classifier(vectorizer)
+
+	return create_sparse_svm_classifier(vectorizer)
+
+# Description:  Create the one-vs-rest classifier of many labels of the current mode, training TRAINING_THREADS labels at a time
+# Parameter/s:  SparseFeatureVectorizer | list [ label, ... ]
+# Return:	    SparseMultiLabelClassifier
+def create_multi_label_classifier(vectorizer, labels):
+	n_jobs = getattr(settings, 'TRAINING_THREADS', 1)
+
+	if is_online_mode():
+		return SparseMultiLabelClassifier(vectorizer, labels, create_sgd_estimator, True, n_jobs)
+
+	return SparseMultiLabelClassifier(vectorizer, labels, create_balanced_svm_estimator, False, n_jobs)
+
+# Description:  Get the online state of a model trained from scratch
+# Parameter/s:  int (last corpus id read by the training)
+# Return:	    dict { last_id, updates } | None in batch mode
+def get_online_state(last_id):
+	if is_online_mode():
+		return { 'last_id': last_id, 'updates': 0 }
+
+	return None
+
+# Description:  Get a saved model if it can be updated with new rows
+# Parameter/s:  dict { version, model } | None | tuple | int
+# Return:	    dict { classifier, corpora_count, online } | None to train from scratch
+def get_updatable_model(stored_model, version, new_row_count):
+	if not is_online_mode() or stored_model is None:
+		return None
+
+	model = stored_model['model']
+
+	if model.get('online') is None or model['classifier'] is None:
+		return None
+
+	# Rows were changed or removed since the model was saved
+	if version[0] != stored_model['version'][0]:
+		return None
+
+	# Refit to limit the drift of many updates
+	if model['online']['updates'] + new_row_count > getattr(settings, 'ONLINE_REFIT_INTERVAL', 1000):
+		return None
+
+	return model
+
+# Description:  Update a model with labeled tokens
+# Parameter/s:  dict { classifier, corpora_count, online } | list [ ([ token, ... ], label), ... ] | int
+# Return:	    dict { classifier, corpora_count, online } | None if a label is new to the model
+def update_online_model(model, labeled_tokens, last_id):
+	classifier = model['classifier']
+	classes = set(classifier.estimator.classes_)
+
+	for tokens, label in labeled_tokens:
+		if label not in classes:
+			return None
+
+	if len(labeled_tokens) > 0:
+		classifier.partial_train_tokens(labeled_tokens)
+
+	return {
+		'classifier': classifier,
+		'corpora_count': model['corpora_count'] + len(labeled_tokens),
+		'online': { 'last_id': max(last_id, model['online']['last_id']), 'updates': model['online']['updates'] + len(labeled_tokens) },
+	}
\ No newline at end of file
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.cache import cache
+
+# Pages through a corpus by primary key instead of by offset, so a page is an
+# indexed range read at any depth. The total row count is cached and refreshed
+# after CORPUS_COUNT_CACHE_TIMEOUT seconds.
+
+
+class KeysetPage(object):
+
+	# Description:  Create a page of rows ordered by id
+	# Parameter/s:  list [ Model, ... ] | bool | bool
+	def __init__(self, object_list, has_previous, has_next):
+		self.object_list = object_list
+		self.previous = has_previous
+		self.next = has_next
+
+	def __iter__(self):
+		return iter(self.object_list)
+
+	def __len__(self):
+		return len(self.object_list)
+
+	# Description:  Check if there are rows before the page
+	# Return:	    bool
+	def has_previous(self):
+		return self.previous
+
+	# Description:  Check if there are rows after the page
+	# Return:	    bool
+	def has_next(self):
+		return self.next
+
+	# Description:  Get the id of the first row of the page
+	# Return:	    int | None if empty
+	def first_id(self):
+		return self.object_list[0].id if self.object_list else None
+
+	# Description:  Get the id of the last row of the page
+	# Return:	    int | None if empty
+	def last_id(self):
+		return self.object_list[-1].id if self.object_list else None
+
+# Description:  Get an integer query parameter
+# Parameter/s:  HttpRequest | str
+# Return:	    int | None if missing or invalid
+def get_id_parameter(request, key):
+	try:
+		return int(request.GET[key])
+	except (KeyError, ValueError):
+		return None
+
+# Description:  Get the page of a queryset requested by the after, before or last parameter
+# Parameter/s:  HttpRequest | QuerySet | int
+# Return:	    KeysetPage
+# Dependencies: get_id_parameter()
+def get_keyset_page(request, queryset, per_page):
+	after_id = get_id_parameter(request, 'after')
+	before_id = get_id_parameter(request, 'before')
+
+	if after_id is not None:
+		object_list = list(queryset.filter(id__gt=after_id).order_by('id')[:per_page])
+	elif before_id is not None:
+		object_list = list(queryset.filter(id__lt=before_id).order_by('-id')[:per_page])[::-1]
+	elif 'last' in request.GET:
+		object_list = list(queryset.order_by('-id')[:per_page])[::-1]
+	else:
+		object_list = list(queryset.order_by('id')[:per_page])
+
+	if not object_list:
+		return KeysetPage(object_list, False, False)
+
+	return KeysetPage(
+		object_list,
+		queryset.filter(id__lt=object_list[0].id).exists(),
+		queryset.filter(id__gt=object_list[-1].id).exists())
+
+# Description:  Get the cache key of the row count of a model
+# Parameter/s:  Model
+# Return:	    str
+def get_count_cache_key(model):
+	return 'corpus_count:' + model._meta.db_table
+
+# Description:  Get the cached row count of a model, counting the rows once expired
+# Parameter/s:  Model
+# Return:	    int
+# Dependencies: get_count_cache_key()
+def get_cached_count(model):
+	key = get_count_cache_key(model)
+	count = cache.get(key)
+
+	if count is None:
+		count = model.objects.count()
+		cache.set(key, count, getattr(settings, 'CORPUS_COUNT_CACHE_TIMEOUT', 300))
+
+	return count
+
+# Description:  Add inserted rows to the cached row count of a model
+# Parameter/s:  Model | int
+# Return:	    None
+# Dependencies: get_count_cache_key()
+def add_to_cached_count(model, count):
+	try:
+		cache.incr(get_count_cache_key(model), count)
+	except ValueError:
+		# Not cached, counted on the next request
+		pass
@@ -0,0 +1,21 @@
+import threading
+import multiprocessing
+
+from django.db import connections
+
+# Process pools of the training worker. A pool is created when the worker
+# starts, before any other thread: forking a process whose other threads hold
+# locks (logging, the model registry, the profiling statistics) can deadlock
+# its children, so pools are never created from a web request.
+
+# Description:  Create a process pool
+# Parameter/s:  int
+# Return:	    Pool
+def create_process_pool(size):
+	if threading.active_count() > 1:
+		raise RuntimeError('A process pool must be created before other threads are started.')
+
+	# Forked processes must open their own database connections
+	connections.close_all()
+
+	return multiprocessing.Pool(size)
\ No newline at end of file
@@ -0,0 +1,177 @@
+import re as regex
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+try:
+	import tracemalloc
+except ImportError:
+	tracemalloc = None
+
+from django.conf import settings
+
+# Measures the stages of a request with PROFILE_STAGES: the wall time and
+# number of calls of each stage, and with PROFILE_MEMORY the traced memory peak
+# where tracemalloc is available. The stages of a request are sent in its
+# Server-Timing header and the totals of the process are kept for the stage
+# statistics endpoint. Without PROFILE_STAGES the profiled functions are called
+# directly and the header only has the total time of the request.
+#
+# tracemalloc traces the whole process, so memory tracing is started once when
+# the process starts and the peak of a stage is the peak of the process, with
+# the allocations of the concurrent requests of a threaded server.
+
+request_stages = threading.local()
+stage_statistics = {}
+statistics_lock = threading.Lock()
+
+header_name_pattern = regex.compile('[^A-Za-z0-9_-]')
+
+# Description:  Check if the stages of the requests are measured
+# Parameter/s:  None
+# Return:	    bool
+def is_stage_profiled():
+	return getattr(settings, 'PROFILE_STAGES', False)
+
+# Description:  Check if the memory of the stages is traced
+# Parameter/s:  None
+# Return:	    bool
+def is_memory_profiled():
+	return tracemalloc is not None and getattr(settings, 'PROFILE_MEMORY', False)
+
+# Description:  Start tracing the memory of the process, once when it starts
+# Parameter/s:  None
+# Return:	    None
+def start_memory_tracing():
+	if is_memory_profiled() and not tracemalloc.is_tracing():
+		tracemalloc.start()
+
+# Description:  Start collecting the stages of the current request
+# Parameter/s:  None
+# Return:	    None
+def start_request_stages():
+	request_stages.stages = {} if is_stage_profiled() else None
+	request_stages.start_time = time.time()
+
+# Description:  Stop collecting the stages of the current request
+# Parameter/s:  None
+# Return:	    tuple (dict { stage: { seconds, calls, peak_memory_kb } }, float total seconds)
+def finish_request_stages():
+	stages = getattr(request_stages, 'stages', None) or {}
+	total_seconds = time.time() - getattr(request_stages, 'start_time', time.time())
+
+	request_stages.stages = None
+
+	return (stages, total_seconds)
+
+# Description:  Add a measurement to a table of stages
+# Parameter/s:  dict | str | float | int | None
+# Return:	    None
+def add_stage_measurement(stages, name, seconds, peak_memory):
+	stage = stages.get(name)
+
+	if stage is None:
+		stage = { 'seconds': 0.0, 'calls': 0, 'max_seconds': 0.0, 'peak_memory_kb': None }
+		stages[name] = stage
+
+	stage['seconds'] += seconds
+	stage['calls'] += 1
+	stage['max_seconds'] = max(stage['max_seconds'], seconds)
+
+	if peak_memory is not None:
+		stage['peak_memory_kb'] = max(stage['peak_memory_kb'] or 0, peak_memory)
+
+# Description:  Measure a block of code as a stage
+# Parameter/s:  str
+# Return:	    context manager
+# Dependencies: add_stage_measurement()
+@contextmanager
+def profile_stage(name):
+	if not is_stage_profiled():
+		yield
+		return
+
+	start_time = time.time()
+
+	try:
+		yield
+	finally:
+		seconds = time.time() - start_time
+		peak_memory = None
+
+		# Peak of the process since the tracing started
+		if is_memory_profiled() and tracemalloc.is_tracing():
+			peak_memory = tracemalloc.get_traced_memory()[1] / 1024
+
+		stages = getattr(request_stages, 'stages', None)
+
+		if stages is not None:
+			add_stage_measurement(stages, name, seconds, peak_memory)
+
+		with statistics_lock:
+			add_stage_measurement(stage_statistics, name, seconds, peak_memory)
+
+# Description:  Measure each call of a function as a stage
+# Parameter/s:  str (None for the name of the function)
+# Return:	    decorator
+# Dependencies: profile_stage()
+def profiled(name = None):
+	def decorator(function):
+		stage_name = name or function.__name__
+
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			if not is_stage_profiled():
+				return function(*args, **kwargs)
+
+			with profile_stage(stage_name):
+				return function(*args, **kwargs)
+
+		return wrapper
+
+	return decorator
+
+# Description:  Get the Server-Timing header of stages
+# Parameter/s:  dict { stage: { seconds, calls } } | float
+# Return:	    str
+def get_server_timing_header(stages, total_seconds):
+	metrics = []
+
+	for name, stage in sorted(stages.items()):
+		metrics.append('%s;dur=%.1f;desc="%d calls"' % (header_name_pattern.sub('_', name), stage['seconds'] * 1000, stage['calls']))
+
+	metrics.append('total;dur=%.1f' % (total_seconds * 1000))
+
+	return ', '.join(metrics)
+
+# Description:  Get the totals of the stages of the process
+# Parameter/s:  None
+# Return:	    dict { stage: { seconds, calls, max_seconds, mean_seconds, peak_memory_kb } }
+def get_stage_statistics():
+	with statistics_lock:
+		statistics = dict((name, dict(stage)) for name, stage in stage_statistics.items())
+
+	for stage in statistics.values():
+		stage['mean_seconds'] = stage['seconds'] / stage['calls']
+
+	return statistics
+
+# Description:  Remove the totals of the stages of the process
+# Parameter/s:  None
+# Return:	    None
+def clear_stage_statistics():
+	with statistics_lock:
+		stage_statistics.clear()
+
+
+class StageTimingMiddleware(object):
+
+	def process_request(self, request):
+		start_request_stages()
+
+	def process_response(self, request, response):
+		stages, total_seconds = finish_request_stages()
+		response['Server-Timing'] = get_server_timing_header(stages, total_seconds)
+
+		return response
\ No newline at end of file
@@ -0,0 +1,124 @@
+import threading
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+
+from sociagraph.models import Corpus_Stamp
+from sociagraph.jobs import enqueue_training_job
+from sociagraph.model_store import load_model, get_latest_version_name
+
+# Keeps trained classifiers in the process so that a request only pays for
+# inference. Models are trained by the training worker and loaded from the
+# model store; a model is retrained when the version of its corpus changes.
+#
+# The version of a corpus is its count of edits, stored in Corpus_Stamp and
+# counted when rows are changed or removed, with its latest id, which grows
+# with the added rows. Both are read by index, not by counting the table.
+
+# Description:  Get the version of a corpus from its count of edits and latest id
+# Parameter/s:  Model
+# Return:	    tuple (int, int)
+def get_corpus_version(model):
+	edits = Corpus_Stamp.objects.filter(name=model._meta.db_table).values_list('edits', flat=True).first()
+
+	return (edits or 0, model.objects.aggregate(last_id=Max('id'))['last_id'])
+
+# Description:  Count an edit of the rows of a corpus, changed or removed, so that its version changes
+# Parameter/s:  Model
+# Return:	    None
+def mark_corpus_edited(model):
+	name = model._meta.db_table
+
+	if Corpus_Stamp.objects.filter(name=name).update(edits=F('edits') + 1) == 1:
+		return
+
+	try:
+		with transaction.atomic():
+			Corpus_Stamp.objects.create(name=name, edits=1)
+	except IntegrityError:
+		# Created by another process in the meantime
+		Corpus_Stamp.objects.filter(name=name).update(edits=F('edits') + 1)
+
+
+class ModelRegistry(object):
+
+	def __init__(self):
+		self.models = {}
+		self.queued_versions = {}
+		self.locks = {}
+		self.lock = threading.Lock()
+
+	# Description:  Get the lock guarding the loading of a model
+	# Parameter/s:  str
+	# Return:	    Lock
+	def get_lock(self, name):
+		with self.lock:
+			if name not in self.locks:
+				self.locks[name] = threading.Lock()
+
+			return self.locks[name]
+
+	# Description:  Get the last trained model with the corpus version it was trained on, queueing its training if missing or outdated
+	# Parameter/s:  str | tuple
+	# Return:	    dict { version, model, version_name } | None if never trained
+	# Dependencies: load_model() | enqueue_training_job()
+	def get_latest_entry(self, name, version):
+		entry = self.models.get(name)
+		version_name = get_latest_version_name(name)
+
+		# Load the model when the training worker saved a new one
+		if version_name is not None and (entry is None or entry['version_name'] != version_name):
+			with self.get_lock(name):
+				entry = self.models.get(name)
+
+				if entry is None or entry['version_name'] != version_name:
+					stored_model = load_model(name)
+
+					if stored_model is not None:
+						entry = stored_model
+						self.models[name] = entry
+
+		# Queue the training once per corpus version in the process
+		if (entry is None or entry['version'] != version) and self.queued_versions.get(name) != version:
+			enqueue_training_job(name, version)
+			self.queued_versions[name] = version
+
+		return entry
+
+	# Description:  Get the last trained model, queueing its training if missing or outdated
+	# Parameter/s:  str | tuple
+	# Return:	    object | None if never trained
+	# Dependencies: get_latest_entry()
+	def get_latest(self, name, version):
+		entry = self.get_latest_entry(name, version)
+
+		if entry is None:
+			return None
+
+		return entry['model']
+
+	# Description:  Remove a model so that it is reloaded on next use
+	# Parameter/s:  str
+	# Return:	    None
+	def invalidate(self, name):
+		with self.lock:
+			self.models.pop(name, None)
+			self.queued_versions.pop(name, None)
+
+	# Description:  Get the names of the models in the registry
+	# Parameter/s:  None
+	# Return:	    list [ str, ... ]
+	def names(self):
+		with self.lock:
+			return list(self.models.keys())
+
+	# Description:  Remove all models
+	# Parameter/s:  None
+	# Return:	    None
+	def clear(self):
+		with self.lock:
+			self.models.clear()
+			self.queued_versions.clear()
+
+
+model_registry = ModelRegistry()
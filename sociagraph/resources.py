@@ -0,0 +1,67 @@
+import threading
+
+from sociagraph.lazy import LazyModule
+
+nltk = LazyModule('nltk')
+stopwords = LazyModule('nltk.corpus', 'stopwords')
+wordnet = LazyModule('nltk.corpus', 'wordnet')
+
+# Heavy NLTK objects are loaded once per process and shared by all threads.
+# NLTK loads its corpora lazily and not thread-safely, so the first load of
+# each resource happens under a lock, ideally from warm_up() at startup.
+
+resources = {}
+resources_lock = threading.RLock()
+
+# Description:  Get a shared resource, loading it on first use
+# Parameter/s:  str | function () -> object
+# Return:	    object
+def get_resource(name, load):
+	resource = resources.get(name)
+
+	if resource is None:
+		with resources_lock:
+			resource = resources.get(name)
+
+			if resource is None:
+				resource = load()
+				resources[name] = resource
+
+	return resource
+
+# Description:  Get the english stopwords
+# Parameter/s:  None
+# Return:	    frozenset([ str, ... ])
+def get_stopword_set():
+	return get_resource('stopwords', lambda: frozenset(stopwords.words('english')))
+
+# Description:  Get the english dictionary words
+# Parameter/s:  None
+# Return:	    frozenset([ str, ... ])
+def get_english_words():
+	return get_resource('words', lambda: frozenset(nltk.corpus.words.words()))
+
+# Description:  Get the WordNet lemmatizer
+# Parameter/s:  None
+# Return:	    WordNetLemmatizer
+def get_lemmatizer():
+	return get_resource('lemmatizer', nltk.WordNetLemmatizer)
+
+# Description:  Get the Lancaster stemmer
+# Parameter/s:  None
+# Return:	    LancasterStemmer
+def get_stemmer():
+	return get_resource('stemmer', nltk.LancasterStemmer)
+
+# Description:  Load every resource and the lazy corpora they read
+# Parameter/s:  None
+# Return:	    None
+def warm_up():
+	with resources_lock:
+		get_stopword_set()
+		get_english_words()
+		get_stemmer()
+
+		# The lemmatizer loads WordNet on its first lemma
+		get_lemmatizer().lemmatize('words')
+		wordnet.synsets('word')
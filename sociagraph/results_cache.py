@@ -0,0 +1,42 @@
+import json
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Caches the outputs of the results pages. An entry is keyed by a hash of the
+# normalized text, the requested themes, the saved model and the evaluation
+# that produced it, so a retrained model or a new evaluation is never served
+# stale outputs. The 'results' cache of CACHES bounds the number of entries.
+
+# Description:  Get the cache of the results pages
+# Parameter/s:  None
+# Return:	    BaseCache
+def get_results_cache():
+	return caches[getattr(settings, 'RESULTS_CACHE_ALIAS', 'results')]
+
+# Description:  Get the cache key of the outputs of a text
+# Parameter/s:  str (page) | str | list [ theme, ... ] | dict { version, model, version_name } | dict { created, ... } | None if never evaluated
+# Return:	    str
+def get_results_cache_key(name, text, themes, model_entry, evaluation):
+	key_data = json.dumps([
+		text,
+		themes,
+		list(model_entry['version']),
+		model_entry['version_name'],
+		evaluation['created'].isoformat() if evaluation is not None else None,
+	])
+
+	return 'results:%s:%s' % (name, hashlib.sha1(key_data.encode('utf-8')).hexdigest())
+
+# Description:  Get the cached outputs of a text
+# Parameter/s:  str
+# Return:	    dict | None if not cached
+def get_cached_results(key):
+	return get_results_cache().get(key)
+
+# Description:  Cache the outputs of a text
+# Parameter/s:  str | dict
+# Return:	    None
+def cache_results(key, results):
+	get_results_cache().set(key, results)
\ No newline at end of file
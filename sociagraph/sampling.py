@@ -0,0 +1,102 @@
+import random
+
+from django.db.models import Min, Max
+
+from sociagraph.labels import get_label_relation
+
+# Draws random training samples without sorting the corpus table. Texts with a
+# label are read through the indexed link table; other rows are found by
+# drawing random ids between the lowest and highest id. The cost grows with
+# the sample size, not with the table size.
+
+# Number of rounds of random ids before reading the remaining rows in order
+sampling_rounds = 5
+
+# Maximum number of ids in one query, below the SQLite limit of query parameters
+id_chunk_size = 500
+
+# Description:  Get the ids that exist among candidate ids
+# Parameter/s:  Model | list [ int, ... ]
+# Return:	    list [ int, ... ]
+def get_existing_ids(model, candidates):
+	existing_ids = []
+
+	for index in range(0, len(candidates), id_chunk_size):
+		existing_ids.extend(model.objects.filter(id__in=candidates[index:index + id_chunk_size]).values_list('id', flat=True))
+
+	return existing_ids
+
+# Description:  Get random ids of corpora up to an id, skipping excluded ids
+# Parameter/s:  Model | int | set([ int, ... ]) | int (None for all corpora)
+# Return:	    list [ int, ... ]
+# Dependencies: get_existing_ids()
+def sample_ids(model, sample_size, excluded_ids, last_id = None):
+	corpora = model.objects.all() if last_id is None else model.objects.filter(id__lte=last_id)
+	id_range = corpora.aggregate(first_id=Min('id'), last_id=Max('id'))
+	sampled_ids = set()
+
+	if id_range['first_id'] is None:
+		return []
+
+	for attempt in range(sampling_rounds):
+		needed = sample_size - len(sampled_ids)
+
+		if needed <= 0:
+			break
+
+		# Draw extra ids to make up for deleted and excluded rows
+		candidates = set(random.randint(id_range['first_id'], id_range['last_id']) for index in range(needed * 2))
+		candidates -= excluded_ids
+		candidates -= sampled_ids
+
+		sampled_ids.update(get_existing_ids(model, list(candidates))[:needed])
+
+	if len(sampled_ids) >= sample_size:
+		return list(sampled_ids)
+
+	# Read the remaining rows in id order from a random id, wrapping around
+	start_id = random.randint(id_range['first_id'], id_range['last_id'])
+
+	for queryset in (corpora.filter(id__gte=start_id), corpora.filter(id__lt=start_id)):
+		needed = sample_size - len(sampled_ids)
+
+		if needed <= 0:
+			break
+
+		# The rows read may include the excluded and already sampled ids
+		for corpus_id in queryset.order_by('id').values_list('id', flat=True)[:needed + len(excluded_ids) + len(sampled_ids)]:
+			if len(sampled_ids) >= sample_size:
+				break
+
+			if corpus_id not in excluded_ids:
+				sampled_ids.add(corpus_id)
+
+	return list(sampled_ids)
+
+# Description:  Get the ids of the corpora up to an id of each label
+# Parameter/s:  Model | str | int
+# Return:	    dict { label id: list [ int, ... ] }
+# Dependencies: get_label_relation()
+def get_labeled_ids(model, labels_field, last_id):
+	through, corpus_field, label_field = get_label_relation(model, labels_field)
+	labeled_ids = {}
+
+	for label_id in through.objects.values_list(label_field, flat=True).distinct():
+		labeled_ids[label_id] = list(through.objects.filter(**{ label_field: label_id, corpus_field + '__lte': last_id }).values_list(corpus_field, flat=True))
+
+	return labeled_ids
+
+# Description:  Get random ids of corpora up to an id, with texts of each label and as many texts without it
+# Parameter/s:  Model | str | int (texts drawn with each label) | int
+# Return:	    list [ int, ... ]
+# Dependencies: get_labeled_ids() | sample_ids()
+def sample_balanced_ids(model, labels_field, sample_size, last_id):
+	sampled_ids = set()
+
+	for label_id, ids in get_labeled_ids(model, labels_field, last_id).items():
+		label_sample = random.sample(ids, sample_size) if len(ids) > sample_size else ids
+
+		sampled_ids.update(label_sample)
+		sampled_ids.update(sample_ids(model, len(label_sample), set(ids), last_id))
+
+	return sorted(sampled_ids)
\ No newline at end of file
@@ -42,6 +42,7 @@ INSTALLED_APPS = (
 )
 
 MIDDLEWARE_CLASSES = (
+    'sociagraph.profiling.StageTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -71,6 +72,25 @@ DATABASES = {
     }
 }
 
+# Caches
+# https://docs.djangoproject.com/en/dev/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Outputs of the results pages, a third of the entries is culled past
+    # MAX_ENTRIES
+    'results': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'results',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/dev/topics/i18n/
 
@@ -90,4 +110,65 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
-TEMPLATE_DIRS = [os.path.join(BASE_DIR, 'sociagraph/templates')]
\ No newline at end of file
+TEMPLATE_DIRS = [os.path.join(BASE_DIR, 'sociagraph/templates')]
+
+
+# Natural language processing
+
+# Load the NLTK resources when a web process starts, False to load them with
+# the first request that needs them
+WARM_UP_RESOURCES = True
+
+# Maximum number of words whose WordNet synsets are kept in memory
+WORDNET_CACHE_SIZE = 50000
+
+# Seconds between the checks of each process for a rebuilt English_Dictionary
+DICTIONARY_CHECK_INTERVAL = 30
+
+# Directory of the models saved by the training worker
+MODEL_STORE_DIR = os.path.join(BASE_DIR, 'model_store')
+
+# Number of saved versions of each model kept in the model store
+MODEL_STORE_KEEP_VERSIONS = 3
+
+# Seconds a training job may run without reporting progress before it is
+# queued again for another worker
+TRAINING_JOB_TIMEOUT = 3600
+
+# Seconds between the updates of a running training job telling the other
+# workers that it is still running, well below TRAINING_JOB_TIMEOUT
+TRAINING_JOB_HEARTBEAT = 60
+
+# Number of threads fitting the labels of a one-vs-rest classifier at a time
+TRAINING_THREADS = 1
+
+
+# Maximum number of texts of each theme drawn to train the theme classifier,
+# with as many texts without the theme, None to use all of them
+THEME_SAMPLE_SIZE = None
+
+# Seconds the row count of a corpus shown on its browsing page is cached
+CORPUS_COUNT_CACHE_TIMEOUT = 300
+
+# Classifier training, 'batch' to train the classifiers from scratch or
+# 'online' to update them with the added corpora
+CLASSIFIER_MODE = 'batch'
+
+# Number of hashed word columns of the online classifiers
+ONLINE_FEATURE_COUNT = 2 ** 18
+
+# Number of rows an online classifier is updated with before it is trained
+# from scratch
+ONLINE_REFIT_INTERVAL = 1000
+
+# Measure the stages of the requests for the Server-Timing header and the
+# profiling endpoint
+PROFILE_STAGES = False
+
+# Record the traced memory peak of the process with the request stages, with
+# tracemalloc started when the process starts
+PROFILE_MEMORY = False
+
+# Number of folds and seed of the cross-validation of the classifiers
+EVALUATION_FOLDS = 5
+EVALUATION_SEED = 0
\ No newline at end of file
@@ -0,0 +1,330 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+
+from sociagraph.models import Sentiment_Corpus, Training_Job
+from sociagraph import model_store
+from sociagraph import jobs
+from sociagraph.features import SparseFeatureVectorizer, SparseMultiLabelClassifier, create_balanced_svm_estimator
+from sociagraph.evaluation import get_fold_indices, average_reports, cross_validate
+from sociagraph.pagination import get_keyset_page, get_cached_count, add_to_cached_count
+
+# Labeled tokens of a small corpus, without synonym labels so that no WordNet
+# lookup is needed
+labeled_tokens = [
+	(['school', 'teacher'], set(['education'])),
+	(['class', 'student'], set(['education'])),
+	(['school', 'student'], set(['education'])),
+	(['doctor', 'nurse'], set(['health'])),
+	(['hospital', 'doctor'], set(['health'])),
+	(['nurse', 'medicine'], set(['health'])),
+	(['school', 'nurse'], set(['education', 'health'])),
+]
+
+# Description:  Train a classifier of the themes of the small corpus
+# Parameter/s:  int (hashed columns, None to use a vocabulary)
+# Return:	    SparseMultiLabelClassifier
+def create_trained_classifier(n_features = None):
+	vectorizer = SparseFeatureVectorizer([], n_features).fit(set(word for tokens, labels in labeled_tokens for word in tokens))
+
+	return SparseMultiLabelClassifier(vectorizer, ['education', 'health'], create_balanced_svm_estimator).train_tokens(labeled_tokens)
+
+
+class ModelStoreTest(TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.settings_override = override_settings(MODEL_STORE_DIR=self.directory, MODEL_STORE_KEEP_VERSIONS=2)
+		self.settings_override.enable()
+
+	def tearDown(self):
+		self.settings_override.disable()
+		shutil.rmtree(self.directory, ignore_errors=True)
+
+	def test_missing_model(self):
+		self.assertIsNone(model_store.load_model('themes'))
+
+	def test_round_trip(self):
+		classifier = create_trained_classifier()
+		model_store.save_model('themes', (0, 7), { 'classifier': classifier, 'last_id': 7 })
+
+		stored_model = model_store.load_model('themes')
+
+		self.assertEqual(stored_model['version'], (0, 7))
+		self.assertEqual(stored_model['model']['last_id'], 7)
+
+		token_lists = [ tokens for tokens, labels in labeled_tokens ] + [['unknown']]
+		self.assertEqual(stored_model['model']['classifier'].predict_tokens(token_lists), classifier.predict_tokens(token_lists))
+
+	def test_round_trip_without_classifier(self):
+		model_store.save_model('themes', (0, None), { 'classifier': None, 'last_id': 0 })
+
+		self.assertIsNone(model_store.load_model('themes')['model']['classifier'])
+
+	def test_oldest_versions_are_removed(self):
+		for last_id in range(4):
+			model_store.save_model('themes', (0, last_id), { 'classifier': None })
+
+		self.assertEqual(len(model_store.get_model_versions('themes')), 2)
+		self.assertEqual(model_store.load_model('themes')['version'], (0, 3))
+
+	def test_versions_saved_in_the_same_millisecond(self):
+		first_directory = model_store.save_model('themes', (0, 1), { 'classifier': None })
+		second_directory = model_store.save_model('themes', (0, 2), { 'classifier': None })
+
+		self.assertNotEqual(first_directory, second_directory)
+		self.assertEqual(model_store.get_latest_version_name('themes'), os.path.basename(second_directory))
+
+	def test_removed_version_is_loaded_again(self):
+		model_store.save_model('themes', (0, 1), { 'classifier': None })
+		removed_version_name = model_store.get_latest_version_name('themes')
+		get_latest_version_name = model_store.get_latest_version_name
+
+		# LATEST is read before a save removes the version it names
+		def get_removed_version_name(name):
+			model_store.get_latest_version_name = get_latest_version_name
+			model_store.save_model('themes', (0, 2), { 'classifier': None })
+			shutil.rmtree(os.path.join(model_store.get_model_directory('themes'), removed_version_name))
+
+			return removed_version_name
+
+		model_store.get_latest_version_name = get_removed_version_name
+
+		try:
+			stored_model = model_store.load_model('themes')
+		finally:
+			model_store.get_latest_version_name = get_latest_version_name
+
+		self.assertEqual(stored_model['version'], (0, 2))
+		self.assertNotEqual(stored_model['version_name'], removed_version_name)
+
+	def test_metrics_of_the_saved_version(self):
+		model_store.save_model('themes', (0, 1), { 'classifier': None })
+
+		self.assertFalse(model_store.save_model_metrics('themes', (0, 2), { 'accuracy': 1.0 }))
+		self.assertTrue(model_store.save_model_metrics('themes', (0, 1), { 'accuracy': 1.0 }))
+
+
+class SparseFeatureVectorizerTest(TestCase):
+
+	# Description:  Copy a fitted vectorizer through its word arrays
+	# Parameter/s:  SparseFeatureVectorizer
+	# Return:	    SparseFeatureVectorizer
+	def copy_through_word_arrays(self, vectorizer):
+		copied_vectorizer = vectorizer.copy_without_words()
+		copied_vectorizer.set_word_arrays(vectorizer.get_word_arrays())
+
+		return copied_vectorizer
+
+	def test_vocabulary_word_arrays(self):
+		vectorizer = SparseFeatureVectorizer([]).fit(set(['school', 'doctor', u'caf\xe9']))
+		copied_vectorizer = self.copy_through_word_arrays(vectorizer)
+		token_lists = [['school', 'doctor'], [u'caf\xe9'], ['unknown'], []]
+
+		self.assertEqual(copied_vectorizer.get_column_count(), 3)
+		self.assertEqual((copied_vectorizer.transform_tokens(token_lists) != vectorizer.transform_tokens(token_lists)).nnz, 0)
+		self.assertEqual(sorted(copied_vectorizer.get_word_dictionaries()[0].values()), [0, 1, 2])
+
+	def test_hashed_word_arrays(self):
+		vectorizer = SparseFeatureVectorizer([], 16).fit(set(['school', 'doctor']))
+		copied_vectorizer = self.copy_through_word_arrays(vectorizer)
+		token_lists = [['school', 'doctor'], ['unknown']]
+
+		self.assertEqual(copied_vectorizer.get_column_count(), 16)
+		self.assertEqual((copied_vectorizer.transform_tokens(token_lists) != vectorizer.transform_tokens(token_lists)).nnz, 0)
+
+	def test_hashed_column_of_unicode_and_bytes(self):
+		vectorizer = SparseFeatureVectorizer([], 1024)
+
+		self.assertEqual(vectorizer.get_word_column(u'caf\xe9'), vectorizer.get_word_column(u'caf\xe9'.encode('utf-8')))
+
+
+class TrainingJobTest(TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.settings_override = override_settings(MODEL_STORE_DIR=self.directory, TRAINING_JOB_TIMEOUT=60)
+		self.settings_override.enable()
+
+	def tearDown(self):
+		self.settings_override.disable()
+		shutil.rmtree(self.directory, ignore_errors=True)
+
+	def test_queued_job_is_not_queued_again(self):
+		job = jobs.enqueue_training_job('tests:model')
+
+		self.assertEqual(jobs.enqueue_training_job('tests:model').id, job.id)
+		self.assertEqual(Training_Job.objects.count(), 1)
+
+	def test_failed_job_is_retried_on_another_version(self):
+		Training_Job.objects.create(model_name='tests:model', status='failed', version=jobs.get_job_version((0, 1)))
+
+		self.assertEqual(jobs.enqueue_training_job('tests:model', (0, 1)).status, 'failed')
+		self.assertEqual(jobs.enqueue_training_job('tests:model', (0, 2)).status, 'queued')
+
+	def test_claim(self):
+		job = jobs.enqueue_training_job('tests:model')
+		claimed_job = jobs.claim_training_job()
+
+		self.assertEqual(claimed_job.id, job.id)
+		self.assertEqual(claimed_job.status, 'running')
+		self.assertNotEqual(claimed_job.claimed_by, '')
+		self.assertIsNone(jobs.claim_training_job())
+
+	def test_stale_job_is_reclaimed(self):
+		jobs.enqueue_training_job('tests:model')
+		first_claim = jobs.claim_training_job()
+		Training_Job.objects.filter(id=first_claim.id).update(updated=timezone.now() - timedelta(seconds=120))
+
+		second_claim = jobs.claim_training_job()
+
+		self.assertEqual(second_claim.id, first_claim.id)
+		self.assertNotEqual(second_claim.claimed_by, first_claim.claimed_by)
+
+	def test_running_job_is_not_reclaimed(self):
+		jobs.enqueue_training_job('tests:model')
+		jobs.claim_training_job()
+
+		self.assertEqual(jobs.reclaim_training_jobs(), 0)
+		self.assertIsNone(jobs.claim_training_job())
+
+	def test_run_saves_the_model(self):
+		jobs.register_trainer('tests:saved', lambda model_name, report_progress: ((0, 1), { 'classifier': None }, []))
+		jobs.enqueue_training_job('tests:saved')
+
+		job = jobs.run_training_job(jobs.claim_training_job())
+
+		self.assertEqual(job.status, 'completed')
+		self.assertEqual(Training_Job.objects.get(id=job.id).status, 'completed')
+		self.assertEqual(model_store.load_model('tests:saved')['version'], (0, 1))
+
+	def test_reclaimed_job_is_left_to_its_new_claim(self):
+		# The job is claimed by another worker while it is trained
+		def train(model_name, report_progress):
+			Training_Job.objects.filter(model_name=model_name).update(status='queued', claimed_by='')
+			jobs.claim_training_job()
+
+			return ((0, 1), { 'classifier': None }, [])
+
+		jobs.register_trainer('tests:reclaimed', train)
+		jobs.enqueue_training_job('tests:reclaimed')
+
+		job = jobs.run_training_job(jobs.claim_training_job())
+
+		self.assertEqual(job.status, 'reclaimed')
+		self.assertEqual(Training_Job.objects.get(id=job.id).status, 'running')
+		self.assertIsNone(model_store.load_model('tests:reclaimed'))
+
+	def test_failed_training(self):
+		jobs.register_trainer('tests:failed', lambda model_name, report_progress: 1 / 0)
+		jobs.enqueue_training_job('tests:failed')
+
+		job = jobs.run_training_job(jobs.claim_training_job())
+
+		self.assertEqual(Training_Job.objects.get(id=job.id).status, 'failed')
+		self.assertNotEqual(Training_Job.objects.get(id=job.id).message, '')
+
+
+class KeysetPaginationTest(TestCase):
+
+	def setUp(self):
+		cache.clear()
+		Sentiment_Corpus.objects.bulk_create([ Sentiment_Corpus(text='text %d' % index, emotion='happy') for index in range(7) ])
+		self.ids = list(Sentiment_Corpus.objects.order_by('id').values_list('id', flat=True))
+		self.factory = RequestFactory()
+
+	# Description:  Get a page of the corpus
+	# Parameter/s:  dict { parameter: value }
+	# Return:	    KeysetPage
+	def get_page(self, parameters):
+		return get_keyset_page(self.factory.get('/', parameters), Sentiment_Corpus.objects.all(), 3)
+
+	def test_first_page(self):
+		page = self.get_page({})
+
+		self.assertEqual([ corpus.id for corpus in page ], self.ids[:3])
+		self.assertFalse(page.has_previous())
+		self.assertTrue(page.has_next())
+
+	def test_page_after(self):
+		page = self.get_page({ 'after': self.ids[2] })
+
+		self.assertEqual([ corpus.id for corpus in page ], self.ids[3:6])
+		self.assertTrue(page.has_previous())
+		self.assertTrue(page.has_next())
+
+	def test_page_before(self):
+		page = self.get_page({ 'before': self.ids[3] })
+
+		self.assertEqual([ corpus.id for corpus in page ], self.ids[:3])
+		self.assertEqual(page.first_id(), self.ids[0])
+		self.assertEqual(page.last_id(), self.ids[2])
+
+	def test_last_page(self):
+		page = self.get_page({ 'last': '' })
+
+		self.assertEqual([ corpus.id for corpus in page ], self.ids[4:])
+		self.assertTrue(page.has_previous())
+		self.assertFalse(page.has_next())
+
+	def test_empty_page(self):
+		page = self.get_page({ 'after': self.ids[-1] })
+
+		self.assertEqual(len(page), 0)
+		self.assertIsNone(page.first_id())
+		self.assertFalse(page.has_previous())
+
+	def test_invalid_parameter_gets_the_first_page(self):
+		self.assertEqual([ corpus.id for corpus in self.get_page({ 'after': 'x' }) ], self.ids[:3])
+
+	def test_cached_count(self):
+		self.assertEqual(get_cached_count(Sentiment_Corpus), 7)
+
+		# Counted once, then kept up to date by the inserts and deletions
+		Sentiment_Corpus.objects.create(text='text', emotion='sad')
+		add_to_cached_count(Sentiment_Corpus, 1)
+		self.assertEqual(get_cached_count(Sentiment_Corpus), 8)
+
+		add_to_cached_count(Sentiment_Corpus, -2)
+		self.assertEqual(get_cached_count(Sentiment_Corpus), 6)
+
+
+class CrossValidateTest(TestCase):
+
+	def test_folds_split_all_items_once(self):
+		folds = get_fold_indices(10, 3, 0)
+
+		self.assertEqual(len(folds), 3)
+		self.assertEqual(sorted(index for fold in folds for index in fold), list(range(10)))
+		self.assertEqual(folds, get_fold_indices(10, 3, 0))
+
+	def test_groups_are_not_split(self):
+		items = list(range(12))
+		groups = [ item // 3 for item in items ]
+		test_sets = []
+
+		def score(classifier, test_set):
+			test_sets.append(test_set)
+
+			return { 'accuracy': 1.0 }
+
+		report = cross_validate(items, lambda train_set: None, score, 4, 0, groups=groups)
+
+		self.assertEqual(report, { 'accuracy': 1.0 })
+		self.assertEqual(sorted(item for test_set in test_sets for item in test_set), items)
+
+		for test_set in test_sets:
+			self.assertEqual(len(set(item // 3 for item in test_set)), 1)
+
+	def test_fewer_groups_than_folds(self):
+		self.assertIsNone(cross_validate([1, 2, 3, 4], lambda train_set: None, lambda classifier, test_set: {}, 3, 0, groups=[0, 0, 1, 1]))
+
+	def test_reports_are_averaged_by_label(self):
+		average = average_reports([{ 'a': { 'recall': 1.0 }, 'accuracy': 0.5 }, { 'a': { 'recall': 0.0 }, 'b': { 'recall': 1.0 }, 'accuracy': 1.0 }])
+
+		self.assertEqual(average, { 'a': { 'recall': 0.5 }, 'b': { 'recall': 1.0 }, 'accuracy': 0.75 })
@@ -4,6 +4,9 @@ from sociagraph import views
 
 urlpatterns = [
     url(r'^$', views.index, name='index'),
+    url(r'^jobs/$', views.training_jobs, name='training_jobs'),
+    url(r'^jobs/(?P<job_id>\d+)/$', views.training_job, name='training_job'),
+    url(r'^profiling/$', views.stage_statistics, name='stage_statistics'),
     url(r'^key_information_extractor/', include('key_information_extractor.urls', namespace="key_information_extractor")),
     url(r'^sentiment_analyzer/', include('sentiment_analyzer.urls', namespace="sentiment_analyzer")),
     url(r'^admin/', include(admin.site.urls)),
@@ -0,0 +1,10 @@
+# Text utilities of the applications, split by subject. The NLTK and
+# scikit-learn functions they call are imported on first use, so importing
+# the utilities does not load those libraries.
+
+from sociagraph.utils.text import *
+from sociagraph.utils.tagging import *
+from sociagraph.utils.sorting import *
+from sociagraph.utils.semantics import *
+from sociagraph.utils.feature_sets import *
+from sociagraph.utils.classification import *
\ No newline at end of file
@@ -0,0 +1,94 @@
+from sociagraph.lazy import LazyModule
+from sociagraph.utils.sorting import regroup_list
+from sociagraph.profiling import profiled
+
+SklearnClassifier = LazyModule('nltk.classify.scikitlearn', 'SklearnClassifier')
+LinearSVC = LazyModule('sklearn.svm', 'LinearSVC')
+accuracy_score = LazyModule('sklearn.metrics', 'accuracy_score')
+precision_score = LazyModule('sklearn.metrics', 'precision_score')
+recall_score = LazyModule('sklearn.metrics', 'recall_score')
+f1_score = LazyModule('sklearn.metrics', 'f1_score')
+classification_report = LazyModule('sklearn.metrics', 'classification_report')
+
+# Training and scoring of classifiers
+
+# Description: Create an SVM classifier
+# Parameter/s: None
+# Return:	   SklearnClassifier(LinearSVC())
+def create_svm_classifier():
+	# return SklearnClassifier(SVC(probability = True))
+	return SklearnClassifier(LinearSVC())
+
+# Description: Train the classifier
+# Parameter/s: classifier | list
+# Return:	   classifier
+def train_classifier(classifier, training_data):
+	classifier.train(training_data)
+
+	return classifier
+
+# Description: Classify the sentences of many documents in one batch
+# Parameter/s: classifier | list [ [ sentence, ... ], ... ]
+# Return:	   list [ [ label, ... ], ... ]
+# Dependencies: regroup_list()
+def classify_sentence_lists(classifier, sentence_lists):
+	return regroup_list(classifier.classify_many([ sentence for sentences in sentence_lists for sentence in sentences ]), sentence_lists)
+
+# Description: Get the classification report
+# Parameter/s: list | list | list
+# Return:	   classifier
+# def get_classification_report(test_classification_index, classification_result, themes):
+# 	report = classification_report(test_classification_index, classification_result, labels=list(set(test_classification_index)),target_names=themes)
+
+# 	return report
+
+# Description:  Get the accuracy score
+# Parameter/s:  list [ str, ... ] | list [ str, ... ] 
+# Return:	    float
+def get_accuracy_score(correct_labels, test_labels):
+	return accuracy_score(correct_labels, test_labels)
+
+# Description:  Get the precision score
+# Parameter/s:  list [ str, ... ] | list [ str, ... ] 
+# Return:	    float
+def get_precision_score(correct_labels, test_labels):
+	return precision_score(correct_labels, test_labels, labels=None)
+
+# Description:  Get the recall score
+# Parameter/s:  list [ str, ... ] | list [ str, ... ] 
+# Return:	    float
+def get_recall_score(correct_labels, test_labels):
+	return recall_score(correct_labels, test_labels, labels=None)
+
+# Description:  Get the f1 score
+# Parameter/s:  list [ str, ... ] | list [ str, ... ] 
+# Return:	    float
+def get_f_measure_score(correct_labels, test_labels):
+	return f1_score(correct_labels, test_labels, labels=None)
+
+# Description:  Get the accuracy, precision, recall and f-measure
+# Parameter/s:  list [ str, ... ] | list [ str, ... ]  | list [ str, ... ]
+# Return:	    dict ( { 'str': float } )
+@profiled('test_set_scoring')
+def get_classification_scores(correct_labels, test_labels, labels):
+	classification_scores = {}
+
+	true_values = [ labels.index(label) for label in correct_labels ]
+	predicted_values = [ labels.index(label) for label in test_labels ]
+
+	classification_scores = {
+		'accuracy': accuracy_score(correct_labels, test_labels),
+		'precision': precision_score(true_values, predicted_values),
+		'recall': recall_score(true_values, predicted_values),
+		'f-measure': f1_score(true_values, predicted_values),
+	}
+
+	return classification_scores
+
+# Description:  Get the accuracy, precision, f1 and recall score
+# Parameter/s:  list [ str, ... ] | list [ str, ... ]
+# Return:	    str
+def get_classification_report(correct_labels, test_labels, theme):
+	not_theme = 'not_' + theme
+	target_names = [theme, not_theme]
+	return classification_report(correct_labels, test_labels, target_names=target_names)
\ No newline at end of file
@@ -0,0 +1,124 @@
+from sociagraph.lazy import LazyModule
+from sociagraph.utils.text import get_corpus_tokens, lemmatize
+from sociagraph.utils.semantics import is_synonymous
+
+PlaintextCorpusReader = LazyModule('nltk.corpus', 'PlaintextCorpusReader')
+
+# Feature sets of labeled texts for the NLTK classifiers
+
+# Description: Builds feature set
+# Parameter/s: list | list
+# Return:	   list
+def build_feature_sets(themes, wordlist, classified_wordlist):
+	feature_sets = []
+	features = {}
+
+	for word in wordlist:
+		if classified_wordlist.has_key(word):
+			features['contains(%s)' % word] = True
+			feature_sets.append((features, themes.index(classified_wordlist[word])))
+
+	return feature_sets
+
+# Description: Read text file
+# Parameter/s: list
+# Return:	   list
+def read_corpus(list):
+	corpus_root = '/usr/share/dict'
+	wordlists = PlaintextCorpusReader(corpus_root, '.*')
+	wordlists.fileids()
+	wordlists.words('connectives')
+
+# Description:  Get the feature set words
+# Parameter/s:  list [ ([ token, ... ], label), ... ]
+# Return:	    list [ word, ... ]
+def get_feature_set_words(labeled_paragraph_list):
+	feature_set_words = []
+	
+	for labeled_paragraph in labeled_paragraph_list:
+		for word in labeled_paragraph[0]:
+			feature_set_words.append(word)
+
+	return set(feature_set_words)
+
+# Description:  Assigns theme
+# Parameter/s:  list [ { text, tokens }, ... ] | str
+# Return:	    list [ ([ token, ... ], theme) ]
+# Dependencies:	get_corpus_tokens()
+def assign_theme(labeled_corpora, theme):
+	labeled_text = []
+	
+	for corpus in labeled_corpora:
+		labeled_text.append((get_corpus_tokens(corpus['text'], corpus['tokens']), theme))
+
+	return labeled_text
+
+# Description:  Get the features
+# Parameter/s:  list [ token, ... ] | list
+# Return:	    dict { contains(word): True, is_synonymous }
+# Dependencies: is_synonymous() | lemmatize()
+def get_features(tokens, feature_sets_words, theme):
+	features = {}
+
+	for word in tokens:
+		features.update({
+			'contains(' + word + ')': word in feature_sets_words,
+			'synonymous_to_theme(' + word + ')': is_synonymous(word, lemmatize(theme))
+			})
+
+	return features
+
+# Description:  Get the feature sets
+# Parameter/s:  [ ([ token, ... ], theme) ... ] | [ word, ... ] | str
+# Return:	    list [({ contains(word): True })]
+# Dependencies: get_features()
+def get_theme_corpus_feature_sets(combined_labeled_text, feature_set_words, theme):
+	feature_sets = [ ( get_features(item[0], feature_set_words, theme), item[1]) for item in combined_labeled_text ]
+	
+	return feature_sets
+
+# Description:  Get the most frequent sentiment
+# Parameter/s:  dict { str: int, ... }
+# Return:	    str
+def get_most_frequent_sentiment(sentiment_frequencies):
+	max_sentiment = ''
+	max_frequency = None
+
+	for sentiment in sentiment_frequencies:
+		if max_frequency == None:
+			max_sentiment = sentiment
+			max_frequency = sentiment_frequencies[sentiment]
+		else:
+			if sentiment_frequencies[sentiment] > max_frequency:
+				max_sentiment = sentiment
+				max_frequency = sentiment_frequencies[sentiment]
+
+	return max_sentiment
+
+# Description:  Get the sentiment features
+# Parameter/s:  list [ token, ... ] | list
+# Return:	    dict { contains(word): True, synonymous }
+# Dependencies: is_synonymous()
+def get_sentiment_features(tokens, feature_set_words, sentiments):
+	features = {}
+
+	for word in tokens:
+		features.update({
+			'contains(' + word + ')': word in feature_set_words
+			})
+
+		for sentiment in sentiments:
+			features['synonymous_to_' + sentiment + '(' + word + ')'] = is_synonymous(word, sentiment)
+
+	return features
+
+# Description:  Get the feature sets
+# Parameter/s:  [ ([ token, ... ], sentiment) ... ] | [ word, ... ] | list
+# Return:	    list [({ contains(word): True })]
+# Dependencies: get_sentiment_features()
+def get_sentiment_feature_sets(combined_labeled_text, feature_set_words, sentiments):
+	# feature_sets = [ ({ word: (lemmatize(word) in tokenize(item[0])) for word in feature_set_words }, item[1]) for item in combined_labeled_text ]
+	feature_sets = [ (get_sentiment_features(item[0], feature_set_words, sentiments), item[1]) for item in combined_labeled_text ]
+	# feature_sets = [ ( get_features(item[0].lower(), feature_set_words, theme), item[1]) for item in combined_labeled_text ]
+	
+	return feature_sets
\ No newline at end of file
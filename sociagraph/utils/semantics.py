@@ -0,0 +1,137 @@
+import re as regex
+from collections import Counter
+
+from sociagraph.wordnet_cache import get_synsets, get_synset_ids
+from sociagraph.utils.text import unicode_to_string
+
+# Definitions and synonyms of words from WordNet
+
+# Description: Get the definition/s of the word
+# Parameter/s: string
+# Return:	   list | None
+def get_word_definitions(word):
+	definitions = []
+	for synset in get_synsets(word):
+		definitions.append(unicode_to_string(synset.definition()))
+
+	if len(definitions) == 0:
+		definitions = None
+	return definitions
+
+# Description: Get the synonyms
+# Parameter/s: string
+# Return:	   list
+def get_synonyms(word):
+	synonyms = []
+	for synset in get_synsets(word):
+		synonyms.append(unicode_to_string(synset.name().split('.')[0]))
+	return synonyms
+
+# Description: Check if two words has similar synonyms
+# Parameter/s: string | string
+# Return:	   boolean
+def has_similar_synonyms(word1, word2):
+	return not get_synset_ids(word1).isdisjoint(get_synset_ids(word2))
+
+# Description: Get the initial classifications of each word
+# Parameter/s: list
+# Return:	   tuple
+def get_initial_classifications(themes, wordlist):
+	classified_wordlist = {}
+
+	for theme in themes:
+		for word in wordlist:
+			if has_similar_synonyms(theme, word):
+				classified_wordlist[word] = theme
+
+	return classified_wordlist
+
+# Description:  Check if the word1 is a synonym of word2
+# Parameter/s:  string | string
+# Return:	    boolean
+def is_synonymous(word1, word2):
+	# Check for any similar synonyms
+	return not get_synset_ids(word1).isdisjoint(get_synset_ids(word2))
+
+# Description:  Check if the sentence is associated to a label
+# Parameter/s:  str | str
+# Return:	    dict { word: word_count }
+# Dependencies: get_synset_ids()
+def get_label_associated_words(label, sentence):
+	# Remove non-alphanumeric, non-hyphen and non-space
+	filtered_sentence = regex.sub('[^A-Za-z0-9\- ]+', '', sentence)
+
+	words = filtered_sentence.split(' ')
+	word_counts = Counter(words)
+
+	# Look up the label once for all words
+	label_synset_ids = get_synset_ids(label)
+
+	associated_words = { }
+
+	for word in word_counts:
+		if not label_synset_ids.isdisjoint(get_synset_ids(word.lower())):
+			associated_words[word] = word_counts[word]
+
+	return associated_words
+
+# Description:  Breaks the paragraph into sentences through period (.)
+# Parameter/s:  str
+# Return:	    list [ (label, sentence, { word: word_count } ), ... ]
+# Dependencies: get_label_associated_words()
+def get_initial_sentence_classification(labels, sentence_list):
+	classified_sentences = []
+
+	for label in labels:
+		associated_words = {}
+
+		for sentence in sentence_list:
+			associated_words = get_label_associated_words(label, sentence)
+
+			if len(associated_words) > 0:
+				classified_sentences.append((sentence, label, associated_words))
+
+	return classified_sentences
+
+# similarity
+
+# from nltk.corpus import wordnet as wn
+# 	similarts = []
+
+# 	Aword = 'language'
+# 	Bword = 'barrier'
+
+# 	synsetsA = wn.synsets(Aword)
+# 	synsetsB = wn.synsets(Bword)
+
+# 	groupA = [wn.synset(str(synset.name())) for synset in synsetsA]
+# 	groupB = [wn.synset(str(synset.name())) for synset in synsetsB]
+
+# 	for sseta in groupA:
+# 		for ssetb in groupB:
+# 			path_similarity = sseta.path_similarity(ssetb)
+# 			wup_similarity = sseta.wup_similarity(ssetb)
+
+# 			if path_similarity is not None:
+# 				similars.append({
+# 					'path':path_similarity,
+# 					'wup':wup_similarity,
+# 					'wordA':sseta,
+# 					'wordB':ssetb,
+# 					'wordA_definition':sseta.definition(),
+# 					'wordB_definition':ssetb.definition()
+# 				})
+# Sorting similarity probability
+# similars = sorted(similars, key=lambda item: item['path'], reverse=True)
+
+
+# Organized printing
+# for item in similars:
+# 	print item['wordA'],"-",item['wordA_definition']
+# 	print item['wordB'],"-",item['wordB_definition']
+# 	print 'Path similarity - ', item['path'],'\n'
+
+# def get_features_summary(feature_sets):
+# 	features_summary = {}
+# 	for features, label in feature_sets:
+# 		for 
\ No newline at end of file
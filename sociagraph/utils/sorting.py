@@ -0,0 +1,38 @@
+import operator
+from random import shuffle
+
+# Sorting and regrouping of dictionaries and lists
+
+# Description: Sort a dictionary by value
+# Parameter/s: dictionary
+# Return:	   list
+# Reference: http://stackoverflow.com/questions/613183/sort-a-python-dictionary-by-value
+def sort_dictionary_by_value(dictionary, reverse = False):
+	if not reverse:
+		return sorted(dictionary.items(), key = operator.itemgetter(1))
+	else:
+		return sorted(dictionary.items(), key = operator.itemgetter(1)).reverse()
+
+# Description: Sort a dictionary by key
+# Parameter/s: dictionary
+# Return:	   list
+# Reference: http://stackoverflow.com/questions/613183/sort-a-python-dictionary-by-value
+def sort_dictionary_by_key(dictionary, reverse = False):
+	if not reverse:
+		return sorted(dictionary.items(), key = operator.itemgetter(0))
+	else:
+		return sorted(dictionary.items(), key = operator.itemgetter(0)).reverse()
+
+# Description: Randomize position of list items
+# Parameter/s: list
+# Return:	   list
+def shuffle_set(list):
+	shuffle(list)
+
+# Description: Split a flat list into lists of the same lengths as other lists
+# Parameter/s: list | list [ list, ... ]
+# Return:	   list [ list, ... ]
+def regroup_list(items, lists):
+	items = iter(items)
+
+	return [ [ next(items) for item in list_items ] for list_items in lists ]
\ No newline at end of file
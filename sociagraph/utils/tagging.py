@@ -0,0 +1,55 @@
+import re as regex
+
+from sociagraph.lazy import LazyModule
+from sociagraph.utils.text import lemmatize
+
+nltk = LazyModule('nltk')
+
+# Part of speech tagging of texts
+
+# Description: Determine part of speech of a word
+# Parameter/s: string
+# Return:	   string
+def get_pos_tag(text):
+	text = regex.sub('[^A-Za-z ]+', ' ', text)
+	return nltk.pos_tag(text)
+
+# Description: Determine part of speech of each word
+# Parameter/s: string
+# Return:	   tuple
+def get_pos_tags(text):
+	text = regex.sub('[^A-Za-z ]+', ' ', text)
+	text = nltk.word_tokenize(text)
+
+	return nltk.pos_tag(text)
+
+# Description: Get the tag value of the Part Of Speech (POS) tag
+# Parameter/s: string
+# Return:	   string
+def get_pos_tag_value(tag):
+	pos_tag_value = {'CC': 'coordinating conjunction', 'CD': 'cardinal number', 'DT': 'determiner', 'EX': 'existential', 'FW': 'foreign word', 'IN': 'preposition/subordinating conjunction', 'JJ':	'adjective', 'JJR': 'adjective comparative', 'JJS': 'adjective superlative', 'LS': 'list marker', 'MD': 'modal', 'NN': 'noun singular or mass', 'NNS': 'noun plural', 'NNP': 'proper noun singular', 'NNPS': 'proper noun plural', 'PDT': 'predeterminer', 'POS': 'possessive ending', 'PRP': 'personal pronoun', 'PRP$': 'possessive pronoun', 'RB': 'adverb', 'RBR': 'adverb comparative', 'RBS': 'adverb superlative', 'RP': 'particle', 'TO': 'to', 'UH': 'interjection', 'VB': 'verb base form', 'VBD': 'verb past tense', 'VBG': 'verb gerund/present participle', 'VBN': 'verb past participle', 'VBP': 'verb singular present non-3d', 'VBZ': 'verb 3rd person singular present', 'WDT':	'wh-determiner', 'WP': 'wh-pronoun', 'WP$': 'possessive wh-pronoun', 'WRB':	'wh-abverb'}[tag]
+
+	return (pos_tag_value.title() if pos_tag_value else 'Unknown')
+
+# Description: Add the POS tag value
+# Parameter/s: list
+# Return:	   list
+def get_pos_tag_values(list):
+	for index, word in enumerate(list):
+		list[index] = list[index] + (get_pos_tag_value(list[index][1]),)
+	return list
+
+# Description: Check if possible keyword
+# Parameter/s: (..., )
+# Return:	   bool
+# Dependencies: get_pos_tag()
+def is_possible_keyword(word_list):
+	tags = ''
+	pattern = regex.compile(r"(ADJ ?)* (NN ?)+$|(NN ?)+$|(NN ?)+IN (NN ?)+$")
+
+	for word in word_list:
+		tags += nltk.pos_tag(lemmatize(word).split(" "))[0][1] + " "
+
+	tags = tags.rstrip()
+
+	return True if pattern.match(tags) is not None else False
\ No newline at end of file
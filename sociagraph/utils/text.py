@@ -0,0 +1,198 @@
+import re as regex
+
+from sociagraph.lazy import LazyModule
+from sociagraph.counting import iterate_ngrams, count_ngrams, count_conditional_frequencies
+from sociagraph.resources import get_stopword_set, get_english_words, get_lemmatizer, get_stemmer
+from sociagraph.profiling import profiled
+
+nltk = LazyModule('nltk')
+
+# Cleaning, tokenizing and counting the words of texts
+
+# Reference for nltk: Bird, Steven, Edward Loper and Ewan Klein (2009), Natural Language Processing with Python. O'Reilly Media Inc.
+
+# Description: Get the total number of words
+# Parameter/s: string
+# Return:	   string
+# Dependecies: remove_extra_whitespaces()
+def count_words(text):
+	return len(remove_extra_whitespaces(text).split(' '))
+
+# Description: Get the total number of vocabulary or unique words
+# Parameter/s: string
+# Return:	   string
+# Dependecies: tokenize() | remove_extra_whitespaces()
+def get_vocabulary_count(text):
+	return len(set(tokenize(remove_extra_whitespaces(text))))
+
+# Description: Transform string to Text
+# Parameter/s: string
+# Return:	   Text
+def transform_to_text(text):
+	return nltk.Text(text)
+
+# Description: Get the stem of the word
+# Parameter/s: string
+# Return:	   string
+def stem(word):
+	return get_stemmer().stem(word)
+
+# Description: Remove non-letters
+# Parameter/s: string
+# Return:	   string
+def remove_non_letters(word):
+	return regex.sub('[^A-Za-z ]+', ' ', word)
+
+# Description: Remove non-alphanumeric or non-hyphen, 
+# Parameter/s: string
+# Return:	   string
+def remove_non_alphanumeric(word):
+	return regex.sub('[^A-Za-z0-9\- ]+', ' ', word)
+
+# Description: Remove extra whitespaces and tabs
+# Parameter/s: string
+# Return:	   string
+def remove_extra_whitespaces(word):
+	return " ".join(word.split())
+
+# Description: Remove spaces
+# Parameter/s: string
+# Return:	   string
+def remove_spaces(word):
+	return regex.sub("[ ]", '', word)
+
+# Description: Checks the lexical diversity of the text
+# Parameter/s: string
+# Return:	   float
+def lexical_diversity(text):
+	return len(text) / len(set(text))
+
+# Description: Removes the stopwords in the text
+# Parameter/s: string
+# Return:	   string
+def remove_stopwords(text):
+	stopword_set = get_stopword_set()
+	return " ".join([w for w in text.split(" ") if not w in stopword_set])
+
+# Description: Checks if the word is in the dictionary
+# Parameter/s: string
+# Return:	   boolean
+def in_dictionary(word):
+	return word in get_english_words()
+
+# Description: Gets fractions of the text that are not stopwords
+# Parameter/s: string
+# Return:	   float
+def get_non_stopword_fraction(text):
+	stopword_set = get_stopword_set()
+	content = [w for w in text.split(" ") if not w in stopword_set]
+	return len(content) / len(text.split(" "))
+
+# Description: Tokenize the text
+# Parameter/s: string
+# Return:	   tuple
+@profiled()
+def tokenize(text):
+	text = regex.sub('[^A-Za-z0-9\.\- ]+', '', text)
+	return nltk.word_tokenize(unicode_to_string(text))
+
+# Description: Get the lemmas of the lowercase tokens of the text, as stored with the corpora
+# Parameter/s: string
+# Return:	   list [ string, ... ]
+# Dependencies: tokenize() | lemmatize()
+def get_text_tokens(text):
+	return [ lemmatize(word) for word in tokenize(text.lower()) ]
+
+# Description: Join tokens for the tokens column of a corpus
+# Parameter/s: list [ string, ... ]
+# Return:	   string
+def join_tokens(tokens):
+	return " ".join(tokens)
+
+# Description: Get the tokens of a corpus, computing them if not stored yet
+# Parameter/s: string | string (None if not stored, '' for a text without tokens)
+# Return:	   list [ string, ... ]
+# Dependencies: get_text_tokens()
+def get_corpus_tokens(text, tokens):
+	if tokens is None:
+		return get_text_tokens(text)
+
+	if tokens == "":
+		return []
+
+	return tokens.split(" ")
+
+# Description: Removes the stopwords from tokens
+# Parameter/s: list [ string, ... ]
+# Return:	   list [ string, ... ]
+def remove_stopword_tokens(tokens):
+	stopword_set = get_stopword_set()
+	return [ token for token in tokens if not token in stopword_set ]
+
+# Description: Count the frequeny of each word
+# Parameter/s: string | iterable [ string, ... ]
+# Return:	   dict
+# Dependencies: count_ngrams()
+@profiled()
+def get_bag_of_words(text):
+	return dict(count_ngrams(text).get_counts())
+
+# Description: Get the most frequent words
+# Parameter/s: string | iterable [ string, ... ] | int
+# Return:	   list [ (word, count), ... ]
+# Dependencies: count_ngrams()
+def get_most_frequent_words(text, count):
+	return count_ngrams(text).most_common(count)
+
+# Description: Generate bigrams
+# Parameter/s: str | int
+# Return:	   list [ (..., ), ...]
+# Dependencies: tokenize()
+def get_ngrams(text, word_count):
+	return iterate_ngrams(tokenize(text), word_count)
+
+# Description: Generate bigrams
+# Parameter/s: str
+# Return:	   list
+def get_bigrams(text):
+	return list(iterate_ngrams(unicode_to_string(text).split(" "), 2))
+
+# Description: Get the frequency distribution
+# Parameter/s: iterable [ (condition, word), ... ]
+# Return:	   ConditionalFreqDist
+# Dependencies: count_conditional_frequencies()
+def get_frequency_distribution(genre_word):
+	frequency_distribution = nltk.ConditionalFreqDist()
+
+	for condition, word_counts in count_conditional_frequencies(genre_word).items():
+		frequency_distribution[condition].update(word_counts)
+
+	return frequency_distribution
+
+# Description: Convert unicode to string
+# Parameter/s: unicode string
+# Return:	   string
+def unicode_to_string(unicode_string):
+	return unicode_string.encode('ascii', 'ignore')
+
+# Description:  Breaks the paragraph into sentences through period (.)
+# Parameter/s:  string
+# Return:	    list []
+# Dependencies: unicode_to_string() |
+def paragraph_to_sentences(paragraph):
+	# Replace all occurences of period(.) with a single period(.)
+	new_paragraph = regex.sub('[.]+', '.', paragraph)
+
+	if new_paragraph.endswith('.'):
+		new_paragraph = new_paragraph[:-1]
+	# Removes unicode
+	new_paragraph = unicode_to_string(new_paragraph)
+
+	# Breaks the paragraph to sentences
+	return new_paragraph.split('.')
+
+# Description:  Lemmatize the string / Covert to singular sense
+# Parameter/s:  str
+# Return:	    str
+def lemmatize(string):
+	return get_lemmatizer().lemmatize(string)
\ No newline at end of file
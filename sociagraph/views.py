@@ -1,7 +1,28 @@
-from django.shortcuts import render
-from django.http import HttpResponse
+from django.shortcuts import render, get_object_or_404
+from django.http import HttpResponse, JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
+
+from sociagraph.models import Training_Job
+from sociagraph.jobs import get_training_job_status
+from sociagraph.profiling import get_stage_statistics
 
 def index(request):
 	template_name = 'sociagraph/index.html'
 	
-	return render(request, template_name)
\ No newline at end of file
+	return render(request, template_name)
+
+@staff_member_required
+def training_jobs(request):
+	jobs = Training_Job.objects.order_by('-id')[:50]
+
+	return JsonResponse({ 'jobs': [ get_training_job_status(job) for job in jobs ] })
+
+@staff_member_required
+def training_job(request, job_id):
+	job = get_object_or_404(Training_Job, id=job_id)
+
+	return JsonResponse(get_training_job_status(job))
+
+@staff_member_required
+def stage_statistics(request):
+	return JsonResponse({ 'stages': get_stage_statistics() })
\ No newline at end of file
@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from sociagraph.lazy import LazyModule
+from sociagraph.dictionary import get_dictionary_synset_ids
+from sociagraph.profiling import profiled
+
+wordnet = LazyModule('nltk.corpus', 'wordnet')
+
+# Memoizes the WordNet lookups of a word. Each entry keeps the synsets of the
+# word with the set of their ids, so that synonym checks are set operations.
+
+
+class LRUCache(object):
+
+	def __init__(self, max_size):
+		self.max_size = max_size
+		self.items = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.lock = threading.Lock()
+
+	# Description:  Get the cached value of a key, computing it on a miss
+	# Parameter/s:  hashable | function () -> value
+	# Return:	    value
+	def get(self, key, compute):
+		with self.lock:
+			if key in self.items:
+				value = self.items.pop(key)
+
+				# Mark as most recently used
+				self.items[key] = value
+				self.hits += 1
+
+				return value
+
+			self.misses += 1
+
+		value = compute()
+
+		with self.lock:
+			self.items[key] = value
+
+			# Evict the least recently used
+			while len(self.items) > self.max_size:
+				self.items.popitem(last=False)
+
+		return value
+
+	# Description:  Get the hit and miss counts of the cache
+	# Parameter/s:  None
+	# Return:	    dict { str: int }
+	def statistics(self):
+		with self.lock:
+			return {
+				'hits': self.hits,
+				'misses': self.misses,
+				'size': len(self.items),
+				'max_size': self.max_size,
+			}
+
+	# Description:  Remove all entries and reset the counts
+	# Parameter/s:  None
+	# Return:	    None
+	def clear(self):
+		with self.lock:
+			self.items.clear()
+			self.hits = 0
+			self.misses = 0
+
+
+synset_cache = LRUCache(getattr(settings, 'WORDNET_CACHE_SIZE', 50000))
+
+# Description:  Look up the synsets of a word in WordNet
+# Parameter/s:  str
+# Return:	    tuple ( (synset, ...), frozenset([ str, ... ]) )
+@profiled('wordnet_lookup')
+def lookup_synsets(word):
+	synsets = tuple(wordnet.synsets(word))
+
+	return (synsets, frozenset(synset.name() for synset in synsets))
+
+# Description:  Get the synsets of a word
+# Parameter/s:  str
+# Return:	    tuple (synset, ...)
+def get_synsets(word):
+	return synset_cache.get(word, lambda: lookup_synsets(word))[0]
+
+# Description:  Get the ids of the synsets of a word
+# Parameter/s:  str
+# Return:	    frozenset([ str, ... ])
+# Dependencies: get_dictionary_synset_ids()
+def get_synset_ids(word):
+	# Answer from the precomputed dictionary before traversing WordNet
+	synset_ids = get_dictionary_synset_ids(word)
+
+	if synset_ids is not None:
+		return synset_ids
+
+	return synset_cache.get(word, lambda: lookup_synsets(word))[1]
+
+# Description:  Get the hit and miss counts of the synset cache
+# Parameter/s:  None
+# Return:	    dict { str: int }
+def get_wordnet_cache_statistics():
+	return synset_cache.statistics()
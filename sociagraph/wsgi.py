@@ -12,3 +12,14 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sociagraph.settings")
 
 from django.core.wsgi import get_wsgi_application
 application = get_wsgi_application()
+
+# Load the NLTK resources before the first request reaches the worker
+from django.conf import settings
+
+if getattr(settings, 'WARM_UP_RESOURCES', True):
+    from sociagraph.resources import warm_up
+    warm_up()
+
+# Trace the memory of the whole process from its start
+from sociagraph.profiling import start_memory_tracing
+start_memory_tracing()